@@ -0,0 +1,116 @@
+"""Tests for tiltedvoice.alignment — on-demand word timings."""
+
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+
+from tiltedvoice.alignment import align_words, group_windows, split_words
+from tiltedvoice.models import TranscriberConfig, TranscriptionResult, TranscriptionSegment, WhisperModel
+from tiltedvoice.result_cache import ResultCache
+from tiltedvoice.transcriber import Transcriber
+
+
+def _seg(text, start, end):
+    return TranscriptionSegment(text=text, start=start, end=end)
+
+
+def _timing(word, tokens, start, end):
+    return {"word": word, "tokens": tokens, "start": start, "end": end, "probability": 0.9}
+
+
+class _FakeTokenizer:
+    def encode(self, text):
+        return [hash(w) % 1000 for w in text.split()]
+
+
+def _fake_model(alignment):
+    model = MagicMock()
+    model.feature_extractor.return_value = np.zeros((80, 301), dtype=np.float32)
+    model.feature_extractor.nb_max_frames = 3000
+    model.find_alignment.return_value = [alignment]
+    return model
+
+
+class TestWindows:
+    def test_nearby_segments_share_a_window(self):
+        segs = [_seg("a", 0, 5), _seg("b", 5, 12), _seg("c", 29, 40), _seg("d", 41, 45)]
+        assert group_windows(segs, [0, 1, 2, 3]) == [[0, 1], [2, 3]]
+
+    def test_only_requested_indices(self):
+        segs = [_seg("a", 0, 5), _seg("b", 5, 12), _seg("c", 12, 20)]
+        assert group_windows(segs, [2, 0]) == [[0, 2]]
+
+
+class TestSplitWords:
+    def test_words_follow_their_tokens(self):
+        alignment = [
+            _timing(" hello", [1], 0.0, 0.4),
+            _timing(" there", [2], 0.4, 0.8),
+            _timing(" again", [3, 4], 1.0, 1.5),
+        ]
+        first, second = split_words(alignment, [2, 2], offset=10.0)
+        assert [w.word for w in first] == [" hello", " there"]
+        assert [w.word for w in second] == [" again"]
+        assert second[0].start == 11.0 and second[0].end == 11.5
+
+    def test_merged_punctuation_is_skipped(self):
+        alignment = [_timing(" hi.", [1, 2], 0.0, 0.3), _timing("", [], 0.3, 0.3)]
+        (words,) = split_words(alignment, [2], offset=0.0)
+        assert [w.word for w in words] == [" hi."]
+
+
+class TestAlignWords:
+    def test_one_encoder_pass_per_window(self):
+        segs = [_seg("hello there", 1.0, 2.0), _seg("again", 2.0, 3.0)]
+        model = _fake_model([
+            _timing(" hello", [1], 0.0, 0.4),
+            _timing(" there", [2], 0.4, 0.8),
+            _timing(" again", [3], 1.0, 1.5),
+        ])
+        out = align_words(model, np.zeros(48000, np.float32), segs, "en", tokenizer=_FakeTokenizer())
+
+        assert model.encode.call_count == 1
+        assert [w.word for w in out[0].words] == [" hello", " there"]
+        assert out[1].words[0].start == 2.0
+        assert segs[0].words is None  # inputs are not mutated
+
+    def test_skips_segments_not_requested(self):
+        segs = [_seg("one", 0.0, 1.0), _seg("two", 40.0, 41.0)]
+        model = _fake_model([_timing(" two", [1], 0.0, 0.5)])
+        out = align_words(model, np.zeros(16000 * 42, np.float32), segs, "en", indices=[1],
+                          tokenizer=_FakeTokenizer())
+        assert out[0].words is None
+        assert out[1].words[0].start == 40.0
+        # The window starts at the requested segment.
+        assert model.feature_extractor.call_args.args[0].size == 16000 * 2
+
+
+class TestTranscriberAlignment:
+    def test_aligned_result_replaces_cache_entry(self, tmp_path):
+        cache = ResultCache(tmp_path)
+        t = Transcriber(config=TranscriberConfig(model=WhisperModel.TINY_EN, vad_filter=False), cache=cache)
+        t._model = MagicMock()
+        t._model.transcribe.return_value = (
+            iter([SimpleNamespace(text=" hi there", start=0.0, end=1.0, avg_logprob=-0.1)]),
+            SimpleNamespace(language="en", language_probability=0.9, duration=1.0),
+        )
+        audio = np.full(16000, 0.1, dtype=np.float32)
+        result = t.transcribe(audio)
+        assert result.segments[0].words is None
+
+        aligned_segments = [TranscriptionSegment(text="hi there", start=0.0, end=1.0, words=[])]
+        with patch("tiltedvoice.transcriber.align_words", return_value=aligned_segments) as mock_align:
+            aligned = t.align_words(audio, result)
+        assert mock_align.call_count == 1
+        assert aligned.segments[0].words == []
+        assert t.transcribe(audio).segments[0].words == []  # served from cache with words
+
+    def test_aligns_with_the_model_that_produced_the_result(self):
+        t = Transcriber(config=TranscriberConfig(model=WhisperModel.SMALL_EN))
+        t._model = MagicMock(name="small")
+        draft_model = t._sibling(WhisperModel.TINY_EN)._model = MagicMock(name="tiny")
+        result = TranscriptionResult(text="hi", segments=[_seg("hi", 0.0, 1.0)], model_name="tiny.en")
+        with patch("tiltedvoice.transcriber.align_words", return_value=result.segments) as mock_align:
+            t.align_words(np.zeros(16000, np.float32), result)
+        assert mock_align.call_args.args[0] is draft_model
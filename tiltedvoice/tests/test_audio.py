@@ -1,8 +1,22 @@
-"""Tests for microphone selection behavior."""
+"""Tests for microphone selection, the shared capture engine, VAD and capture buffering."""
 
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
-from tiltedvoice.audio import MicrophoneManager
+import numpy as np
+import pytest
+
+from tiltedvoice.audio import (
+    AdaptiveVAD,
+    AudioBuffer,
+    AudioRing,
+    CaptureEngine,
+    EnergyVAD,
+    MicrophoneManager,
+    VADStage,
+    VoiceActivityDetector,
+    VoiceRecorder,
+)
+from tiltedvoice.models import AudioConfig
 
 
 class TestMicrophoneSelection:
@@ -24,3 +38,216 @@ class TestMicrophoneSelection:
         ]
         mgr = MicrophoneManager()
         assert mgr.get_default_device() is None
+
+
+class TestAudioBuffer:
+    def test_float32_write_and_view(self):
+        buf = AudioBuffer(100)
+        buf.write(np.full((10, 1), 0.5, dtype=np.float32))
+        view = buf.view()
+        assert view.dtype == np.float32
+        assert view.shape == (10,)
+        assert np.allclose(view, 0.5)
+
+    def test_int16_converted_in_place(self):
+        buf = AudioBuffer(100)
+        written = buf.write(np.array([[16384], [-32768]], dtype=np.int16))
+        assert written.dtype == np.float32
+        assert np.allclose(buf.view(), [0.5, -1.0])
+
+    def test_truncates_at_capacity(self):
+        buf = AudioBuffer(5)
+        buf.write(np.zeros(3, dtype=np.float32))
+        written = buf.write(np.ones(4, dtype=np.float32))
+        assert written.size == 2
+        assert buf.is_full
+        assert buf.size == 5
+
+    def test_detach_is_zero_copy_and_rearms(self):
+        buf = AudioBuffer(10)
+        buf.write(np.ones(4, dtype=np.float32))
+        audio = buf.detach()
+        assert audio.base is not None
+        assert buf.size == 0
+        buf.write(np.zeros(4, dtype=np.float32))
+        assert np.allclose(audio, 1.0)  # detached view is not overwritten
+
+
+class TestCaptureEngine:
+    @patch("tiltedvoice.audio.sd.InputStream")
+    def test_stream_opens_once_and_closes_with_last_subscriber(self, mock_stream_cls):
+        engine = CaptureEngine(device_index=3, use_stream=True)
+        a = engine.subscribe(lambda block: None)
+        b = engine.subscribe(lambda block: None)
+        assert mock_stream_cls.call_count == 1
+        assert engine.uses_stream
+
+        engine.unsubscribe(a)
+        mock_stream_cls.return_value.close.assert_not_called()
+        engine.unsubscribe(b)
+        mock_stream_cls.return_value.close.assert_called_once()
+        assert not engine.is_running
+
+    @patch("tiltedvoice.audio.sd.InputStream")
+    def test_blocks_converted_and_fanned_out(self, mock_stream_cls):
+        engine = CaptureEngine(dtype="int16", use_stream=True)
+        got_a, got_b = [], []
+        engine.subscribe(lambda block: got_a.append(block.copy()))
+        engine.subscribe(lambda block: got_b.append(block.copy()))
+
+        callback = mock_stream_cls.call_args.kwargs["callback"]
+        callback(np.array([[16384], [-16384]], dtype=np.int16), 2, None, None)
+
+        assert np.allclose(got_a[0], [0.5, -0.5])
+        assert np.allclose(got_b[0], [0.5, -0.5])
+        assert got_a[0].dtype == np.float32
+
+    @patch("tiltedvoice.audio.sd.InputStream", side_effect=RuntimeError("no callback API"))
+    @patch("tiltedvoice.audio.sd.rec", return_value=np.zeros((1600, 1), dtype=np.float32))
+    def test_falls_back_to_rec_loop(self, mock_rec, mock_stream_cls):
+        engine = CaptureEngine(use_stream=True)
+        token = engine.subscribe(lambda block: None)
+        assert engine.is_running and not engine.uses_stream
+        engine.unsubscribe(token)
+        assert not engine.is_running
+
+    def test_recorder_captures_from_engine(self):
+        engine = MagicMock()
+        engine.subscribe.return_value = 7
+        rec = VoiceRecorder(config=AudioConfig(sample_rate=16000), engine=engine)
+        chunks = []
+        rec.start_manual_recording(on_chunk=chunks.append)
+
+        on_block = engine.subscribe.call_args.args[0]
+        for _ in range(10):
+            on_block(np.full(1600, 0.1, dtype=np.float32))
+        audio = rec.stop_manual_recording()
+
+        engine.unsubscribe.assert_called_once_with(7)
+        assert audio.shape == (16000,)
+        assert len(chunks) == 10
+
+    @patch("tiltedvoice.audio.sd.InputStream")
+    def test_engine_resamples_to_output_rate(self, mock_stream_cls):
+        engine = CaptureEngine(sample_rate=48000, output_rate=16000, use_stream=True)
+        sizes = []
+        engine.subscribe(lambda block: sizes.append(block.size))
+        callback = mock_stream_cls.call_args.kwargs["callback"]
+        for _ in range(10):
+            callback(np.zeros((2400, 1), dtype=np.float32), 2400, None, None)
+        assert engine.sample_rate == 16000 and engine.device_rate == 48000
+        assert abs(sum(sizes) - 8000) <= 20
+
+
+class TestAudioRing:
+    def test_wraps_and_reads_oldest_first(self):
+        ring = AudioRing(5)
+        ring.write(np.arange(3, dtype=np.float32))
+        ring.write(np.arange(3, 7, dtype=np.float32))
+        assert ring.read().tolist() == [2, 3, 4, 5, 6]
+
+    def test_partial_fill(self):
+        ring = AudioRing(8)
+        ring.write(np.ones(3, dtype=np.float32))
+        assert ring.read().tolist() == [1, 1, 1]
+        ring.write(np.arange(20, dtype=np.float32))
+        assert ring.size == 8
+        assert ring.read()[-1] == 19
+
+
+class TestVADStage:
+    @staticmethod
+    def _frames(*levels, frame=480):
+        return np.concatenate([np.full(frame, lvl, dtype=np.float32) for lvl in levels])
+
+    def test_energy_segmentation_with_hangover(self):
+        stage = VADStage(EnergyVAD(0.05), silence_ms=90, hangover_ms=30)
+        events = [e for e, _ in stage.process(self._frames(0, 0.1, 0.1, 0, 0, 0))]
+        assert events == ["start", "speech", "speech", "pause", "pause", "end"]
+
+    def test_pre_roll_prepended_on_start(self):
+        stage = VADStage(EnergyVAD(0.05), pre_roll_ms=60)
+        events = stage.process(self._frames(0.01, 0.02, 0.03, 0.2))
+        kind, onset = events[0]
+        assert kind == "start"
+        assert onset.size == 3 * 480
+        assert np.isclose(onset[0], 0.02)
+
+    def test_pre_roll_keeps_only_recent_audio(self):
+        stage = VADStage(EnergyVAD(0.05), pre_roll_ms=30)
+        stage.process(self._frames(0.01, 0.02, 0.03))
+        (kind, onset), = stage.process(self._frames(0.2))
+        assert onset.size == 2 * 480
+        assert np.allclose(onset[:480], 0.03)
+
+    def test_partial_frames_carried_over(self):
+        stage = VADStage(EnergyVAD(0.05))
+        assert stage.process(np.full(300, 0.2, dtype=np.float32)) == []
+        assert [e for e, _ in stage.process(np.full(300, 0.2, dtype=np.float32))] == ["start"]
+
+    def test_detector_must_implement_is_speech(self):
+        class Incomplete(VoiceActivityDetector):
+            pass
+
+        with pytest.raises(TypeError):
+            Incomplete()
+
+    def test_adaptive_vad_ignores_steady_noise(self):
+        vad = AdaptiveVAD(min_threshold=0.01)
+        noise = np.full(480, 0.03, dtype=np.float32)
+        decisions = [vad.is_speech(noise) for _ in range(400)]
+        assert decisions[0] is True
+        assert decisions[-1] is False
+        assert vad.is_speech(np.full(480, 0.3, dtype=np.float32))
+
+    def test_recorder_trims_trailing_silence(self):
+        rec = VoiceRecorder(config=AudioConfig(pre_roll_ms=0, hangover_ms=60), silence_ms=300, detector=EnergyVAD(0.05))
+        clips = []
+        rec._on_audio_ready = clips.append
+        rec._vad = rec._create_vad_stage()
+        speech = np.full(15840, 0.2, dtype=np.float32)  # 33 whole frames
+        rec._process_auto_chunk(np.concatenate([np.zeros(1440, np.float32), speech, np.zeros(8000, np.float32)]), 0.0)
+
+        assert len(clips) == 1
+        assert clips[0].size == 15840 + 2 * 480  # speech + 60 ms hangover
+
+
+class TestDeviceProbing:
+    DEVICES = [
+        {"name": "Microsoft Sound Mapper - Input", "max_input_channels": 2, "default_samplerate": 44100, "hostapi": 0},
+        {"name": "Microphone (USB Audio Device)", "max_input_channels": 1, "default_samplerate": 48000, "hostapi": 0},
+    ]
+
+    def _patch_devices(self):
+        def _query(index=None, kind=None):
+            return self.DEVICES if index is None else self.DEVICES[index]
+
+        return (
+            patch("tiltedvoice.audio.sd.query_devices", side_effect=_query),
+            patch("tiltedvoice.audio.sd.query_hostapis", return_value={"name": "Windows WASAPI"}),
+        )
+
+    def test_probe_cache_persists_across_instances(self, tmp_path):
+        cache = tmp_path / "probe_cache.json"
+        q, h = self._patch_devices()
+        good = np.full((4000, 1), 0.01, dtype=np.float32)
+        with q, h, patch.object(MicrophoneManager, "_record_probe", return_value=good) as rec:
+            assert MicrophoneManager(probe_cache_path=cache).probe_device(1) == "float32"
+            assert rec.call_count == 1
+
+            warm = MicrophoneManager(probe_cache_path=cache)
+            assert warm.probe_device(1) == "float32"
+            assert warm.get_working_sample_rate(1) == 16000
+            assert rec.call_count == 1  # served from disk
+
+    def test_best_device_probed_in_parallel(self):
+        q, h = self._patch_devices()
+        good = np.full((4000, 1), 0.01, dtype=np.float32)
+        bad = np.full((4000, 1), np.nan, dtype=np.float32)
+
+        def _record(device_index, rate, dtype, frames):
+            return good if device_index == 1 else bad
+
+        with q, h, patch.object(MicrophoneManager, "_record_probe", side_effect=_record):
+            picked = MicrophoneManager().get_best_working_device()
+        assert picked["index"] == 1
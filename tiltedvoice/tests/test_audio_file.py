@@ -0,0 +1,128 @@
+"""Tests for tiltedvoice.audio_file — memory-mapped and streamed file input."""
+
+import struct
+import wave
+
+import numpy as np
+import pytest
+
+from tiltedvoice.audio_file import AudioFileReader, audio_duration_s, read_wav_info
+from tiltedvoice.batching import load_clip
+
+
+def _tone(rate: int, seconds: float, freq: float = 440.0) -> np.ndarray:
+    t = np.arange(int(rate * seconds)) / rate
+    return (0.5 * np.sin(2 * np.pi * freq * t)).astype(np.float32)
+
+
+def _write_wav(path, samples: np.ndarray, rate: int, channels: int = 1) -> None:
+    frames = np.repeat(samples[:, None], channels, axis=1)
+    with wave.open(str(path), "wb") as w:
+        w.setnchannels(channels)
+        w.setsampwidth(2)
+        w.setframerate(rate)
+        w.writeframes((frames * 32767).astype("<i2").tobytes())
+
+
+def _write_raw_wav(path, data: bytes, format_tag: int, bits: int, rate: int = 16000) -> None:
+    block = bits // 8
+    fmt = struct.pack("<HHIIHH", format_tag, 1, rate, rate * block, block, bits)
+    path.write_bytes(b"RIFF" + struct.pack("<I", 36 + len(data)) + b"WAVE"
+                     + b"fmt " + struct.pack("<I", 16) + fmt
+                     + b"data" + struct.pack("<I", len(data)) + data)
+
+
+class TestWavInfo:
+    def test_header_fields(self, tmp_path):
+        path = tmp_path / "stereo.wav"
+        _write_wav(path, _tone(48000, 2.0), 48000, channels=2)
+        info = read_wav_info(path)
+        assert (info.channels, info.sample_rate, info.bits, info.frames) == (2, 48000, 16, 96000)
+        assert audio_duration_s(path) == 2.0
+
+    def test_non_wav_and_missing_files(self, tmp_path):
+        path = tmp_path / "clip.flac"
+        path.write_bytes(b"fLaC\0\0\0\0")
+        assert read_wav_info(path) is None
+        assert audio_duration_s(tmp_path / "missing.wav") is None
+
+    def test_oversized_data_chunk_clamped(self, tmp_path):
+        path = tmp_path / "streamed.wav"
+        _write_wav(path, _tone(16000, 1.0), 16000)
+        raw = bytearray(path.read_bytes())
+        raw[40:44] = struct.pack("<I", 0xFFFFFFFF)
+        path.write_bytes(bytes(raw))
+        assert read_wav_info(path).frames == 16000
+
+
+class TestAudioFileReader:
+    def test_resamples_stereo_wav_to_16k_mono(self, tmp_path):
+        path = tmp_path / "tone.wav"
+        _write_wav(path, _tone(44100, 3.0), 44100, channels=2)
+        audio = AudioFileReader(path).read()
+        assert audio.dtype == np.float32
+        assert audio.size == 48000
+        expected = _tone(16000, 3.0)
+        assert np.max(np.abs(audio[200:-200] - expected[200:-200])) < 1e-2
+
+    def test_windows_have_fixed_size(self, tmp_path):
+        path = tmp_path / "tone.wav"
+        _write_wav(path, _tone(16000, 7.5), 16000)
+        sizes = [w.size for w in AudioFileReader(path).windows(2.0)]
+        assert sizes == [32000, 32000, 32000, 24000]
+
+    @pytest.mark.parametrize("format_tag,bits", [(1, 8), (1, 24), (1, 32), (3, 32)])
+    def test_sample_formats(self, tmp_path, format_tag, bits):
+        x = _tone(16000, 0.5)
+        if format_tag == 3:
+            data = x.astype("<f4").tobytes()
+        elif bits == 8:
+            data = np.round(x * 127 + 128).astype(np.uint8).tobytes()
+        elif bits == 24:
+            ints = np.round(x * 8388607).astype("<i4")
+            data = ints.view(np.uint8).reshape(-1, 4)[:, :3].tobytes()
+        else:
+            data = np.round(x * 2147483647).astype("<i4").tobytes()
+        path = tmp_path / f"fmt{format_tag}_{bits}.wav"
+        _write_raw_wav(path, data, format_tag, bits)
+        assert np.max(np.abs(AudioFileReader(path).read() - x)) < 1e-2
+
+    def test_compressed_files_stream_through_pyav(self, tmp_path):
+        av = pytest.importorskip("av")
+        path = tmp_path / "tone.flac"
+        x = _tone(22050, 2.0)
+        with av.open(str(path), "w") as container:
+            stream = container.add_stream("flac", rate=22050)
+            stream.layout = "mono"
+            frame = av.AudioFrame.from_ndarray((x * 32767).astype("<i2")[None, :], format="s16", layout="mono")
+            frame.sample_rate = 22050
+            for packet in list(stream.encode(frame)) + list(stream.encode(None)):
+                container.mux(packet)
+        reader = AudioFileReader(path)
+        assert reader.wav is None
+        assert reader.duration_s == pytest.approx(2.0, abs=0.05)
+        assert abs(load_clip(str(path)).size - 32000) <= 32
+
+    def test_corrupt_packet_skipped_not_fatal(self, tmp_path, caplog):
+        av = pytest.importorskip("av")
+        path = tmp_path / "tone.mp3"
+        x = _tone(22050, 4.0)
+        try:
+            with av.open(str(path), "w") as container:
+                stream = container.add_stream("libmp3lame", rate=22050)
+                stream.layout = "mono"
+                frame = av.AudioFrame.from_ndarray((x * 32767).astype("<i2")[None, :], format="s16", layout="mono")
+                frame.sample_rate = 22050
+                for packet in list(stream.encode(frame)) + list(stream.encode(None)):
+                    container.mux(packet)
+        except (av.error.FFmpegError, ValueError):
+            pytest.skip("no mp3 encoder")
+        data = bytearray(path.read_bytes())
+        mid = len(data) // 2
+        data[mid:mid + 400] = b"\xff" * 400
+        path.write_bytes(bytes(data))
+        with caplog.at_level("WARNING", logger="tiltedvoice.audio_file"):
+            audio = AudioFileReader(path).read()
+        # Decoding carries on past the damage instead of stopping halfway
+        assert audio.size > 0.9 * 4 * 16000
+        assert "corrupt audio packet" in caplog.text
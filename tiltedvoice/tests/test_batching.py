@@ -0,0 +1,142 @@
+"""Tests for tiltedvoice.batching and Transcriber.transcribe_batch with mocked decoding."""
+
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+
+from tiltedvoice.batching import BatchDecodeOutput, bucket_by_duration, load_clip
+from tiltedvoice.result_cache import ResultCache
+from tiltedvoice.transcriber import Transcriber
+
+
+def _audio(seconds: float) -> np.ndarray:
+    return (np.random.randn(int(seconds * 16000)) * 0.1).astype(np.float32)
+
+
+def _make_transcriber(cache=None):
+    t = Transcriber(cache=cache)
+    t._model = MagicMock()
+    t._device = "cpu"
+    t._compute_type = "int8"
+    return t
+
+
+def _echo_decode(model, audios, language, beam_size, no_speech_threshold, abort_event=None):
+    """Fake decoder: text encodes each clip's length so order can be checked."""
+    return [BatchDecodeOutput(text=f"clip{len(a) // 16000}s", avg_logprob=-0.2) for a in audios]
+
+
+# =========================================================================
+# Bucketing
+# =========================================================================
+
+class TestBucketing:
+    def test_sorted_by_duration(self):
+        assert bucket_by_duration([5.0, 1.0, 3.0, 2.0], batch_size=2) == [[1, 3], [2, 0]]
+
+    def test_single_bucket(self):
+        assert bucket_by_duration([1.0, 2.0], batch_size=8) == [[0, 1]]
+
+    def test_empty(self):
+        assert bucket_by_duration([], batch_size=4) == []
+
+    def test_load_clip_flattens_array(self):
+        clip = load_clip(np.zeros((800, 1), dtype=np.int16))
+        assert clip.dtype == np.float32
+        assert clip.shape == (800,)
+
+
+# =========================================================================
+# transcribe_batch
+# =========================================================================
+
+class TestTranscribeBatch:
+    @patch("tiltedvoice.transcriber.decode_batch", side_effect=_echo_decode)
+    def test_results_in_input_order(self, mock_decode):
+        t = _make_transcriber()
+        results = t.transcribe_batch([_audio(3), _audio(1), _audio(2)], batch_size=2)
+
+        assert [r.text for r in results] == ["clip3s", "clip1s", "clip2s"]
+        assert mock_decode.call_count == 2
+        assert results[1].debug_info["batch_size"] == 2
+        assert all(r.processing_time_ms >= 0 for r in results)
+        assert results[0].segments[0].end == 3.0
+
+    @patch("tiltedvoice.transcriber.decode_batch", side_effect=_echo_decode)
+    def test_long_clip_uses_transcribe(self, mock_decode):
+        t = _make_transcriber()
+        t._model.transcribe.return_value = (
+            iter([SimpleNamespace(text="long", start=0.0, end=40.0, avg_logprob=-0.3)]),
+            SimpleNamespace(language="en", language_probability=0.9, duration=40.0),
+        )
+        results = t.transcribe_batch([_audio(40), _audio(1)])
+
+        assert [r.text for r in results] == ["long", "clip1s"]
+        t._model.transcribe.assert_called_once()
+
+    @patch("tiltedvoice.transcriber.decode_batch", side_effect=_echo_decode)
+    def test_empty_clip(self, mock_decode):
+        t = _make_transcriber()
+        results = t.transcribe_batch([np.zeros(0, dtype=np.float32), _audio(1)])
+        assert results[0].text == ""
+        assert results[1].text == "clip1s"
+
+    @patch("tiltedvoice.transcriber.decode_batch")
+    def test_batch_timeout_gives_empty_results(self, mock_decode):
+        t = _make_transcriber()
+        with patch.object(t, "_call_with_timeout", return_value=None):
+            results = t.transcribe_batch([_audio(1), _audio(2)])
+        assert [r.text for r in results] == ["", ""]
+        assert results[0].debug_info["selected_pass"] == "batch"
+
+    @patch("tiltedvoice.transcriber.decode_batch", side_effect=_echo_decode)
+    def test_confidence_matches_transcribe(self, mock_decode):
+        result = _make_transcriber().transcribe_batch([_audio(1), _audio(2)])[0]
+        # Language probability, as transcribe() reports; the batch decodes with the language forced
+        assert result.confidence == 1.0
+        assert result.segments[0].confidence == -0.2
+
+    @patch("tiltedvoice.transcriber.decode_batch", side_effect=_echo_decode)
+    def test_cached_clips_not_decoded(self, mock_decode, tmp_path):
+        t = _make_transcriber(cache=ResultCache(tmp_path))
+        clips = [_audio(1), _audio(2)]
+        first = t.transcribe_batch(clips)
+        again = t.transcribe_batch(clips + [_audio(3)])
+        assert [r.text for r in again] == [r.text for r in first] + ["clip3s"]
+        assert [len(call.args[1]) for call in mock_decode.call_args_list] == [2, 1]
+
+    @patch("tiltedvoice.transcriber.decode_batch", side_effect=_echo_decode)
+    def test_batch_results_not_served_to_transcribe(self, mock_decode, tmp_path):
+        t = _make_transcriber(cache=ResultCache(tmp_path))
+        clip = _audio(1)
+        t.transcribe_batch([clip])
+        t._model.transcribe.return_value = (
+            iter([SimpleNamespace(text="full", start=0.2, end=0.8, avg_logprob=-0.1)]),
+            SimpleNamespace(language="en", language_probability=0.9, duration=1.0),
+        )
+        assert t.transcribe(clip).text == "full"
+        # ...while a batch reuses what transcribe() cached
+        assert t.transcribe_batch([clip])[0].text == "full"
+        assert mock_decode.call_count == 1
+
+    @patch("tiltedvoice.transcriber.decode_batch", side_effect=_echo_decode)
+    def test_model_not_loaded_when_all_cached(self, mock_decode, tmp_path):
+        t = _make_transcriber(cache=ResultCache(tmp_path))
+        clips = [_audio(1), _audio(2)]
+        t.transcribe_batch(clips)
+        with patch.object(t, "load_model") as load:
+            t.transcribe_batch(clips)
+        load.assert_not_called()
+
+    @patch("tiltedvoice.transcriber.decode_batch")
+    def test_empty_clip_with_energy_retried(self, mock_decode):
+        mock_decode.side_effect = lambda model, audios, **kw: [BatchDecodeOutput(text="") for _ in audios]
+        t = _make_transcriber()
+        silent = np.zeros(16000, dtype=np.float32)
+        with patch.object(t, "transcribe", return_value=MagicMock(text="retried")) as full:
+            results = t.transcribe_batch([_audio(1), silent])
+        # Only the clip with audio energy gets the full path's VAD-off retry
+        assert results[0].text == "retried"
+        full.assert_called_once()
+        assert results[1].text == ""
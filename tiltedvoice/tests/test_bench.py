@@ -0,0 +1,109 @@
+"""Tests for tiltedvoice.bench — metrics, baseline comparison and the bench loop."""
+
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from tiltedvoice.bench import (
+    BenchClip,
+    BenchConfig,
+    compare_to_baseline,
+    format_report,
+    percentile,
+    run_config,
+    time_to_first_segment_ms,
+    word_errors,
+)
+from tiltedvoice.cli import build_parser
+from tiltedvoice.models import TranscriptionResult, WhisperModel
+
+
+def _clip(seconds: float, reference=None) -> BenchClip:
+    return BenchClip(path=Path(f"clip{seconds}.wav"), audio=np.zeros(int(seconds * 16000), np.float32),
+                     reference=reference)
+
+
+class TestMetrics:
+    def test_wer_counts_edits(self):
+        assert word_errors("Hello, world!", "hello world") == (0, 2)
+        assert word_errors("the cat sat", "the bat sat down") == (2, 3)
+        assert word_errors("", "extra") == (1, 0)
+
+    def test_percentile(self):
+        assert percentile([1, 2, 3, 4], 50) == 2.5
+        assert percentile([], 95) is None
+
+    def test_first_segment_spans_passes(self):
+        info = {"passes": [
+            {"elapsed_ms": 300.0, "first_segment_ms": None},
+            {"elapsed_ms": 500.0, "first_segment_ms": 120.0},
+        ]}
+        assert time_to_first_segment_ms(info) == 420.0
+        assert time_to_first_segment_ms({"passes": []}) is None
+
+
+class TestRunConfig:
+    def test_summary(self):
+        transcriber = MagicMock()
+        transcriber.transcribe.return_value = TranscriptionResult(
+            text="hello world",
+            debug_info={"passes": [{"elapsed_ms": 10.0, "first_segment_ms": 5.0}]},
+        )
+        clips = [_clip(1.0, "hello world"), _clip(2.0, "hello there world")]
+        summary = run_config(BenchConfig(WhisperModel.TINY_EN), clips, warmup=1, transcriber=transcriber)
+
+        assert transcriber.transcribe.call_count == 3  # one warmup + two timed
+        assert summary["key"] == "tiny.en/auto/beam1/vad"
+        assert summary["clips"] == 2
+        assert summary["audio_s"] == pytest.approx(3.0)
+        assert summary["rtf"] == pytest.approx(summary["decode_s"] / 3.0)
+        assert summary["wer"] == pytest.approx(1 / 5)
+        assert summary["first_segment_p50_ms"] == 5.0
+        transcriber.unload.assert_called_once()
+        assert summary["rss_growth_mb"] is None or summary["rss_growth_mb"] >= 0
+
+    def test_failed_config_still_unloads(self):
+        transcriber = MagicMock()
+        transcriber.transcribe.side_effect = RuntimeError("decoder crashed")
+        with pytest.raises(RuntimeError):
+            run_config(BenchConfig(WhisperModel.TINY_EN), [_clip(1.0)], transcriber=transcriber)
+        transcriber.unload.assert_called_once()
+
+
+class TestBaseline:
+    def _report(self, rtf, wer):
+        return {"runs": [{"key": "base.en/int8/beam1/vad", "rtf": rtf, "latency_p50_ms": 100.0,
+                          "latency_p95_ms": 200.0, "first_segment_p50_ms": None, "rss_growth_mb": 500.0,
+                          "wer": wer}]}
+
+    def test_regressions_flagged(self):
+        rows = compare_to_baseline(self._report(0.30, 0.10), self._report(0.20, 0.05))
+        regressed = {r["metric"] for r in rows if r["regressed"]}
+        assert regressed == {"rtf", "wer"}
+
+    def test_within_tolerance(self):
+        rows = compare_to_baseline(self._report(0.21, 0.055), self._report(0.20, 0.05))
+        assert not any(r["regressed"] for r in rows)
+
+    def test_format_report(self):
+        report = {"corpus": {"clips": 1, "audio_s": 1.0, "with_reference": 1},
+                  "runs": [dict(self._report(0.2, 0.05)["runs"][0], load_ms=900.0)]}
+        text = format_report(report, compare_to_baseline(report, self._report(0.1, 0.05)))
+        assert "base.en/int8/beam1/vad" in text
+        assert "REGRESSION" in text
+
+
+class TestCli:
+    def test_bench_matrix(self):
+        from tiltedvoice.bench import build_configs
+
+        args = build_parser().parse_args(
+            ["bench", "corpus", "--model", "tiny.en", "--model", "base.en", "--vad", "on", "--vad", "off"]
+        )
+        keys = [c.key for c in build_configs(args)]
+        assert keys == [
+            "tiny.en/auto/beam1/vad", "tiny.en/auto/beam1/novad",
+            "base.en/auto/beam1/vad", "base.en/auto/beam1/novad",
+        ]
@@ -0,0 +1,59 @@
+"""Tests for tiltedvoice.diagnostics — the bounded diagnostics ring."""
+
+import threading
+
+from tiltedvoice.diagnostics import DiagEvent, DiagnosticsLog
+
+
+class TestDiagEvent:
+    def test_format(self):
+        event = DiagEvent("record_start", {"mode": "manual", "mic": "USB Mic", "rms": 0.0123456, "segs": 3})
+        line = event.format()
+        assert line.startswith("[") and line[9:11] == "] "
+        assert line[11:] == "record_start mode=manual mic='USB Mic' rms=0.012346 segs=3"
+
+
+class TestDiagnosticsLog:
+    def test_ring_is_bounded(self):
+        log = DiagnosticsLog(capacity=10)
+        for i in range(25):
+            log.record("tick", i=i)
+        assert [e.fields["i"] for e in log.events()] == list(range(15, 25))
+        assert log.lines(last=2)[-1].endswith("tick i=24")
+
+    def test_version_moves_on_every_change(self):
+        log = DiagnosticsLog()
+        assert log.version == 0
+        log.record("a")
+        first = log.version
+        log.record("b")
+        assert log.version != first
+        seen = log.version
+        log.clear()
+        assert log.version != seen and log.events() == []
+
+    def test_concurrent_recording(self):
+        log = DiagnosticsLog(capacity=100_000)
+
+        def _worker(n):
+            for i in range(2000):
+                log.record("evt", worker=n, i=i)
+
+        threads = [threading.Thread(target=_worker, args=(n,)) for n in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        events = log.events()
+        assert len(events) == 8000
+        for n in range(4):
+            assert [e.fields["i"] for e in events if e.fields["worker"] == n] == list(range(2000))
+
+    def test_dump(self, tmp_path):
+        log = DiagnosticsLog()
+        log.record("status", message="Loading model")
+        log.record("result_empty")
+        path = log.dump(tmp_path / "diag" / "diagnostics.log")
+        lines = path.read_text(encoding="utf-8").splitlines()
+        assert lines[0].endswith("status message='Loading model'")
+        assert lines[1].endswith("result_empty")
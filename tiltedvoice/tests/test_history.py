@@ -0,0 +1,183 @@
+"""Tests for tiltedvoice.history — the SQLite-backed history store."""
+
+import json
+
+import pytest
+
+from tiltedvoice.history import PHRASE, PREFIX, WORD, HistoryEntry, HistoryStore, PagedRows, parse_query
+
+
+@pytest.fixture
+def store(tmp_path):
+    s = HistoryStore(tmp_path / "history.db")
+    yield s
+    s.close()
+
+
+class TestHistoryStore:
+    def test_appended_entries_visible_before_written(self, store):
+        store.append(HistoryEntry(text="first", ms=120))
+        store.append(HistoryEntry(text="second", ms=80))
+        assert store.count() == 2
+        assert [e.text for e in store.page(0, 10)] == ["second", "first"]
+        store.flush(5)
+        assert [e.text for e in store.page(0, 10)] == ["second", "first"]
+        assert all(e.id is not None for e in store.page(0, 10))
+
+    def test_pages_newest_first(self, store):
+        for i in range(25):
+            store.append(HistoryEntry(text=f"t{i}"))
+        store.flush(5)
+        store.append(HistoryEntry(text="t25"))  # still pending
+        pages = [store.page(offset, 10) for offset in (0, 10, 20)]
+        assert [e.text for e in pages[0]][:2] == ["t25", "t24"]
+        assert [e.text for page in pages for e in page] == [f"t{i}" for i in range(25, -1, -1)]
+
+    def test_pages_with_id_gaps(self, store):
+        for i in range(10):
+            store.append(HistoryEntry(text=f"t{i}"))
+        store.flush(5)
+        store._conn.execute("DELETE FROM history WHERE text = 't5'")
+        store._count -= 1
+        assert [e.text for e in store.page(3, 3)] == ["t6", "t4", "t3"]
+
+    def test_no_retention_cap(self, store):
+        for i in range(600):
+            store.append(HistoryEntry(text=f"t{i}"))
+        store.flush(5)
+        assert store.count() == 600
+        assert [e.text for e in store.iter_entries()][0] == "t0"
+
+    def test_clear(self, store):
+        store.append(HistoryEntry(text="gone"))
+        store.clear()
+        store.flush(5)
+        assert store.count() == 0 and store.page() == []
+
+    def test_clear_visible_immediately(self, store):
+        for i in range(20):
+            store.append(HistoryEntry(text=f"old words {i}"))
+        store.flush(5)
+        store.append(HistoryEntry(text="queued words"))
+        store.clear()
+        assert store.count() == 0 and store.page() == []
+        assert store.search("words") == [] and store.search_count("words") == 0
+        store.append(HistoryEntry(text="new words"))
+        store.flush(5)
+        assert [e.text for e in store.page()] == ["new words"]
+        assert [e.text for e in store.search("words")] == ["new words"]
+
+    def test_persists_across_reopen(self, tmp_path):
+        first = HistoryStore(tmp_path / "history.db")
+        first.append(HistoryEntry(text="kept", ms=42, wpm=130.0, time="09:15:00"))
+        first.close()
+        second = HistoryStore(tmp_path / "history.db")
+        entry = second.page(0, 1)[0]
+        second.close()
+        assert (entry.text, entry.ms, entry.wpm, entry.time) == ("kept", 42, 130.0, "09:15:00")
+
+    def test_imports_legacy_json_once(self, tmp_path):
+        legacy = tmp_path / "history.json"
+        legacy.write_text(json.dumps([
+            {"time": "10:00:00", "ms": 300, "text": "old one", "wpm": 90},
+            {"time": "10:01:00", "ms": 250, "text": "old two"},
+        ]))
+        store = HistoryStore(tmp_path / "history.db", legacy_json=legacy)
+        assert [e.text for e in store.page()] == ["old two", "old one"]
+        store.close()
+        assert not legacy.exists() and (tmp_path / "history.json.migrated").exists()
+        reopened = HistoryStore(tmp_path / "history.db", legacy_json=legacy)
+        assert reopened.count() == 2
+        reopened.close()
+
+
+class TestSearch:
+    @pytest.fixture
+    def filled(self, store):
+        for text in [
+            "Schedule the quarterly review with finance",
+            "Remind me to call the plumber tomorrow",
+            "The review of the pull request is done",
+            "Quarterly numbers look better than the review suggested",
+        ]:
+            store.append(HistoryEntry(text=text))
+        store.flush(5)
+        return store
+
+    def test_prefix_terms(self, filled):
+        assert {e.text for e in filled.search("quart")} == {
+            "Schedule the quarterly review with finance",
+            "Quarterly numbers look better than the review suggested",
+        }
+
+    def test_all_terms_must_match(self, filled):
+        assert [e.text for e in filled.search("tomorrow plumb")] == ["Remind me to call the plumber tomorrow"]
+        assert filled.search("plumber finance") == []
+
+    def test_only_last_word_is_a_prefix(self, filled):
+        assert filled.search("plumb tomorrow") == []
+        assert parse_query('call "the plumber" tom') == [("call", WORD), ("the plumber", PHRASE), ("tom", PREFIX)]
+
+    def test_phrase_query(self, filled):
+        assert [e.text for e in filled.search('"review of the"')] == ["The review of the pull request is done"]
+
+    def test_ranked_and_paged(self, filled):
+        assert filled.search_count("review") == 3
+        first, rest = filled.search("review", 0, 1), filled.search("review", 1, 10)
+        assert len(first) == 1 and len(rest) == 2
+        assert first[0].text not in {e.text for e in rest}
+
+    def test_pending_entries_are_searchable(self, filled):
+        filled.append(HistoryEntry(text="Fresh review notes"))
+        assert filled.search("fresh")[0].text == "Fresh review notes"
+        assert filled.search_count("review") == 4
+
+    def test_existing_rows_indexed_on_upgrade(self, tmp_path):
+        import sqlite3
+
+        path = tmp_path / "history.db"
+        conn = sqlite3.connect(path)
+        conn.execute("CREATE TABLE history (id INTEGER PRIMARY KEY AUTOINCREMENT, created REAL NOT NULL, "
+                     "time TEXT NOT NULL, ms INTEGER NOT NULL, text TEXT NOT NULL, wpm REAL NOT NULL DEFAULT 0)")
+        conn.execute("INSERT INTO history (created, time, ms, text) VALUES (0, '', 0, 'written by version one')")
+        conn.execute("PRAGMA user_version=1")
+        conn.commit()
+        conn.close()
+        store = HistoryStore(path)
+        assert [e.text for e in store.search("version")] == ["written by version one"]
+        store.close()
+
+    def test_punctuation_and_empty_queries(self, filled):
+        assert filled.search("") == [] and filled.search_count('"" !!') == 0
+        assert len(filled.search('plumber"*')) == 1
+
+    def test_paging_past_rank_window(self, store, monkeypatch):
+        monkeypatch.setattr("tiltedvoice.history.RANK_WINDOW", 3)
+        for i in range(8):
+            store.append(HistoryEntry(text=f"note {i}"))
+        store.flush(5)
+        seen = [e.text for offset in range(0, 8, 2) for e in store.search("note", offset, 2)]
+        assert sorted(seen) == sorted(f"note {i}" for i in range(8))
+        assert seen[3:] == [f"note {i}" for i in (4, 3, 2, 1, 0)]
+
+    def test_like_fallback_without_fts(self, filled):
+        filled._fts = False
+        assert {e.text for e in filled.search("plumb")} == {"Remind me to call the plumber tomorrow"}
+        assert filled.search_count("review") == 3
+
+
+class TestPagedRows:
+    def test_fetches_each_page_once_and_bounds_cache(self):
+        calls = []
+
+        def fetch(offset, limit):
+            calls.append(offset)
+            return [HistoryEntry(text=str(i)) for i in range(offset, min(offset + limit, 95))]
+
+        rows = PagedRows(fetch, total=95, page_size=10, max_pages=2)
+        assert rows.get(0).text == "0" and rows.get(9).text == "9"
+        assert rows.get(94).text == "94" and rows.get(95) is None
+        assert calls == [0, 90]
+        rows.get(50)
+        rows.get(0)
+        assert calls == [0, 90, 50, 0]
@@ -0,0 +1,194 @@
+"""Tests for tiltedvoice.longform — chunk planning, stitching and resume."""
+
+import json
+import threading
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from tiltedvoice.longform import Chunk, ChunkPlanner, LongFormTranscriber, stitch_segments
+from tiltedvoice.models import TranscriptionResult, TranscriptionSegment
+
+RATE = 16000
+
+
+def _speech(seconds: float) -> np.ndarray:
+    t = np.arange(int(seconds * RATE)) / RATE
+    return (0.3 * np.sin(2 * np.pi * 220 * t)).astype(np.float32)
+
+
+def _silence(seconds: float) -> np.ndarray:
+    return np.zeros(int(seconds * RATE), dtype=np.float32)
+
+
+def _plan(audio: np.ndarray, block_s: float = 7.0, **kwargs):
+    planner = ChunkPlanner(**kwargs)
+    block = int(block_s * RATE)
+    chunks = []
+    for i in range(0, audio.size, block):
+        chunks += planner.feed(audio[i:i + block])
+    return chunks + planner.flush()
+
+
+class TestChunkPlanner:
+    def test_splits_inside_silence(self):
+        audio = np.concatenate([_speech(22), _silence(1.0), _speech(22)])
+        chunks = _plan(audio)
+        assert len(chunks) == 2
+        assert 22.0 <= chunks[0].end_s <= 23.0
+        assert chunks[0].pad_start == 0 and chunks[1].pad_start == chunks[1].start
+
+    def test_forced_split_overlaps_neighbours(self):
+        chunks = _plan(_speech(50), overlap_s=1.0)
+        assert chunks[0].end_s == 30.0
+        assert chunks[0].audio.size == 31 * RATE
+        assert chunks[1].offset_s == 29.0
+        assert chunks[1].audio.size == (50 - 29) * RATE
+
+    def test_detector_decides_what_is_a_pause(self):
+        class _HumDetector:
+            """Calls a steady hum non-speech, however loud it is."""
+
+            frame_ms = 32
+            resets = 0
+
+            def is_speech(self, frame):
+                return float(np.ptp(frame)) > 0.01
+
+            def reset(self):
+                self.resets += 1
+
+        hum = np.full(RATE, 0.2, dtype=np.float32)
+        audio = np.concatenate([_speech(22), hum, _speech(22)])
+        detector = _HumDetector()
+        chunks = _plan(audio, detector=detector)
+        assert 22.0 <= chunks[0].end_s <= 23.0 and chunks[0].pad_start == 0
+        assert detector.resets >= 1
+        # By level alone the hum is as loud as speech, so the cut is forced
+        assert _plan(audio)[0].end_s == 30.0
+
+    def test_chunks_cover_whole_stream(self):
+        audio = np.concatenate([_speech(18), _silence(0.5), _speech(40), _silence(2), _speech(5)])
+        chunks = _plan(audio)
+        assert chunks[0].start == 0 and chunks[-1].end == audio.size
+        for a, b in zip(chunks, chunks[1:]):
+            assert a.end == b.start
+        assert all(c.end - c.start <= 30 * RATE for c in chunks)
+        assert [c.index for c in chunks] == list(range(len(chunks)))
+
+
+class TestStitching:
+    def test_boundary_segment_kept_once(self):
+        first = Chunk(index=0, start=0, end=30 * RATE, pad_start=0, audio=_silence(31))
+        second = Chunk(index=1, start=30 * RATE, end=50 * RATE, pad_start=29 * RATE, audio=_silence(21))
+        # The same words decoded at the end of one chunk and start of the next
+        tail = [TranscriptionSegment(text="before", start=25.0, end=29.0),
+                TranscriptionSegment(text="across", start=29.2, end=30.6)]
+        head = [TranscriptionSegment(text="across", start=0.2, end=1.6),
+                TranscriptionSegment(text="after", start=2.0, end=6.0)]
+        kept = stitch_segments(first, tail, last=False) + stitch_segments(second, head, last=True)
+        assert [s.text for s in kept] == ["before", "across", "after"]
+        assert kept[-1].start == 31.0
+
+
+def _replica(log):
+    replica = MagicMock()
+
+    def _transcribe(audio, language=None, cancel_event=None):
+        log.append(audio.size)
+        dur = audio.size / RATE
+        return TranscriptionResult(
+            text=f"chunk{len(log)}",
+            segments=[TranscriptionSegment(text=f"chunk{len(log)}", start=0.0, end=dur)],
+            duration=dur,
+        )
+
+    replica.transcribe.side_effect = _transcribe
+    return replica
+
+
+class TestLongFormTranscriber:
+    AUDIO = np.concatenate([_speech(20), _silence(1), _speech(20), _silence(1), _speech(10)])
+
+    def _blocks(self):
+        return [self.AUDIO[i:i + 5 * RATE] for i in range(0, self.AUDIO.size, 5 * RATE)]
+
+    @pytest.fixture
+    def source(self, tmp_path):
+        path = tmp_path / "talk.wav"
+        path.write_bytes(b"RIFF-not-really")
+        return path
+
+    def test_transcribes_all_chunks_in_order(self, source):
+        log = []
+        lf = LongFormTranscriber(replicas=[_replica(log), _replica(log)], planner_factory=ChunkPlanner)
+        progress = []
+        result = lf.transcribe_file(source, blocks=self._blocks(), on_progress=lambda *a: progress.append(a))
+        assert len(log) == 3
+        assert result.debug_info["chunks"] == 3 and result.debug_info["complete"]
+        starts = [s.start for s in result.segments]
+        assert starts == sorted(starts)
+        assert result.duration == pytest.approx(self.AUDIO.size / RATE)
+        assert progress[-1][1] == 3
+
+    def test_resumes_from_checkpoint(self, source, tmp_path):
+        checkpoint = tmp_path / "talk.ckpt.json"
+        cancel = threading.Event()
+        log = []
+        replica = _replica(log)
+        first_call = replica.transcribe.side_effect
+
+        def _interrupt(audio, language=None, cancel_event=None):
+            result = first_call(audio, language, cancel_event)
+            if len(log) == 2:
+                cancel.set()
+            return result
+
+        replica.transcribe.side_effect = _interrupt
+        partial = LongFormTranscriber(replicas=[replica], planner_factory=ChunkPlanner).transcribe_file(
+            source, checkpoint_path=checkpoint, cancel_event=cancel, blocks=self._blocks()
+        )
+        assert not partial.debug_info["complete"]
+        saved = json.loads(checkpoint.read_text())
+        assert len(saved["chunks"]) == 1 and not saved["complete"]
+
+        log2 = []
+        result = LongFormTranscriber(replicas=[_replica(log2)], planner_factory=ChunkPlanner).transcribe_file(
+            source, checkpoint_path=checkpoint, blocks=self._blocks()
+        )
+        assert len(log2) == 2
+        assert result.debug_info["resumed_chunks"] == 1
+        assert result.debug_info["complete"]
+        assert json.loads(checkpoint.read_text())["complete"]
+
+    def test_cut_short_chunk_not_complete(self, source, tmp_path):
+        checkpoint = tmp_path / "talk.ckpt.json"
+        log = []
+        replica = _replica(log)
+        decode = replica.transcribe.side_effect
+
+        def _timeout_second(audio, language=None, cancel_event=None):
+            result = decode(audio, language, cancel_event)
+            if len(log) == 2:
+                result.debug_info = {"passes": [{"stop_reason": "pass_timeout"}]}
+            return result
+
+        replica.transcribe.side_effect = _timeout_second
+        result = LongFormTranscriber(replicas=[replica], planner_factory=ChunkPlanner).transcribe_file(
+            source, checkpoint_path=checkpoint, blocks=self._blocks()
+        )
+        assert not result.debug_info["complete"]
+        assert result.debug_info["incomplete_chunks"] == 1
+        saved = json.loads(checkpoint.read_text())
+        assert len(saved["chunks"]) == 2 and not saved["complete"]
+
+    def test_checkpoint_for_other_file_ignored(self, source, tmp_path):
+        checkpoint = tmp_path / "talk.ckpt.json"
+        checkpoint.write_text(json.dumps({"version": 1, "key": "other", "complete": True,
+                                          "chunks": {"0": {"start": 0, "end": 1, "segments": []}}}))
+        log = []
+        LongFormTranscriber(replicas=[_replica(log)], planner_factory=ChunkPlanner).transcribe_file(
+            source, checkpoint_path=checkpoint, blocks=self._blocks()
+        )
+        assert len(log) == 3
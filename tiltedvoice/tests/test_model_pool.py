@@ -0,0 +1,105 @@
+"""Tests for tiltedvoice.model_pool — shared, reference-counted model registry."""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from tiltedvoice.model_pool import ModelPool
+from tiltedvoice.models import TranscriberConfig, WhisperModel
+from tiltedvoice.transcriber import Transcriber
+
+
+def _pool(budget_mb: int = 2048):
+    factory = MagicMock(side_effect=lambda name, device, compute: MagicMock(name=name))
+    return ModelPool(budget_mb=budget_mb, factory=factory), factory
+
+
+# =========================================================================
+# Pool behaviour
+# =========================================================================
+
+class TestModelPool:
+    def test_acquire_loads_once(self):
+        pool, factory = _pool()
+        a = pool.acquire("base.en", "cpu", "int8")
+        b = pool.acquire("base.en", "cpu", "int8")
+        assert a is b
+        assert factory.call_count == 1
+        assert pool.refcount("base.en", "cpu", "int8") == 2
+
+    def test_release_keeps_model_warm(self):
+        pool, factory = _pool()
+        pool.acquire("base.en", "cpu", "int8")
+        pool.release("base.en", "cpu", "int8")
+        assert pool.is_loaded("base.en", "cpu", "int8")
+        pool.acquire("base.en", "cpu", "int8")
+        assert factory.call_count == 1
+
+    def test_lru_eviction_over_budget(self):
+        pool, _ = _pool(budget_mb=WhisperModel.BASE_EN.size_mb + WhisperModel.SMALL_EN.size_mb)
+        for name in ("tiny.en", "base.en"):
+            pool.acquire(name, "cpu", "int8")
+            pool.release(name, "cpu", "int8")
+        pool.acquire("small.en", "cpu", "int8")
+        keys = [k[0] for k in pool.loaded_keys]
+        assert "tiny.en" not in keys
+        assert keys == ["base.en", "small.en"]
+
+    def test_referenced_models_never_evicted(self):
+        pool, _ = _pool(budget_mb=100)
+        pool.acquire("base.en", "cpu", "int8")
+        pool.acquire("small.en", "cpu", "int8")
+        assert pool.is_loaded("base.en", "cpu", "int8")
+        assert pool.is_loaded("small.en", "cpu", "int8")
+        assert pool.evict("base.en", "cpu", "int8") is False
+
+    def test_preload_leaves_idle_model(self):
+        pool, factory = _pool()
+        pool.preload("tiny.en", "cpu", "int8").join(timeout=5)
+        assert pool.is_loaded("tiny.en", "cpu", "int8")
+        assert pool.refcount("tiny.en", "cpu", "int8") == 0
+
+    def test_factory_error_propagates(self):
+        pool = ModelPool(factory=MagicMock(side_effect=RuntimeError("boom")))
+        with pytest.raises(RuntimeError, match="boom"):
+            pool.acquire("base.en", "cpu", "int8")
+        assert pool.loaded_keys == []
+
+
+# =========================================================================
+# Transcriber integration
+# =========================================================================
+
+class TestTranscriberWithPool:
+    def test_instances_share_model(self):
+        pool, factory = _pool()
+        cfg = TranscriberConfig(device="cpu", compute_type="int8")
+        a = Transcriber(config=cfg, pool=pool)
+        b = Transcriber(config=cfg, pool=pool)
+        a.load_model()
+        b.load_model()
+        assert a._model is b._model
+        assert factory.call_count == 1
+
+    def test_unload_returns_model_to_pool(self):
+        pool, factory = _pool()
+        t = Transcriber(config=TranscriberConfig(device="cpu", compute_type="int8"), pool=pool)
+        t.load_model()
+        t.unload()
+        assert t.is_loaded is False
+        assert pool.refcount("base.en", "cpu", "int8") == 0
+        Transcriber(config=TranscriberConfig(device="cpu", compute_type="int8"), pool=pool).load_model()
+        assert factory.call_count == 1
+
+    @patch("tiltedvoice.transcriber.Transcriber._resolve_device", return_value=("cuda", "float16"))
+    def test_cuda_fallback_through_pool(self, mock_resolve):
+        def factory(name, device, compute):
+            if device == "cuda":
+                raise RuntimeError("CUDA error: cublas not found")
+            return MagicMock()
+
+        pool = ModelPool(factory=factory)
+        t = Transcriber(pool=pool)
+        t.load_model()
+        assert t.device == "cpu"
+        assert pool.is_loaded("base.en", "cpu", "int8")
@@ -10,6 +10,7 @@ from tiltedvoice.models import (
     TranscriberConfig,
     TranscriptionResult,
     TranscriptionSegment,
+    VADMode,
     WhisperModel,
 )
 
@@ -140,6 +141,9 @@ class TestAudioConfig:
         assert c.channels == 1
         assert c.dtype == "float32"
         assert c.energy_threshold == 0.01
+        assert c.vad_mode == VADMode.ENERGY
+        assert c.hangover_ms == 300
+        assert c.pre_roll_ms == 300
 
     def test_custom(self):
         c = AudioConfig(sample_rate=44100, channels=2, energy_threshold=0.05)
@@ -162,6 +166,7 @@ class TestTranscriberConfig:
         assert c.vad_filter is True
         assert c.vad_threshold == 0.5
         assert c.word_timestamps is False
+        assert c.speculative_fallback is False
 
     def test_custom_model(self):
         c = TranscriberConfig(model=WhisperModel.SMALL_EN, beam_size=5)
@@ -194,6 +199,19 @@ class TestAppSettings:
         assert s.auto_copy is True
         assert s.energy_threshold == 0.01
         assert s.silence_ms == 1200
+        assert s.speculative_decoding is False
+        assert s.vad_mode == VADMode.ENERGY
+        assert s.adaptive_model is False
+        assert s.draft_refine is False
+
+    def test_adaptive_model_round_trip(self):
+        assert AppSettings.from_dict(AppSettings(adaptive_model=True).to_dict()).adaptive_model is True
+
+    def test_vad_mode_round_trip(self):
+        s = AppSettings.from_dict(AppSettings(vad_mode=VADMode.SILERO, pre_roll_ms=150).to_dict())
+        assert s.vad_mode == VADMode.SILERO
+        assert s.pre_roll_ms == 150
+        assert AppSettings.from_dict({"vad_mode": "bogus"}).vad_mode == VADMode.ENERGY
 
     def test_custom_settings(self):
         s = AppSettings(
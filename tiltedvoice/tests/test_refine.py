@@ -0,0 +1,104 @@
+"""Tests for tiltedvoice.refine — draft-then-refine transcription."""
+
+import threading
+from unittest.mock import MagicMock
+
+import numpy as np
+
+from tiltedvoice.models import TranscriberConfig, TranscriptionResult, TranscriptionSegment, WhisperModel
+from tiltedvoice.refine import DraftRefiner, apply_edits, text_edits, wants_draft
+from tiltedvoice.transcriber import Transcriber
+
+AUDIO = np.full(16000, 0.1, dtype=np.float32)
+
+
+def _transcriber(text: str, model: str = "small.en") -> MagicMock:
+    t = MagicMock()
+    t._config = TranscriberConfig(model=WhisperModel(model))
+    t.transcribe.return_value = TranscriptionResult(text=text, model_name=model, processing_time_ms=10.0)
+    return t
+
+
+class TestTextEdits:
+    def test_only_changed_words_are_replaced(self):
+        old = "I scream for ice cream"
+        new = "I scream for ice-cream!"
+        edits = text_edits(old, new)
+        assert apply_edits(old, edits) == new
+        assert all(start >= len("I scream for ") for start, _, _ in edits)
+
+    def test_identical_text_has_no_edits(self):
+        assert text_edits("same words", "same words") == []
+
+    def test_round_trip_on_insertions_and_deletions(self):
+        old = "hello world how are you"
+        new = "well hello there world are you doing"
+        assert apply_edits(old, text_edits(old, new)) == new
+
+
+class TestWantsDraft:
+    def test_slow_models_on_cpu_only(self):
+        cpu = dict(device="cpu", compute_type="int8")
+        assert wants_draft(Transcriber(config=TranscriberConfig(model=WhisperModel.SMALL_EN, **cpu)))
+        assert not wants_draft(Transcriber(config=TranscriberConfig(model=WhisperModel.BASE_EN, **cpu)))
+        gpu = dict(device="cuda", compute_type="float16")
+        assert not wants_draft(Transcriber(config=TranscriberConfig(model=WhisperModel.MEDIUM_EN, **gpu)))
+
+
+class TestDraftRefiner:
+    def test_draft_delivered_before_refined_result(self):
+        order = []
+        draft = _transcriber("ice scream", "tiny.en")
+        final = _transcriber("ice cream")
+        draft.transcribe.side_effect = lambda *a, **k: order.append("draft") or draft.transcribe.return_value
+        final.transcribe.side_effect = lambda *a, **k: order.append("final") or final.transcribe.return_value
+
+        result = DraftRefiner(final, draft).transcribe(AUDIO, on_draft=lambda r: order.append(("shown", r.text)))
+
+        assert order == ["draft", ("shown", "ice scream"), "final"]
+        assert result.text == "ice cream"
+        assert result.debug_info["draft"]["text"] == "ice scream"
+        assert result.debug_info["draft"]["refined"] is True
+
+    def test_keeps_draft_when_refinement_is_empty(self):
+        refiner = DraftRefiner(_transcriber(""), _transcriber("hello", "tiny.en"))
+        result = refiner.transcribe(AUDIO, on_draft=lambda r: None)
+        assert result.text == "hello"
+        assert result.debug_info["draft"]["refined"] is False
+
+    def test_cancel_after_draft_skips_refinement(self):
+        cancel = threading.Event()
+        final = _transcriber("never")
+        draft = _transcriber("hello", "tiny.en")
+        draft.transcribe.side_effect = lambda *a, **k: cancel.set() or draft.transcribe.return_value
+        shown = []
+        DraftRefiner(final, draft).transcribe(AUDIO, on_draft=shown.append, cancel_event=cancel)
+        final.transcribe.assert_not_called()
+        assert shown == []
+
+    def test_default_draft_uses_tiny_and_shares_pool(self):
+        pool, cache = MagicMock(), MagicMock()
+        final = Transcriber(config=TranscriberConfig(model=WhisperModel.MEDIUM_EN), pool=pool, cache=cache)
+        draft = DraftRefiner(final).draft_transcriber
+        assert draft._config.model == WhisperModel.TINY_EN
+        assert draft._pool is pool and draft._cache is cache
+
+    def test_draft_tail_appends_tiny_decode_to_committed_text(self):
+        draft = _transcriber("and the tail", "tiny.en")
+        final = _transcriber("unused")
+        committed = [TranscriptionSegment(text="Most of it", start=0.0, end=4.0)]
+        tail = np.full(8000, 0.1, dtype=np.float32)
+
+        result = DraftRefiner(final, draft).draft_tail(committed, tail)
+
+        assert result.text == "Most of it and the tail"
+        assert result.model_name == "tiny.en"
+        assert draft.transcribe.call_args.args[0] is tail
+        final.transcribe.assert_not_called()
+
+    def test_draft_tail_without_audio_is_committed_text(self):
+        draft = _transcriber("never", "tiny.en")
+        committed = [TranscriptionSegment(text="All committed", start=0.0, end=2.0)]
+        result = DraftRefiner(_transcriber("unused"), draft).draft_tail(committed, np.zeros(0, np.float32))
+        assert result.text == "All committed"
+        draft.transcribe.assert_not_called()
@@ -0,0 +1,55 @@
+"""Tests for the streaming polyphase resampler."""
+
+import numpy as np
+import pytest
+
+from tiltedvoice.resample import StreamingResampler
+
+
+def _tone(rate: int, seconds: float = 1.0, freq: float = 1000.0) -> np.ndarray:
+    t = np.arange(int(rate * seconds)) / rate
+    return np.sin(2 * np.pi * freq * t).astype(np.float32)
+
+
+class TestStreamingResampler:
+    @pytest.mark.parametrize("in_rate", [48000, 44100, 22050, 8000])
+    def test_tone_preserved_and_aligned(self, in_rate):
+        out = StreamingResampler(in_rate, 16000).process(_tone(in_rate))
+        assert out.dtype == np.float32
+        assert abs(out.size - 16000) <= 20
+        expected = np.sin(2 * np.pi * 1000 * np.arange(out.size) / 16000)
+        assert np.max(np.abs(out[100:-100] - expected[100:-100])) < 1e-2
+
+    def test_chunked_matches_one_shot(self):
+        x = np.random.default_rng(0).standard_normal(48000).astype(np.float32)
+        one_shot = StreamingResampler(44100).process(x)
+        r = StreamingResampler(44100)
+        chunked = np.concatenate([r.process(x[i:i + 5]) for i in range(0, 2000, 5)]
+                                 + [r.process(x[i:i + 997]) for i in range(2000, x.size, 997)])
+        assert np.allclose(chunked, one_shot, atol=1e-6)
+
+    def test_removes_content_above_new_nyquist(self):
+        out = StreamingResampler(48000, 16000).process(_tone(48000, freq=10000.0))
+        assert np.sqrt(np.mean(out[100:-100] ** 2)) < 1e-3
+
+    def test_flush_completes_the_stream(self):
+        r = StreamingResampler(44100, 16000)
+        out = np.concatenate([r.process(_tone(44100)), r.flush()])
+        assert out.size == 16000
+        assert r.flush().size == 0
+
+    def test_same_rate_is_passthrough(self):
+        x = _tone(16000, 0.1)
+        r = StreamingResampler(16000, 16000)
+        assert r.passthrough
+        assert np.array_equal(r.process(x), x)
+
+    def test_interleaved_stereo(self):
+        mono = _tone(48000, 0.5)
+        stereo = np.stack([mono, -mono], axis=1).reshape(-1)
+        out = StreamingResampler(48000, 16000, channels=2).process(stereo).reshape(-1, 2)
+        assert np.allclose(out[:, 0], -out[:, 1])
+
+    def test_invalid_rate(self):
+        with pytest.raises(ValueError):
+            StreamingResampler(0, 16000)
@@ -0,0 +1,141 @@
+"""Tests for tiltedvoice.result_cache — content-addressed on-disk result cache."""
+
+import os
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import numpy as np
+
+from tiltedvoice.models import (
+    TranscriberConfig,
+    TranscriptionResult,
+    TranscriptionSegment,
+    TranscriptionWord,
+    WhisperModel,
+)
+from tiltedvoice.result_cache import ResultCache, audio_fingerprint, cache_key
+from tiltedvoice.transcriber import Transcriber
+
+
+def _audio(seed: int = 0, seconds: float = 1.0) -> np.ndarray:
+    return (np.random.default_rng(seed).standard_normal(int(seconds * 16000)) * 0.1).astype(np.float32)
+
+
+def _result(text: str = "hello world") -> TranscriptionResult:
+    return TranscriptionResult(
+        text=text,
+        duration=1.0,
+        segments=[TranscriptionSegment(text=text, start=0.0, end=1.0, confidence=0.9)],
+        model_name="base.en",
+        debug_info={"selected_pass": "vad_on"},
+    )
+
+
+def _make_transcriber(cache: ResultCache) -> Transcriber:
+    t = Transcriber(cache=cache)
+    t._model = MagicMock()
+    t._device = "cpu"
+    t._compute_type = "int8"
+    t._model.transcribe.side_effect = lambda *a, **k: (
+        iter([SimpleNamespace(text="hello", start=0.0, end=1.0, avg_logprob=-0.2)]),
+        SimpleNamespace(language="en", language_probability=0.99, duration=1.0),
+    )
+    return t
+
+
+# =========================================================================
+# Keys
+# =========================================================================
+
+class TestKeys:
+    def test_fingerprint_is_content_based(self):
+        assert audio_fingerprint(_audio(1)) == audio_fingerprint(_audio(1).copy())
+        assert audio_fingerprint(_audio(1)) != audio_fingerprint(_audio(2))
+
+    def test_file_fingerprint(self, tmp_path):
+        p = tmp_path / "clip.wav"
+        p.write_bytes(b"RIFF....")
+        assert audio_fingerprint(str(p)) == audio_fingerprint(p)
+
+    def test_key_depends_on_settings(self):
+        fp = audio_fingerprint(_audio())
+        base = cache_key(fp, TranscriberConfig(), "en")
+        assert base == cache_key(fp, TranscriberConfig(), "en")
+        assert base != cache_key(fp, TranscriberConfig(model=WhisperModel.SMALL_EN), "en")
+        assert base != cache_key(fp, TranscriberConfig(beam_size=5), "en")
+        assert base != cache_key(fp, TranscriberConfig(), "de")
+
+
+# =========================================================================
+# Storage
+# =========================================================================
+
+class TestResultCache:
+    def test_round_trip(self, tmp_path):
+        cache = ResultCache(tmp_path)
+        cache.put("k1", _result())
+        hit = cache.get("k1")
+        assert hit.text == "hello world"
+        assert hit.segments[0].end == 1.0
+        assert hit.debug_info["selected_pass"] == "cache"
+        assert hit.debug_info["cached_pass"] == "vad_on"
+        assert cache.get("missing") is None
+
+    def test_words_round_trip(self, tmp_path):
+        cache = ResultCache(tmp_path)
+        result = _result()
+        result.segments[0].words = [TranscriptionWord(word=" hello", start=0.0, end=0.4, probability=0.9)]
+        cache.put("k1", result)
+        hit = cache.get("k1")
+        assert hit.segments[0].words == result.segments[0].words
+
+    def test_lru_eviction_by_size(self, tmp_path):
+        cache = ResultCache(tmp_path, max_bytes=1)
+        cache.put("a", _result("a"))
+        entry_size = cache.size_bytes
+        cache = ResultCache(tmp_path, max_bytes=2 * entry_size + 10)
+        cache.put("b", _result("b"))
+        os.utime(tmp_path / "a.json", (1, 1))
+        os.utime(tmp_path / "b.json", (2, 2))
+        cache.get("a")  # refresh a; b is now least recently used
+        cache.put("c", _result("c"))
+        assert cache.get("b") is None
+        assert cache.get("a") is not None and cache.get("c") is not None
+        assert len(cache) == 2
+
+    def test_corrupt_entry_dropped(self, tmp_path):
+        (tmp_path / "bad.json").write_text("{not json", encoding="utf-8")
+        cache = ResultCache(tmp_path)
+        assert cache.get("bad") is None
+        assert not (tmp_path / "bad.json").exists()
+
+
+# =========================================================================
+# Transcriber integration
+# =========================================================================
+
+class TestTranscriberCache:
+    def test_repeat_served_without_decoding(self, tmp_path):
+        t = _make_transcriber(ResultCache(tmp_path))
+        audio = _audio()
+        first = t.transcribe(audio)
+        second = t.transcribe(audio.copy())
+        assert second.text == first.text == "hello"
+        assert second.debug_info["selected_pass"] == "cache"
+        assert t._model.transcribe.call_count == 1
+
+    def test_hit_skips_model_load(self, tmp_path):
+        cache = ResultCache(tmp_path)
+        _make_transcriber(cache).transcribe(_audio())
+        fresh = Transcriber(cache=cache)
+        fresh.load_model = MagicMock(side_effect=AssertionError("model should not load"))
+        assert fresh.transcribe(_audio()).text == "hello"
+
+    def test_empty_results_not_cached(self, tmp_path):
+        cache = ResultCache(tmp_path)
+        t = _make_transcriber(cache)
+        t._model.transcribe.side_effect = lambda *a, **k: (
+            iter([]), SimpleNamespace(language="en", language_probability=0.99, duration=1.0)
+        )
+        t.transcribe(_audio())
+        assert len(cache) == 0
@@ -0,0 +1,104 @@
+"""Tests for tiltedvoice.scheduler — RTF estimates and adaptive model choice."""
+
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+
+from tiltedvoice.models import TranscriberConfig, WhisperModel
+from tiltedvoice.scheduler import EXPLORE_EVERY, ModelScheduler
+from tiltedvoice.transcriber import Transcriber
+
+CPU = "cpu/int8"
+
+
+class TestEstimates:
+    def test_running_estimate_moves_towards_new_samples(self):
+        sched = ModelScheduler()
+        sched.observe(WhisperModel.BASE_EN, CPU, audio_s=10.0, elapsed_s=2.0)
+        assert sched.rtf(WhisperModel.BASE_EN, CPU) == 0.2
+        sched.observe(WhisperModel.BASE_EN, CPU, audio_s=10.0, elapsed_s=6.0)
+        assert 0.2 < sched.rtf(WhisperModel.BASE_EN, CPU) < 0.6
+
+    def test_unmeasured_models_extrapolated_per_device(self):
+        sched = ModelScheduler()
+        sched.observe(WhisperModel.TINY_EN, CPU, audio_s=10.0, elapsed_s=1.0)
+        assert sched.rtf(WhisperModel.SMALL_EN, CPU) > sched.rtf(WhisperModel.BASE_EN, CPU) > 0.1
+        assert sched.rtf(WhisperModel.BASE_EN, "cuda/float16") is None
+
+    def test_short_clips_billed_as_one_second(self):
+        sched = ModelScheduler()
+        sched.observe(WhisperModel.TINY_EN, CPU, audio_s=0.5, elapsed_s=0.3)
+        assert sched.predict_s(WhisperModel.TINY_EN, CPU, 0.2) == 0.3
+
+    def test_estimates_persist(self, tmp_path):
+        path = tmp_path / "model_speed.json"
+        ModelScheduler(path=path).observe(WhisperModel.BASE_EN, CPU, 5.0, 1.0)
+        assert ModelScheduler(path=path).rtf(WhisperModel.BASE_EN, CPU) == 0.2
+
+
+class TestChoice:
+    def test_uncalibrated_uses_selected_model(self):
+        assert ModelScheduler().choose(WhisperModel.SMALL_EN, CPU, 5.0) == WhisperModel.SMALL_EN
+
+    def test_picks_largest_model_meeting_target(self):
+        sched = ModelScheduler(target_ratio=0.3)
+        sched.observe(WhisperModel.TINY_EN, CPU, 5.0, 0.25)   # rtf 0.05
+        sched.observe(WhisperModel.BASE_EN, CPU, 5.0, 1.0)    # rtf 0.2
+        sched.observe(WhisperModel.SMALL_EN, CPU, 5.0, 4.0)   # rtf 0.8
+        assert sched.choose(WhisperModel.MEDIUM_EN, CPU, 5.0) == WhisperModel.BASE_EN
+        assert sched.choose(WhisperModel.TINY_EN, CPU, 5.0) == WhisperModel.TINY_EN
+
+    def test_falls_back_to_smallest_when_nothing_fits(self):
+        sched = ModelScheduler()
+        sched.observe(WhisperModel.TINY_EN, CPU, 5.0, 10.0)
+        assert sched.choose(WhisperModel.BASE_EN, CPU, 5.0) == WhisperModel.TINY_EN
+
+    def test_downgraded_model_explored_again(self):
+        sched = ModelScheduler(target_ratio=0.3)
+        sched.observe(WhisperModel.BASE_EN, CPU, 5.0, 0.5)    # rtf 0.1
+        sched.observe(WhisperModel.SMALL_EN, CPU, 5.0, 20.0)  # one slow run: rtf 4.0
+        picks = [sched.choose(WhisperModel.SMALL_EN, CPU, 5.0) for _ in range(EXPLORE_EVERY)]
+        assert picks[:-1] == [WhisperModel.BASE_EN] * (EXPLORE_EVERY - 1)
+        assert picks[-1] == WhisperModel.SMALL_EN
+        # Explored runs are fast again, so the estimate recovers
+        for _ in range(10):
+            sched.observe(WhisperModel.SMALL_EN, CPU, 5.0, 0.5)
+        assert sched.choose(WhisperModel.SMALL_EN, CPU, 5.0) == WhisperModel.SMALL_EN
+
+    def test_budget_widens_on_slow_devices(self):
+        sched = ModelScheduler()
+        assert sched.timeout_budget_s(WhisperModel.BASE_EN, CPU, 30.0, 60.0) == 60.0
+        sched.observe(WhisperModel.BASE_EN, CPU, 30.0, 60.0)
+        assert sched.timeout_budget_s(WhisperModel.BASE_EN, CPU, 30.0, 60.0) == 240.0
+
+
+class TestTranscriberRouting:
+    @staticmethod
+    def _model(text=" hello"):
+        model = MagicMock()
+        model.transcribe.side_effect = lambda *a, **k: (
+            iter([SimpleNamespace(text=text, start=0.0, end=1.0, avg_logprob=-0.1)]),
+            SimpleNamespace(language="en", language_probability=0.9, duration=5.0),
+        )
+        return model
+
+    def test_routes_to_smaller_model_and_records_speed(self):
+        sched = ModelScheduler()
+        sched.observe(WhisperModel.SMALL_EN, CPU, 5.0, 10.0)
+        t = Transcriber(
+            config=TranscriberConfig(model=WhisperModel.SMALL_EN, device="cpu", compute_type="int8", vad_filter=False),
+            scheduler=sched,
+        )
+        loaded = []
+
+        def _acquire(self, name, device, compute_type):
+            loaded.append(name)
+            return TestTranscriberRouting._model()
+
+        with patch.object(Transcriber, "_acquire_model", _acquire):
+            result = t.transcribe(np.full(16000 * 5, 0.1, dtype=np.float32))
+
+        assert result.model_name == "tiny.en"
+        assert loaded == ["tiny.en"]
+        assert sched._estimates["tiny.en@cpu/int8"]["samples"] == 1
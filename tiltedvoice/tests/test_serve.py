@@ -0,0 +1,228 @@
+"""Tests for tiltedvoice.serve — job queue, events and the local HTTP API."""
+
+import json
+import sys
+import threading
+import urllib.error
+import urllib.request
+import wave
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+
+from tiltedvoice.models import TranscriberConfig, TranscriptionResult
+from tiltedvoice.serve import (
+    EventHub,
+    Job,
+    JobQueue,
+    JobStatus,
+    QueueFullError,
+    ServeHTTPServer,
+    ServiceBusyError,
+    TranscriptionService,
+)
+
+
+def _transcriber(gate=None):
+    t = MagicMock()
+    t._config = TranscriberConfig()
+
+    def _transcribe(audio, language=None, cancel_event=None, on_status=None):
+        if gate is not None:
+            gate.wait(5)
+        return TranscriptionResult(text=f"text of {audio}", model_name="base.en")
+
+    t.transcribe.side_effect = _transcribe
+    return t
+
+
+class TestJobQueue:
+    def test_runs_jobs_and_records_results(self):
+        jobs = JobQueue(max_workers=1)
+        job = jobs.submit(Job(kind="file"), lambda job: TranscriptionResult(text="hi"))
+        assert job.done.wait(5)
+        assert job.status == JobStatus.DONE and job.result.text == "hi"
+        jobs.shutdown()
+
+    def test_backlog_is_bounded(self):
+        gate, started = threading.Event(), threading.Event()
+        jobs = JobQueue(max_workers=1, max_pending=1)
+        jobs.submit(Job(kind="file"), lambda job: started.set() or gate.wait(5) and TranscriptionResult())
+        assert started.wait(5)
+        jobs.submit(Job(kind="file"), lambda job: TranscriptionResult())
+        with pytest.raises(QueueFullError):
+            jobs.submit(Job(kind="file"), lambda job: TranscriptionResult())
+        gate.set()
+        jobs.shutdown()
+
+    def test_cancel_queued_job_never_runs(self):
+        gate = threading.Event()
+        ran = []
+        jobs = JobQueue(max_workers=1)
+        jobs.submit(Job(kind="file"), lambda job: gate.wait(5) and TranscriptionResult())
+        queued = jobs.submit(Job(kind="file"), lambda job: ran.append(1) or TranscriptionResult())
+        jobs.cancel(queued.id)
+        gate.set()
+        jobs.shutdown()
+        assert queued.status == JobStatus.CANCELLED and ran == []
+
+    def test_failures_are_reported(self):
+        jobs = JobQueue()
+
+        def _boom(job):
+            raise RuntimeError("model exploded")
+
+        job = jobs.submit(Job(kind="file"), _boom)
+        job.done.wait(5)
+        assert job.status == JobStatus.FAILED and job.error == "model exploded"
+        jobs.shutdown()
+
+
+class TestEventHub:
+    def test_slow_subscribers_drop_oldest(self):
+        hub = EventHub(maxsize=2)
+        q = hub.subscribe()
+        for i in range(3):
+            hub.publish({"n": i})
+        assert [q.get_nowait()["n"], q.get_nowait()["n"]] == [1, 2]
+
+
+@pytest.fixture
+def api(tmp_path):
+    servers = []
+
+    def _start(token=None, allow_origins=(), transcriber=None):
+        service = TranscriptionService(transcriber=transcriber or _transcriber())
+        server = ServeHTTPServer(("127.0.0.1", 0), service, token=token, allow_origins=allow_origins)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append((server, service))
+        base = "http://127.0.0.1:%d" % server.server_address[1]
+
+        def request(method, path, body=None, headers=None):
+            data = json.dumps(body).encode() if body is not None else None
+            req = urllib.request.Request(base + path, data=data, method=method, headers=headers or {})
+            try:
+                with urllib.request.urlopen(req, timeout=5) as resp:
+                    return resp.status, json.loads(resp.read())
+            except urllib.error.HTTPError as exc:
+                return exc.code, json.loads(exc.read())
+
+        return request
+
+    yield _start
+    for server, service in servers:
+        server.shutdown()
+        service.shutdown()
+        server.server_close()
+
+
+class TestTranscriptionService:
+    def test_jobs_run_on_separate_replicas(self, tmp_path):
+        gate = threading.Event()
+        replicas = [_transcriber(gate), _transcriber(gate)]
+        service = TranscriptionService(transcriber=_transcriber(), replicas=replicas)
+        clips = [tmp_path / "a.wav", tmp_path / "b.wav"]
+        try:
+            for clip in clips:
+                clip.write_bytes(b"RIFF")
+            jobs = [service.transcribe_file(str(clip)) for clip in clips]
+            # Both jobs are decoding at once, each on its own replica
+            for _ in range(100):
+                if all(r.transcribe.called for r in replicas):
+                    break
+                threading.Event().wait(0.02)
+            assert [r.transcribe.call_count for r in replicas] == [1, 1]
+            assert service.status()["workers"] == 2
+            gate.set()
+            assert all(job.done.wait(5) for job in jobs)
+            assert sorted(job.result.text for job in jobs) == sorted(f"text of {c}" for c in clips)
+        finally:
+            gate.set()
+            service.shutdown()
+
+    def test_longform_runs_on_a_job_replica(self, tmp_path):
+        path = tmp_path / "talk.wav"
+        with wave.open(str(path), "wb") as w:
+            w.setnchannels(1)
+            w.setsampwidth(2)
+            w.setframerate(16000)
+            w.writeframes((np.random.randn(16000 * 3) * 3000).astype("<i2").tobytes())
+        live, replica = _transcriber(), _transcriber()
+        replica.transcribe.side_effect = lambda audio, language=None, cancel_event=None: TranscriptionResult(
+            text="chunk", model_name="base.en"
+        )
+        service = TranscriptionService(transcriber=live, replicas=[replica])
+        try:
+            job = service.transcribe_file(str(path), longform=True)
+            assert job.done.wait(5) and job.status == JobStatus.DONE, job.error
+            assert replica.transcribe.called and not live.transcribe.called
+            # The replica belongs to the service: the long-form run must not unload it
+            replica.unload.assert_not_called()
+        finally:
+            service.shutdown()
+
+    def test_start_refused_while_last_recording_decodes(self):
+        service = TranscriptionService(transcriber=_transcriber(), replicas=[_transcriber()])
+        try:
+            service._recording_job = Job(kind="recording", status=JobStatus.RUNNING)
+            with patch.dict(sys.modules, {"tiltedvoice.audio": MagicMock()}):
+                with pytest.raises(ServiceBusyError):
+                    service.start_recording()
+        finally:
+            service.shutdown()
+
+
+class TestHttpApi:
+    def test_transcribe_file_and_wait_for_result(self, api, tmp_path):
+        clip = tmp_path / "clip.wav"
+        clip.write_bytes(b"RIFF")
+        request = api()
+        status, job = request("POST", "/transcribe", {"path": str(clip)})
+        assert status == 202 and job["status"] in ("queued", "running", "done")
+        status, job = request("GET", f"/jobs/{job['id']}?wait=5")
+        assert job["status"] == "done"
+        assert job["result"]["text"] == f"text of {clip}"
+
+    def test_bad_requests(self, api, tmp_path):
+        request = api()
+        assert request("POST", "/transcribe", {"path": str(tmp_path / "missing.wav")})[0] == 400
+        assert request("POST", "/transcribe", {})[0] == 400
+        assert request("GET", "/jobs/nope")[0] == 404
+        assert request("GET", "/nothing")[0] == 404
+        assert request("POST", "/record/stop")[0] == 409
+
+    def test_status(self, api):
+        status, body = api()("GET", "/status")
+        assert status == 200
+        assert body["model"] == "base.en" and body["recording"] is False
+
+    def test_token_required_when_configured(self, api):
+        request = api(token="s3cret")
+        assert request("GET", "/status")[0] == 401
+        assert request("GET", "/status", headers={"Authorization": "Bearer s3cret"})[0] == 200
+
+    def test_unlisted_browser_origins_rejected(self, api):
+        request = api(allow_origins=["chrome-extension://abc"])
+        assert request("GET", "/status", headers={"Origin": "https://example.com"})[0] == 403
+        assert request("GET", "/status", headers={"Origin": "chrome-extension://abc"})[0] == 200
+
+    def test_foreign_host_rejected(self, api):
+        # DNS rebinding: same-origin requests without Origin, but a foreign Host
+        request = api()
+        assert request("GET", "/events", headers={"Host": "attacker.example"})[0] == 403
+        assert request("GET", "/jobs", headers={"Host": "localhost"})[0] == 403  # wrong port
+        assert request("GET", "/jobs")[0] == 200
+
+    def test_host_names_accepted(self):
+        service = TranscriptionService(transcriber=_transcriber())
+        server = ServeHTTPServer(("127.0.0.1", 0), service, allow_hosts=["box.lan"])
+        port = server.server_address[1]
+        try:
+            for host in (f"127.0.0.1:{port}", f"localhost:{port}", f"[::1]:{port}", f"BOX.lan:{port}"):
+                assert server.host_allowed(host), host
+            for host in ("", "localhost", f"evil.example:{port}", f"localhost:{port + 1}", f"localhost:x{port}"):
+                assert not server.host_allowed(host), host
+        finally:
+            service.shutdown()
+            server.server_close()
@@ -0,0 +1,77 @@
+"""Tests for tiltedvoice.settings_store — debounced, atomic settings writes."""
+
+import json
+import time
+
+import pytest
+
+from tiltedvoice.settings_store import SettingsStore
+
+
+@pytest.fixture
+def path(tmp_path):
+    return tmp_path / "settings.json"
+
+
+class TestSettingsStore:
+    def test_loads_existing_document(self, path):
+        path.write_text(json.dumps({"theme": "Arctic", "energy_threshold": 0.02}))
+        store = SettingsStore(path)
+        assert store.get("theme") == "Arctic"
+        assert store.snapshot() == {"theme": "Arctic", "energy_threshold": 0.02}
+        store.close()
+
+    def test_corrupt_file_starts_empty(self, path):
+        path.write_text("{not json")
+        store = SettingsStore(path)
+        assert store.snapshot() == {}
+        store.close()
+
+    def test_burst_of_updates_written_once(self, path):
+        store = SettingsStore(path, debounce_s=60)
+        for i in range(100):
+            store.update({"energy_threshold": i / 1000})
+        assert store.writes == 0 and not path.exists()
+        assert store.flush(5)
+        assert store.writes == 1
+        assert json.loads(path.read_text()) == {"energy_threshold": 0.099}
+        store.close()
+
+    def test_written_after_debounce(self, path):
+        store = SettingsStore(path, debounce_s=0.05)
+        store.update({"theme": "Ember"})
+        store.update({"silence_duration": 1.5})
+        time.sleep(0.5)
+        assert json.loads(path.read_text()) == {"theme": "Ember", "silence_duration": 1.5}
+        assert store.writes == 1
+        store.close()
+
+    def test_unchanged_values_not_rewritten(self, path):
+        store = SettingsStore(path, debounce_s=0)
+        store.update({"theme": "Ember"})
+        store.flush(5)
+        store.update({"theme": "Ember"})
+        store.flush(5)
+        assert store.writes == 1
+        store.close()
+
+    def test_close_writes_pending_changes(self, path):
+        path.write_text(json.dumps({"keep": True}))
+        store = SettingsStore(path, debounce_s=60)
+        store.update({"theme": "Ember"})
+        store.close()
+        assert json.loads(path.read_text()) == {"keep": True, "theme": "Ember"}
+        assert not path.with_suffix(".tmp").exists()
+
+    def test_failed_write_stays_pending(self, tmp_path):
+        blocker = tmp_path / "config"
+        blocker.write_text("not a directory")
+        path = blocker / "settings.json"
+        store = SettingsStore(path, debounce_s=60)
+        store.update({"theme": "Ember"})
+        assert not store.flush(5)
+        assert store.writes == 0
+        blocker.unlink()
+        assert store.flush(5)
+        assert json.loads(path.read_text()) == {"theme": "Ember"}
+        store.close()
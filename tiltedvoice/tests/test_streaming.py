@@ -0,0 +1,167 @@
+"""Tests for tiltedvoice.streaming — incremental transcription with mocked backends."""
+
+import threading
+import time
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import numpy as np
+
+from tiltedvoice.streaming import StreamingTranscriber
+from tiltedvoice.transcriber import Transcriber, is_complete
+
+
+# =========================================================================
+# Helpers
+# =========================================================================
+
+def _fake_segment(text: str, start: float = 0.0, end: float = 1.0, avg_logprob: float = -0.3):
+    return SimpleNamespace(text=text, start=start, end=end, avg_logprob=avg_logprob)
+
+
+def _fake_info(duration: float = 1.0):
+    return SimpleNamespace(language="en", language_probability=0.98, duration=duration)
+
+
+def _make_transcriber(side_effect):
+    t = Transcriber()
+    mock_model = MagicMock()
+    mock_model.transcribe.side_effect = side_effect
+    t._model = mock_model
+    t._device = "cpu"
+    t._compute_type = "int8"
+    return t, mock_model
+
+
+def _audio(seconds: float) -> np.ndarray:
+    return (np.random.randn(int(seconds * 16000)) * 0.1).astype(np.float32)
+
+
+# =========================================================================
+# Streaming session
+# =========================================================================
+
+class TestStreamingTranscriber:
+    def test_finish_decodes_tail(self):
+        t, mock_model = _make_transcriber(
+            lambda audio, **kw: (iter([_fake_segment("hello world", 0.0, 1.5)]), _fake_info())
+        )
+        stream = StreamingTranscriber(t, step_s=100.0).start()
+        stream.feed(_audio(2.0))
+        result = stream.finish()
+
+        assert result.text == "hello world"
+        assert result.duration == 2.0
+        assert result.debug_info["selected_pass"] == "streaming"
+        assert mock_model.transcribe.call_count == 1
+
+    def test_partial_then_commit(self):
+        def _decode(audio, **kw):
+            dur = len(audio) / 16000.0
+            if dur >= 3.0:
+                # Window long enough that "first" ends before the holdback horizon.
+                return iter([_fake_segment("first", 0.0, 1.0), _fake_segment("second", 1.2, dur)]), _fake_info(dur)
+            return iter([_fake_segment("first", 0.0, 1.0)]), _fake_info(dur)
+
+        t, _ = _make_transcriber(_decode)
+        updates = []
+        committed = threading.Event()
+
+        def _on_update(segments, final):
+            updates.append(([s.text for s in segments], final))
+            if final:
+                committed.set()
+
+        stream = StreamingTranscriber(t, on_update=_on_update, step_s=3.0, holdback_s=1.0).start()
+        stream.feed(_audio(3.0))
+        assert committed.wait(timeout=5)
+        result = stream.finish()
+
+        assert (["first"], True) in updates
+        assert (["second"], False) in updates
+        assert result.text.startswith("first")
+        # Committed audio is dropped, so tail timestamps are offset back into stream time.
+        assert result.segments[0].start == 0.0
+        assert all(seg.start >= 1.0 for seg in result.segments[1:])
+
+    def test_feed_after_finish_ignored(self):
+        t, mock_model = _make_transcriber(lambda audio, **kw: (iter([]), _fake_info()))
+        stream = StreamingTranscriber(t, step_s=100.0).start()
+        result = stream.finish()
+        stream.feed(_audio(1.0))
+
+        assert result.text == ""
+        assert mock_model.transcribe.call_count == 0
+
+    def test_cancel_skips_final_decode(self):
+        t, mock_model = _make_transcriber(lambda audio, **kw: (iter([_fake_segment("nope")]), _fake_info()))
+        stream = StreamingTranscriber(t, step_s=100.0).start()
+        stream.feed(_audio(1.0))
+        stream.cancel()
+        result = stream.finish()
+
+        assert result.text == ""
+        assert mock_model.transcribe.call_count == 0
+
+    def test_final_timeout_marks_incomplete_and_tail_recovers(self):
+        t, mock_model = _make_transcriber(
+            lambda audio, **kw: (iter([_fake_segment("the tail", 0.1, 1.5)]), _fake_info(len(audio) / 16000.0))
+        )
+        real_call = t._call_with_timeout
+        calls = []
+
+        def _first_times_out(fn, timeout_s, **kw):
+            calls.append(timeout_s)
+            return None if len(calls) == 1 else real_call(fn, timeout_s, **kw)
+
+        t._call_with_timeout = _first_times_out
+        stream = StreamingTranscriber(t, step_s=100.0).start()
+        stream.feed(_audio(2.0))
+        result = stream.finish()
+
+        assert not is_complete(result)
+        assert result.text == ""
+        recovered = stream.decode_tail(result)
+        assert is_complete(recovered)
+        assert recovered.text == "the tail"
+        assert recovered.debug_info["selected_pass"] == "streaming+tail"
+
+    def test_complete_result_not_redecoded(self):
+        t, mock_model = _make_transcriber(
+            lambda audio, **kw: (iter([_fake_segment("done", 0.0, 1.0)]), _fake_info())
+        )
+        stream = StreamingTranscriber(t, step_s=100.0).start()
+        stream.feed(_audio(1.0))
+        result = stream.finish()
+
+        assert is_complete(result)
+        assert stream.decode_tail(result) is result
+        assert mock_model.transcribe.call_count == 1
+
+    def test_window_error_recorded(self):
+        def _decode(audio, **kw):
+            if len(audio) < 32000:
+                raise RuntimeError("boom")
+            return iter([_fake_segment("all of it", 0.0, 2.0)]), _fake_info(2.0)
+
+        t, _ = _make_transcriber(_decode)
+        stream = StreamingTranscriber(t, step_s=1.0).start()
+        stream.feed(_audio(1.0))
+        deadline = time.monotonic() + 5
+        while stream._window_error is None and time.monotonic() < deadline:
+            time.sleep(0.01)
+        stream.feed(_audio(1.0))
+        result = stream.finish()
+
+        assert result.debug_info["window_error"] == "boom"
+        # The buffered audio still reaches the final window
+        assert result.text == "all of it" and is_complete(result)
+
+    def test_snapshot_is_committed_plus_uncommitted_audio(self):
+        t, _ = _make_transcriber(lambda audio, **kw: (iter([]), _fake_info()))
+        stream = StreamingTranscriber(t, step_s=100.0).start()
+        stream.feed(_audio(1.5))
+        committed, tail = stream.snapshot()
+        stream.cancel()
+
+        assert committed == [] and tail.size == 24000
@@ -0,0 +1,130 @@
+"""Tests for tiltedvoice.telemetry — spans, metrics and exporters."""
+
+import json
+import threading
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from tiltedvoice.models import TranscriberConfig, WhisperModel
+from tiltedvoice.telemetry import JsonlExporter, Telemetry, render_openmetrics
+from tiltedvoice.transcriber import Transcriber
+
+
+@pytest.fixture
+def records():
+    tel = Telemetry.shared()
+    out = []
+    exporter = out.append
+    tel.add_exporter(exporter)
+    yield out
+    tel.remove_exporter(exporter)
+
+
+class TestSpans:
+    def test_nesting_and_monotonic_times(self):
+        tel = Telemetry()
+        out = []
+        tel.add_exporter(out.append)
+        with tel.span("outer", clip=1) as outer:
+            with tel.span("inner"):
+                pass
+        inner_rec, outer_rec = out
+        assert inner_rec["parent"] == outer.id
+        assert outer_rec["parent"] is None
+        assert outer_rec["attrs"] == {"clip": 1}
+        assert inner_rec["start_s"] >= outer_rec["start_s"]
+        assert outer_rec["duration_ms"] >= inner_rec["duration_ms"]
+
+    def test_error_recorded_and_reraised(self):
+        tel = Telemetry()
+        out = []
+        tel.add_exporter(out.append)
+        with pytest.raises(ValueError):
+            with tel.span("boom"):
+                raise ValueError("x")
+        assert out[0]["attrs"]["error"] == "ValueError"
+        assert tel.current_span_id() is None
+
+    def test_adopt_parents_spans_on_another_thread(self):
+        tel = Telemetry()
+        out = []
+        tel.add_exporter(out.append)
+        with tel.span("caller") as caller:
+            parent = tel.current_span_id()
+
+            def _work():
+                with tel.adopt(parent):
+                    with tel.span("worker"):
+                        pass
+
+            t = threading.Thread(target=_work)
+            t.start()
+            t.join()
+        assert out[0]["name"] == "worker" and out[0]["parent"] == caller.id
+
+    def test_durations_feed_histogram_without_exporter(self):
+        tel = Telemetry()
+        with tel.span("load"):
+            pass
+        with tel.timer("vad_chunk_ms"):
+            pass
+        assert tel.histogram("span_duration_ms", span="load").count == 1
+        assert tel.histogram("vad_chunk_ms").count == 1
+
+
+class TestMetrics:
+    def test_counters_by_label(self):
+        tel = Telemetry()
+        tel.count("passes", pass_name="vad_on")
+        tel.count("passes", pass_name="vad_on")
+        tel.count("passes", pass_name="vad_off")
+        assert tel.counter_value("passes", pass_name="vad_on") == 2
+        assert tel.counter_value("passes", pass_name="vad_off") == 1
+
+    def test_openmetrics_rendering(self):
+        tel = Telemetry()
+        tel.count("utterances")
+        tel.observe("resample_ms", 3.0)
+        tel.observe("resample_ms", 40.0)
+        text = render_openmetrics(tel)
+        assert "# TYPE tiltedvoice_utterances counter" in text
+        assert "tiltedvoice_utterances_total 1" in text
+        assert 'tiltedvoice_resample_ms_bucket{le="5"} 1' in text
+        assert 'tiltedvoice_resample_ms_bucket{le="50"} 2' in text
+        assert 'tiltedvoice_resample_ms_bucket{le="+Inf"} 2' in text
+        assert text.endswith("# EOF\n")
+
+    def test_jsonl_exporter(self, tmp_path):
+        path = tmp_path / "trace.jsonl"
+        tel = Telemetry()
+        exporter = JsonlExporter(path)
+        tel.add_exporter(exporter)
+        with tel.span("a"):
+            pass
+        tel.remove_exporter(exporter)
+        lines = path.read_text(encoding="utf-8").splitlines()
+        assert json.loads(lines[0])["name"] == "a"
+
+
+class TestTranscriberInstrumentation:
+    def test_pass_and_segments_nest_under_transcribe(self, records):
+        t = Transcriber(config=TranscriberConfig(model=WhisperModel.TINY_EN, vad_filter=False))
+        t._model = MagicMock()
+        t._model.transcribe.return_value = (
+            iter([SimpleNamespace(text=" hi", start=0.0, end=1.0, avg_logprob=-0.1)]),
+            SimpleNamespace(language="en", language_probability=0.9, duration=1.0),
+        )
+        t.transcribe(np.full(16000, 0.1, dtype=np.float32))
+
+        by_name = {}
+        for rec in records:
+            by_name.setdefault(rec["name"], []).append(rec)
+        top = by_name["transcribe"][0]
+        pass_span = by_name["pass"][0]
+        assert pass_span["parent"] == top["id"]
+        assert by_name["prepare"][0]["parent"] == pass_span["id"]
+        assert [r["parent"] for r in by_name["decode_segment"]] == [pass_span["id"]] * 2
+        assert pass_span["attrs"]["stop_reason"] == "eof"
@@ -268,6 +268,22 @@ class TestTranscription:
         assert second_call["vad_filter"] is False
         assert len(result.debug_info["passes"]) == 2
 
+    def test_vad_filter_off_runs_single_pass(self):
+        t, mock_model = self._make_transcriber()
+        t._config.vad_filter = False
+        mock_model.transcribe.return_value = (iter([]), _fake_info(duration=1.0))
+
+        result = t.transcribe(np.random.randn(16000).astype(np.float32) * 0.1)
+        assert mock_model.transcribe.call_count == 1
+        assert mock_model.transcribe.call_args.kwargs["vad_filter"] is False
+        assert result.debug_info["selected_pass"] == "vad_off"
+
+    def test_first_segment_time_recorded(self):
+        t, mock_model = self._make_transcriber()
+        mock_model.transcribe.return_value = (iter([_fake_segment("hello")]), _fake_info(duration=1.0))
+        result = t.transcribe(np.random.randn(16000).astype(np.float32) * 0.1)
+        assert result.debug_info["passes"][0]["first_segment_ms"] >= 0.0
+
     def test_debug_callback_receives_events(self):
         t, mock_model = self._make_transcriber()
         mock_model.transcribe.return_value = (iter([_fake_segment("hello")]), _fake_info(duration=1.0))
@@ -379,3 +395,121 @@ class TestTranscription:
         result = t.transcribe(audio)
         assert result.text == "ok"
         assert float(np.max(np.abs(audio))) > 0.01
+
+
+# =========================================================================
+# Decode worker
+# =========================================================================
+
+class TestDecodeWorker:
+    def _make_transcriber(self):
+        t = Transcriber()
+        t._model = MagicMock()
+        t._device = "cpu"
+        t._compute_type = "int8"
+        return t
+
+    def test_worker_thread_reused_across_calls(self):
+        t = self._make_transcriber()
+        names = []
+        for _ in range(3):
+            t._call_with_timeout(lambda abort: names.append(threading.current_thread().ident), timeout_s=5)
+        assert len(set(names)) == 1
+        assert names[0] != threading.current_thread().ident
+
+    def test_timeout_aborts_running_decode(self):
+        t = self._make_transcriber()
+        release = threading.Event()
+        stopped = threading.Event()
+
+        def _gen():
+            yield _fake_segment("first", 0, 1)
+            release.wait(timeout=5)
+            yield _fake_segment("second", 1, 2)
+            yield _fake_segment("third", 2, 3)
+
+        t._model.transcribe.return_value = (_gen(), _fake_info(duration=3.0))
+        decodes = []
+
+        def _job(abort):
+            decode = t._decode_pass(
+                audio=np.zeros(16000, dtype=np.float32), language="en", use_vad=True,
+                vad_params={}, cancel_event=None, timeout_s=60, abort_event=abort,
+            )
+            decodes.append(decode)
+            stopped.set()
+
+        assert t._call_with_timeout(_job, timeout_s=0.05) is None
+        release.set()
+        assert stopped.wait(timeout=5)
+        assert decodes[0]["stop_reason"] == "aborted"
+        assert len(decodes[0]["segments"]) == 1
+
+    def test_worker_errors_propagate(self):
+        t = self._make_transcriber()
+
+        def _boom(abort):
+            raise RuntimeError("decode failed")
+
+        with pytest.raises(RuntimeError, match="decode failed"):
+            t._call_with_timeout(_boom, timeout_s=5)
+
+
+# =========================================================================
+# Speculative VAD-on / VAD-off passes
+# =========================================================================
+
+class TestSpeculativeFallback:
+    def _make_transcriber(self, side_effect):
+        t = Transcriber(config=TranscriberConfig(speculative_fallback=True))
+        t._model = MagicMock()
+        t._model.transcribe.side_effect = side_effect
+        t._device = "cpu"
+        t._compute_type = "int8"
+        return t
+
+    @patch("tiltedvoice.transcriber.os.cpu_count", return_value=8)
+    def test_vad_text_wins_and_cancels_fallback(self, _cpus):
+        vad_off_started = threading.Event()
+
+        def _vad_off_gen():
+            vad_off_started.set()
+            for i in range(1000):
+                time.sleep(0.01)
+                yield _fake_segment(f"noise{i}", i, i + 1)
+
+        def _transcribe(audio, **kw):
+            if kw["vad_filter"]:
+                vad_off_started.wait(timeout=5)
+                return iter([_fake_segment("hello")]), _fake_info(duration=1.0)
+            return _vad_off_gen(), _fake_info(duration=1.0)
+
+        t = self._make_transcriber(_transcribe)
+        result = t.transcribe(np.random.randn(16000).astype(np.float32) * 0.1)
+
+        assert result.text == "hello"
+        assert result.debug_info["selected_pass"] == "vad_on"
+        assert result.debug_info["passes"][1]["stop_reason"] == "speculative_cancelled"
+
+    @patch("tiltedvoice.transcriber.os.cpu_count", return_value=8)
+    def test_fallback_used_when_vad_empty(self, _cpus):
+        def _transcribe(audio, **kw):
+            if kw["vad_filter"]:
+                return iter([]), _fake_info(duration=1.0)
+            return iter([_fake_segment("hello")]), _fake_info(duration=1.0)
+
+        t = self._make_transcriber(_transcribe)
+        result = t.transcribe(np.random.randn(16000).astype(np.float32) * 0.1)
+
+        assert result.text == "hello"
+        assert result.debug_info["selected_pass"] == "vad_off"
+        assert t._model.transcribe.call_count == 2
+        assert len(result.debug_info["passes"]) == 2
+
+    @patch("tiltedvoice.transcriber.os.cpu_count", return_value=2)
+    def test_sequential_without_spare_cores(self, _cpus):
+        t = self._make_transcriber(lambda audio, **kw: (iter([_fake_segment("hi")]), _fake_info()))
+        result = t.transcribe(np.random.randn(16000).astype(np.float32) * 0.1)
+
+        assert result.text == "hi"
+        assert t._model.transcribe.call_count == 1
@@ -2,6 +2,7 @@
 
 __version__ = "0.1.0"
 
+from tiltedvoice.streaming import StreamingTranscriber
 from tiltedvoice.transcriber import Transcriber
 
-__all__ = ["Transcriber", "__version__"]
+__all__ = ["StreamingTranscriber", "Transcriber", "__version__"]
@@ -0,0 +1,5 @@
+"""Allow ``python -m tiltedvoice bench ...``."""
+
+from tiltedvoice.cli import main
+
+raise SystemExit(main())
@@ -0,0 +1,111 @@
+"""On-demand word timings for already transcribed segments.
+
+Decoding with ``word_timestamps=True`` makes every dictation pay for the
+alignment.  Instead, :func:`align_words` adds word timings afterwards and
+only for the segments that need them: the segment texts are forced through
+Whisper's cross-attention alignment against one encoder pass per 30 s window
+— no beam search, no second decode.  Segments close together share a window,
+so a whole short clip costs a single encoder call.
+"""
+
+from __future__ import annotations
+
+from dataclasses import replace
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from tiltedvoice.models import TranscriptionSegment, TranscriptionWord
+
+SAMPLE_RATE = 16_000
+WINDOW_S = 30.0
+# faster-whisper's defaults for attaching punctuation to neighbouring words.
+PREPEND_PUNCTUATIONS = "\"'“¿([{-"
+APPEND_PUNCTUATIONS = "\"'.。,，!！?？:：”)]}、"
+
+
+def group_windows(segments: Sequence[TranscriptionSegment], indices: Sequence[int],
+                  window_s: float = WINDOW_S) -> List[List[int]]:
+    """Group segment *indices* into runs that fit one encoder window each."""
+    windows: List[List[int]] = []
+    start = 0.0
+    for i in sorted(indices):
+        seg = segments[i]
+        if windows and seg.end - start <= window_s:
+            windows[-1].append(i)
+        else:
+            windows.append([i])
+            start = seg.start
+    return windows
+
+
+def split_words(alignment: List[Dict[str, Any]], token_counts: Sequence[int],
+                offset: float) -> List[List[TranscriptionWord]]:
+    """Hand aligned words back to the segments their tokens came from."""
+    per_segment: List[List[TranscriptionWord]] = [[] for _ in token_counts]
+    seg, used = 0, 0
+    for timing in alignment:
+        while seg < len(token_counts) - 1 and used >= token_counts[seg]:
+            seg, used = seg + 1, used - token_counts[seg]
+        used += len(timing["tokens"])
+        if timing["word"]:
+            per_segment[seg].append(
+                TranscriptionWord(
+                    word=timing["word"],
+                    start=round(offset + float(timing["start"]), 2),
+                    end=round(offset + float(timing["end"]), 2),
+                    probability=float(timing["probability"]),
+                )
+            )
+    return per_segment
+
+
+def align_words(
+    model: Any,
+    audio: np.ndarray,
+    segments: Sequence[TranscriptionSegment],
+    language: str,
+    indices: Optional[Sequence[int]] = None,
+    tokenizer: Any = None,
+) -> List[TranscriptionSegment]:
+    """Return *segments* with ``words`` filled in for *indices* (default: all).
+
+    *model* is a faster-whisper ``WhisperModel``; *audio* is the 16 kHz
+    float32 clip the segments were transcribed from.  Segments that already
+    have words, or whose text is empty, are left untouched.
+    """
+    from faster_whisper.audio import pad_or_trim
+    from faster_whisper.tokenizer import Tokenizer
+    from faster_whisper.transcribe import merge_punctuations
+
+    out = list(segments)
+    wanted = [
+        i for i in (range(len(out)) if indices is None else indices)
+        if out[i].words is None and out[i].text.strip()
+    ]
+    if not wanted:
+        return out
+    if tokenizer is None:
+        tokenizer = Tokenizer(
+            model.hf_tokenizer,
+            model.model.is_multilingual,
+            task="transcribe",
+            language=language,
+        )
+
+    for window in group_windows(out, wanted):
+        offset = max(0.0, out[window[0]].start)
+        first = int(offset * SAMPLE_RATE)
+        chunk = audio[first:first + int(WINDOW_S * SAMPLE_RATE)]
+        features = model.feature_extractor(chunk)[..., :-1]
+        num_frames = min(features.shape[-1], model.feature_extractor.nb_max_frames)
+        encoder_output = model.encode(pad_or_trim(features))
+
+        token_lists = [tokenizer.encode(" " + out[i].text.strip()) for i in window]
+        text_tokens = [t for tokens in token_lists for t in tokens]
+        alignment = model.find_alignment(tokenizer, [text_tokens], encoder_output, num_frames)[0]
+        merge_punctuations(alignment, PREPEND_PUNCTUATIONS, APPEND_PUNCTUATIONS)
+
+        for i, words in zip(window, split_words(alignment, [len(t) for t in token_lists], offset)):
+            out[i] = replace(out[i], words=words)
+    return out
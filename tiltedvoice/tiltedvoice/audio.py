@@ -1,16 +1,27 @@
-"""Audio recording utilities — microphone management and voice recording with energy-based VAD."""
+"""Audio recording utilities.
+
+Shared capture stream, microphone management, voice activity detection and
+voice recording.
+"""
 
 from __future__ import annotations
 
+import abc
+import json
 import logging
+import os
 import threading
 import time
-from typing import Callable, Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 import numpy as np
 import sounddevice as sd
 
-from tiltedvoice.models import AudioConfig
+from tiltedvoice.models import AudioConfig, VADMode
+from tiltedvoice.resample import StreamingResampler
+from tiltedvoice.telemetry import Telemetry
 
 logger = logging.getLogger(__name__)
 
@@ -26,6 +37,9 @@ def _to_float32(data: np.ndarray, source_dtype: str) -> np.ndarray:
     return data.astype(np.float32)
 
 
+_INT_SCALES = {np.dtype(np.int16): 1.0 / 32768.0, np.dtype(np.int32): 1.0 / 2147483648.0}
+
+
 def _is_valid_audio(data: np.ndarray) -> bool:
     """Check if recorded audio data is valid (not NaN/inf/garbage)."""
     if data.size == 0:
@@ -34,12 +48,588 @@ def _is_valid_audio(data: np.ndarray) -> bool:
     return not np.isnan(peak) and not np.isinf(peak) and peak < 2.0
 
 
+# ---------------------------------------------------------------------------
+# Capture buffer
+# ---------------------------------------------------------------------------
+
+class AudioBuffer:
+    """Preallocated float32 arena that captured chunks are converted into in place.
+
+    Avoids the list-of-chunks + ``np.concatenate`` + ``astype`` copies at stop
+    time: :meth:`detach` hands out a zero-copy view of the captured audio and
+    re-arms a fresh arena, so the view stays valid while it is being decoded.
+    """
+
+    def __init__(self, capacity_frames: int):
+        self._capacity = max(1, int(capacity_frames))
+        self._data: Optional[np.ndarray] = np.empty(self._capacity, dtype=np.float32)
+        self._size = 0
+
+    def write(self, data: np.ndarray) -> np.ndarray:
+        """Convert *data* to float32 into the arena; returns the written view (may be truncated)."""
+        if self._data is None:
+            self._data = np.empty(self._capacity, dtype=np.float32)
+        flat = data.reshape(-1)
+        n = min(flat.size, self._capacity - self._size)
+        dst = self._data[self._size:self._size + n]
+        np.copyto(dst, flat[:n], casting="unsafe")
+        scale = _INT_SCALES.get(flat.dtype)
+        if scale is not None:
+            dst *= scale
+        self._size += n
+        return dst
+
+    def view(self) -> np.ndarray:
+        """Zero-copy view of everything captured so far."""
+        if self._data is None:
+            return np.zeros(0, dtype=np.float32)
+        return self._data[:self._size]
+
+    def detach(self) -> np.ndarray:
+        """Return the captured audio and start over with a new arena (allocated on next write)."""
+        audio = self.view()
+        self._data = None
+        self._size = 0
+        return audio
+
+    def clear(self) -> None:
+        self._size = 0
+
+    def truncate(self, size: int) -> None:
+        """Drop everything after the first *size* frames."""
+        self._size = max(0, min(self._size, int(size)))
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    @property
+    def is_full(self) -> bool:
+        return self._size >= self._capacity
+
+
+class AudioRing:
+    """Fixed-size float32 ring that keeps only the most recent samples."""
+
+    def __init__(self, capacity_frames: int):
+        self._data = np.zeros(max(1, int(capacity_frames)), dtype=np.float32)
+        self._pos = 0  # next write index
+        self._size = 0
+
+    def write(self, data: np.ndarray) -> None:
+        flat = data.reshape(-1)
+        cap = self._data.size
+        if flat.size >= cap:
+            self._data[:] = flat[-cap:]
+            self._pos = 0
+            self._size = cap
+            return
+        first = min(flat.size, cap - self._pos)
+        self._data[self._pos:self._pos + first] = flat[:first]
+        self._data[:flat.size - first] = flat[first:]
+        self._pos = (self._pos + flat.size) % cap
+        self._size = min(cap, self._size + flat.size)
+
+    def read(self) -> np.ndarray:
+        """Copy of the buffered samples, oldest first."""
+        if self._size < self._data.size:
+            return self._data[self._pos - self._size:self._pos].copy()
+        return np.concatenate([self._data[self._pos:], self._data[:self._pos]])
+
+    def clear(self) -> None:
+        self._pos = 0
+        self._size = 0
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+
+# ---------------------------------------------------------------------------
+# Voice activity detection
+# ---------------------------------------------------------------------------
+
+def _rms(frame: np.ndarray) -> float:
+    if not _is_valid_audio(frame):
+        return 0.0
+    return float(np.sqrt(np.dot(frame, frame) / frame.size))
+
+
+class VoiceActivityDetector(abc.ABC):
+    """Per-frame speech/non-speech decision.  Subclasses set ``frame_ms``."""
+
+    frame_ms = 30
+
+    @abc.abstractmethod
+    def is_speech(self, frame: np.ndarray) -> bool:
+        """True if *frame* (``frame_ms`` of mono float32 audio) contains speech."""
+
+    def reset(self) -> None:
+        """Forget any state carried between frames."""
+
+
+class EnergyVAD(VoiceActivityDetector):
+    """Fixed RMS threshold — the original auto-listen behaviour."""
+
+    def __init__(self, threshold: float = 0.01):
+        self.threshold = threshold
+
+    def is_speech(self, frame: np.ndarray) -> bool:
+        return _rms(frame) >= self.threshold
+
+
+class AdaptiveVAD(VoiceActivityDetector):
+    """RMS against a tracked noise floor, for rooms with steady background noise.
+
+    The floor follows quiet frames quickly and creeps up slowly during
+    speech, so a permanent rise in background noise (a fan, an office)
+    stops counting as speech after a few seconds.
+    """
+
+    def __init__(
+        self,
+        min_threshold: float = 0.01,
+        ratio: float = 3.0,
+        fall: float = 0.2,
+        rise: float = 0.02,
+        speech_rise: float = 0.002,
+    ):
+        self.min_threshold = min_threshold
+        self.ratio = ratio
+        self._fall = fall
+        self._rise = rise
+        self._speech_rise = speech_rise
+        self._floor: Optional[float] = None
+
+    def is_speech(self, frame: np.ndarray) -> bool:
+        rms = _rms(frame)
+        if self._floor is None:
+            self._floor = min(rms, self.min_threshold / self.ratio)
+        speech = rms >= self.threshold
+        if rms < self._floor:
+            rate = self._fall
+        else:
+            rate = self._speech_rise if speech else self._rise
+        self._floor += rate * (rms - self._floor)
+        return speech
+
+    @property
+    def threshold(self) -> float:
+        return max(self.min_threshold, (self._floor or 0.0) * self.ratio)
+
+    @property
+    def noise_floor(self) -> float:
+        return self._floor or 0.0
+
+    def reset(self) -> None:
+        self._floor = None
+
+
+class SileroVAD(VoiceActivityDetector):
+    """Silero VAD (the ONNX model bundled with faster-whisper) on 32 ms frames.
+
+    The LSTM state is carried across frames so the model sees a continuous
+    stream.  Frames at other sample rates are linearly resampled to 16 kHz.
+    """
+
+    MODEL_RATE = 16_000
+    FRAME_SAMPLES = 512
+    CONTEXT_SAMPLES = 64
+    frame_ms = 32
+
+    def __init__(self, threshold: float = 0.5, sample_rate: int = 16_000):
+        self.threshold = threshold
+        self._sample_rate = sample_rate
+        from faster_whisper.vad import get_vad_model
+
+        self._session = get_vad_model().session
+        self.reset()
+
+    def speech_prob(self, frame: np.ndarray) -> float:
+        if self._sample_rate != self.MODEL_RATE or frame.size != self.FRAME_SAMPLES:
+            x = np.linspace(0, frame.size - 1, self.FRAME_SAMPLES)
+            frame = np.interp(x, np.arange(frame.size), frame)
+        frame = np.asarray(frame, dtype=np.float32)
+        batch = np.concatenate([self._context, frame])[None, :]
+        out, self._h, self._c = self._session.run(None, {"input": batch, "h": self._h, "c": self._c})
+        self._context = frame[-self.CONTEXT_SAMPLES:]
+        return float(np.asarray(out).reshape(-1)[-1])
+
+    def is_speech(self, frame: np.ndarray) -> bool:
+        return self.speech_prob(frame) >= self.threshold
+
+    def reset(self) -> None:
+        self._h = np.zeros((1, 1, 128), dtype=np.float32)
+        self._c = np.zeros((1, 1, 128), dtype=np.float32)
+        self._context = np.zeros(self.CONTEXT_SAMPLES, dtype=np.float32)
+
+
+def create_vad_detector(
+    mode: VADMode,
+    energy_threshold: float = 0.01,
+    sample_rate: int = 16_000,
+) -> VoiceActivityDetector:
+    """Build the detector for *mode*; Silero falls back to adaptive if it cannot load."""
+    if mode == VADMode.SILERO:
+        try:
+            return SileroVAD(sample_rate=sample_rate)
+        except Exception as exc:
+            logger.warning("Silero VAD unavailable (%s) — using adaptive noise-floor VAD", exc)
+            mode = VADMode.ADAPTIVE
+    if mode == VADMode.ADAPTIVE:
+        return AdaptiveVAD(min_threshold=energy_threshold)
+    return EnergyVAD(energy_threshold)
+
+
+class VADStage:
+    """Frame-level speech segmentation around a pluggable detector.
+
+    :meth:`process` splits captured chunks into detector-sized frames and
+    returns ``(event, frame)`` pairs:
+
+    - ``START`` — first speech frame, with up to ``pre_roll_ms`` of the
+      preceding audio prepended so the onset of the first word survives;
+    - ``SPEECH`` — speech, or trailing silence within ``hangover_ms``;
+    - ``PAUSE`` — silence inside an utterance that may still be cut;
+    - ``END`` (frame is None) — ``silence_ms`` of silence ended the utterance.
+
+    Consumers keep audio up to the last ``SPEECH`` frame when the utterance
+    ends, so at most ``hangover_ms`` of trailing silence reaches the decoder.
+    """
+
+    START = "start"
+    SPEECH = "speech"
+    PAUSE = "pause"
+    END = "end"
+
+    def __init__(
+        self,
+        detector: VoiceActivityDetector,
+        sample_rate: int = 16_000,
+        channels: int = 1,
+        silence_ms: int = 1200,
+        pre_roll_ms: int = 0,
+        hangover_ms: int = 300,
+    ):
+        self.detector = detector
+        self._channels = max(1, channels)
+        self._frame_len = max(1, int(sample_rate * detector.frame_ms / 1000)) * self._channels
+        frame_s = detector.frame_ms / 1000.0
+        self._silence_frames = max(1, int(round(silence_ms / 1000.0 / frame_s)))
+        self._hangover_frames = max(0, int(round(hangover_ms / 1000.0 / frame_s)))
+        pre_roll_len = int(sample_rate * pre_roll_ms / 1000) * self._channels
+        self._pre_roll = AudioRing(pre_roll_len) if pre_roll_len > 0 else None
+        self._pending = np.zeros(0, dtype=np.float32)
+        self._active = False
+        self._silent_run = 0
+
+    def process(self, chunk: np.ndarray) -> List[Tuple[str, Optional[np.ndarray]]]:
+        with Telemetry.shared().timer("vad_chunk_ms", detector=type(self.detector).__name__):
+            return self._process(chunk)
+
+    def _process(self, chunk: np.ndarray) -> List[Tuple[str, Optional[np.ndarray]]]:
+        data = chunk.reshape(-1)
+        if self._pending.size:
+            data = np.concatenate([self._pending, data])
+        n_frames = data.size // self._frame_len
+        events: List[Tuple[str, Optional[np.ndarray]]] = []
+        for i in range(n_frames):
+            frame = data[i * self._frame_len:(i + 1) * self._frame_len]
+            speech = self.detector.is_speech(self._mono(frame))
+            if not self._active:
+                if speech:
+                    self._active = True
+                    self._silent_run = 0
+                    if self._pre_roll is not None and self._pre_roll.size:
+                        onset = np.concatenate([self._pre_roll.read(), frame])
+                        self._pre_roll.clear()
+                    else:
+                        onset = frame
+                    events.append((self.START, onset))
+                elif self._pre_roll is not None:
+                    self._pre_roll.write(frame)
+            elif speech:
+                self._silent_run = 0
+                events.append((self.SPEECH, frame))
+            else:
+                self._silent_run += 1
+                kind = self.SPEECH if self._silent_run <= self._hangover_frames else self.PAUSE
+                events.append((kind, frame))
+                if self._silent_run >= self._silence_frames:
+                    self._active = False
+                    events.append((self.END, None))
+        # Blocks from the capture engine are only valid during the callback.
+        self._pending = data[n_frames * self._frame_len:].copy()
+        return events
+
+    def end_utterance(self) -> None:
+        """Force the current utterance closed (e.g. the max duration was hit)."""
+        self._active = False
+        self._silent_run = 0
+
+    def reset(self) -> None:
+        self.end_utterance()
+        if self._pre_roll is not None:
+            self._pre_roll.clear()
+        self._pending = np.zeros(0, dtype=np.float32)
+        self.detector.reset()
+
+    @property
+    def in_speech(self) -> bool:
+        return self._active
+
+    def _mono(self, frame: np.ndarray) -> np.ndarray:
+        if self._channels == 1:
+            return frame
+        return frame.reshape(-1, self._channels).mean(axis=1)
+
+
+# ---------------------------------------------------------------------------
+# Capture engine
+# ---------------------------------------------------------------------------
+
+class CaptureEngine:
+    """One continuous input stream shared by the recorder, VAD and level meter.
+
+    Subscribers receive every captured block as a flat float32 array.  The
+    array is only valid during the call — copy it (e.g. into an
+    :class:`AudioBuffer`) to keep it.  Callbacks run on the audio thread and
+    must be quick.
+
+    The stream opens on the first subscription and closes after the last
+    one leaves.  Callback-based ``sd.InputStream`` is used by default; on
+    WDM-KS (or if the stream cannot be opened) the engine falls back to the
+    blocking ``sd.rec()`` loop the recorder has always used.
+
+    If *output_rate* differs from the device rate, blocks are resampled
+    on the fly before dispatch, so subscribers see ``output_rate``.
+    """
+
+    BLOCK_S = 0.05
+    FALLBACK_BLOCK_S = 0.1
+
+    def __init__(
+        self,
+        device_index: Optional[int] = None,
+        sample_rate: int = 16_000,
+        channels: int = 1,
+        dtype: str = "float32",
+        use_stream: Optional[bool] = None,
+        output_rate: Optional[int] = None,
+    ):
+        self._device_index = device_index
+        self._sample_rate = sample_rate
+        self._output_rate = output_rate or sample_rate
+        self._resampler: Optional[StreamingResampler] = None
+        if self._output_rate != sample_rate:
+            self._resampler = StreamingResampler(sample_rate, self._output_rate, channels)
+        self._channels = channels
+        self._dtype = dtype
+        self._use_stream = use_stream  # None = auto (InputStream unless WDM-KS)
+        self._lock = threading.Lock()
+        self._subscribers: Dict[int, Callable[[np.ndarray], None]] = {}
+        self._next_token = 1
+        self._stream: Optional[sd.InputStream] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+
+    # ---- Subscriptions ------------------------------------------------------
+
+    def subscribe(self, callback: Callable[[np.ndarray], None]) -> int:
+        """Register *callback* for captured blocks; returns a token for unsubscribe()."""
+        with self._lock:
+            token = self._next_token
+            self._next_token += 1
+            self._subscribers[token] = callback
+            if not self.is_running:
+                self._start_locked()
+        return token
+
+    def unsubscribe(self, token: int) -> None:
+        with self._lock:
+            self._subscribers.pop(token, None)
+            if self._subscribers:
+                return
+            handles = self._detach_locked()
+        self._close_handles(*handles)
+
+    def close(self) -> None:
+        """Drop all subscribers and close the device."""
+        with self._lock:
+            self._subscribers.clear()
+            handles = self._detach_locked()
+        self._close_handles(*handles)
+
+    # ---- Device lifecycle ---------------------------------------------------
+
+    def _start_locked(self) -> None:
+        if self._resampler is not None:
+            self._resampler.reset()
+        use_stream = self._use_stream
+        if use_stream is None:
+            use_stream = not self._is_wdm_ks()
+        if use_stream:
+            try:
+                self._stream = sd.InputStream(
+                    samplerate=self._sample_rate,
+                    channels=self._channels,
+                    dtype=self._dtype,
+                    device=self._device_index,
+                    blocksize=int(self._sample_rate * self.BLOCK_S),
+                    callback=self._on_block,
+                )
+                self._stream.start()
+                logger.info("Capture engine started (InputStream, device=%s, %dHz→%dHz, %s)",
+                            self._device_index, self._sample_rate, self._output_rate, self._dtype)
+                return
+            except Exception as exc:
+                logger.warning("InputStream failed (%s) — falling back to sd.rec loop", exc)
+                self._stream = None
+
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(
+            target=self._rec_loop, args=(self._stop_event,), name="tv-capture", daemon=True
+        )
+        self._thread.start()
+        logger.info("Capture engine started (sd.rec loop, device=%s, %dHz→%dHz, %s)",
+                    self._device_index, self._sample_rate, self._output_rate, self._dtype)
+
+    def _detach_locked(self) -> tuple:
+        """Hand back the open stream/thread; they are closed outside the lock
+        because stopping waits for an in-flight dispatch, which takes the lock."""
+        stream, thread = self._stream, self._thread
+        self._stream = None
+        self._thread = None
+        if thread is not None:
+            self._stop_event.set()
+        return stream, thread
+
+    @staticmethod
+    def _close_handles(stream: Optional[sd.InputStream], thread: Optional[threading.Thread]) -> None:
+        if stream is not None:
+            try:
+                stream.stop()
+                stream.close()
+            except Exception as exc:
+                logger.debug("InputStream close failed: %s", exc)
+        if thread is not None:
+            try:
+                sd.stop()  # Interrupt any in-progress sd.rec()
+            except Exception:
+                pass
+            if thread is not threading.current_thread():
+                thread.join(timeout=2)
+
+    def _is_wdm_ks(self) -> bool:
+        try:
+            dev = sd.query_devices(self._device_index, kind="input")
+            api = sd.query_hostapis(dev["hostapi"])["name"]
+            return "wdm-ks" in api.lower()
+        except Exception:
+            return False
+
+    # ---- Capture ------------------------------------------------------------
+
+    def _on_block(self, indata, frames, time_info, status) -> None:
+        if status:
+            logger.debug("InputStream status: %s", status)
+            Telemetry.shared().count("capture_status", status=status)
+        self._dispatch(_to_float32(indata, self._dtype).reshape(-1))
+
+    def _rec_loop(self, stop_event: threading.Event) -> None:
+        frames = int(self._sample_rate * self.FALLBACK_BLOCK_S)
+        try:
+            while not stop_event.is_set():
+                data = sd.rec(
+                    frames,
+                    samplerate=self._sample_rate,
+                    channels=self._channels,
+                    dtype=self._dtype,
+                    device=self._device_index,
+                    blocking=True,
+                )
+                if stop_event.is_set():
+                    break
+                self._dispatch(_to_float32(data, self._dtype).reshape(-1))
+        except Exception as exc:
+            logger.error("Capture loop error: %s", exc)
+
+    def _dispatch(self, block: np.ndarray) -> None:
+        tel = Telemetry.shared()
+        tel.count("capture_blocks")
+        if self._resampler is not None:
+            with tel.timer("resample_ms"):
+                block = self._resampler.process(block)
+            if not block.size:
+                return
+        with self._lock:
+            subscribers = list(self._subscribers.values())
+        for callback in subscribers:
+            try:
+                callback(block)
+            except Exception as exc:
+                logger.error("Capture subscriber error: %s", exc)
+
+    # ---- State helpers ------------------------------------------------------
+
+    @property
+    def is_running(self) -> bool:
+        return self._stream is not None or self._thread is not None
+
+    @property
+    def uses_stream(self) -> bool:
+        return self._stream is not None
+
+    @property
+    def sample_rate(self) -> int:
+        """Rate of the blocks delivered to subscribers."""
+        return self._output_rate
+
+    @property
+    def device_rate(self) -> int:
+        return self._sample_rate
+
+    @property
+    def dtype(self) -> str:
+        return self._dtype
+
+
 # ---------------------------------------------------------------------------
 # Microphone Manager
 # ---------------------------------------------------------------------------
 
+PROBE_CACHE_VERSION = 1
+PROBE_WORKERS = 4
+
+# sd.rec()/sd.wait() share one module-level stream, so they must not overlap.
+_SD_REC_LOCK = threading.Lock()
+
+
+def _device_fingerprint(dev: Dict) -> str:
+    """Driver-level identity of a device.
+
+    PortAudio does not expose driver versions; the channel count, default
+    rate and latencies change with the driver, so they stand in for one.
+    """
+    return "{}/{}/{:.4f}/{:.4f}".format(
+        dev.get("max_input_channels", 0),
+        int(dev.get("default_samplerate", 0) or 0),
+        float(dev.get("default_low_input_latency", 0.0) or 0.0),
+        float(dev.get("default_high_input_latency", 0.0) or 0.0),
+    )
+
+
 class MicrophoneManager:
-    """Enumerate, test, and monitor audio input devices."""
+    """Enumerate, test, and monitor audio input devices.
+
+    Probe results (working dtype and rate) can be persisted to
+    *probe_cache_path*, keyed by device name, host API and driver
+    fingerprint, so warm starts skip probing entirely.
+    """
 
     _PREFERRED_KEYWORDS = ("microphone", "headset", "mic")
     _AVOID_KEYWORDS = ("sound mapper", "stereo mix", "virtual", "output")
@@ -48,13 +638,22 @@ class MicrophoneManager:
     # Formats to try in order of preference
     _DTYPE_FALLBACK = ("float32", "int16", "int32")
 
-    def __init__(self, config: Optional[AudioConfig] = None):
+    def __init__(self, config: Optional[AudioConfig] = None, probe_cache_path: Optional[Path] = None):
         self._config = config or AudioConfig()
         self._monitor_thread: Optional[threading.Thread] = None
         self._monitor_stop = threading.Event()
         # Cache: device_index -> working dtype and sample rate (probed)
         self._probed_dtypes: Dict[int, str] = {}
         self._probed_rates: Dict[int, int] = {}
+        self._probe_lock = threading.Lock()
+        # Persistent cache: "name|hostapi|fingerprint" -> {"dtype", "rate"}
+        self._probe_cache_path = Path(probe_cache_path) if probe_cache_path else None
+        self._probe_cache: Dict[str, Dict[str, Any]] = self._load_probe_cache()
+        # One shared capture engine per (device, rate, dtype)
+        self._engines: Dict[tuple, CaptureEngine] = {}
+        self._engines_lock = threading.Lock()
+        self._monitor_engine: Optional[CaptureEngine] = None
+        self._monitor_token: Optional[int] = None
 
     def list_devices(self) -> List[Dict]:
         """Return input devices with index, name, and max channels."""
@@ -80,14 +679,42 @@ class MicrophoneManager:
                 })
         return result
 
-    def probe_device(self, device_index: int, sample_rate: Optional[int] = None) -> Optional[str]:
+    def probe_device(
+        self,
+        device_index: int,
+        sample_rate: Optional[int] = None,
+        stop_event: Optional[threading.Event] = None,
+    ) -> Optional[str]:
         """Try opening a device with different dtypes and sample rates.
 
         Returns the working dtype or None.
-        Results are cached so subsequent calls for the same device are instant.
+        Results are cached in memory and in the persistent probe cache, so
+        subsequent calls for the same device (also in later runs) are instant.
+        Setting *stop_event* abandons the probe between attempts.
         """
-        if device_index in self._probed_dtypes:
-            return self._probed_dtypes[device_index]
+        with Telemetry.shared().span("device_probe", device=device_index) as span:
+            dtype = self._probe_device(device_index, sample_rate, stop_event)
+            span.set(dtype=dtype)
+            return dtype
+
+    def _probe_device(
+        self,
+        device_index: int,
+        sample_rate: Optional[int],
+        stop_event: Optional[threading.Event],
+    ) -> Optional[str]:
+        with self._probe_lock:
+            if device_index in self._probed_dtypes:
+                return self._probed_dtypes[device_index]
+
+        key = self._probe_key(device_index)
+        cached = self._probe_cache.get(key) if key else None
+        if cached and cached.get("dtype") in self._DTYPE_FALLBACK:
+            logger.info("Device %d probe cache hit: dtype=%s @ %dHz", device_index, cached["dtype"], cached["rate"])
+            with self._probe_lock:
+                self._probed_dtypes[device_index] = cached["dtype"]
+                self._probed_rates[device_index] = int(cached["rate"])
+            return cached["dtype"]
 
         # Try the requested rate first, then the device's native rate
         rates_to_try = []
@@ -111,17 +738,16 @@ class MicrophoneManager:
 
         for rate in rates_to_try:
             for dtype in self._DTYPE_FALLBACK:
+                if stop_event is not None and stop_event.is_set():
+                    return None
                 try:
                     frames = int(rate * 0.25)  # 250ms test
-                    audio = sd.rec(frames, samplerate=rate, channels=1, dtype=dtype, device=device_index)
-                    sd.wait()
+                    audio = self._record_probe(device_index, rate, dtype, frames)
                     # Convert to float32 for validation
                     f32 = _to_float32(audio, dtype)
                     if _is_valid_audio(f32):
                         logger.info("Device %d works with dtype=%s @ %dHz", device_index, dtype, rate)
-                        self._probed_dtypes[device_index] = dtype
-                        # Store the working sample rate too
-                        self._probed_rates[device_index] = rate
+                        self._remember_probe(device_index, key, dtype, rate)
                         return dtype
                     else:
                         logger.debug("Device %d dtype=%s @ %dHz returned invalid data", device_index, dtype, rate)
@@ -129,6 +755,78 @@ class MicrophoneManager:
                     logger.debug("Device %d dtype=%s @ %dHz failed: %s", device_index, dtype, rate, exc)
         return None
 
+    @staticmethod
+    def _record_probe(device_index: int, rate: int, dtype: str, frames: int) -> np.ndarray:
+        """Record *frames* for a probe on a private stream (safe to run concurrently).
+
+        Falls back to sd.rec() — serialised, since it uses a global stream —
+        for host APIs where blocking stream reads fail.
+        """
+        try:
+            with sd.InputStream(samplerate=rate, channels=1, dtype=dtype, device=device_index) as stream:
+                audio, _overflowed = stream.read(frames)
+            return audio
+        except Exception as exc:
+            logger.debug("Device %d InputStream probe failed (%s) — trying sd.rec", device_index, exc)
+        with _SD_REC_LOCK:
+            audio = sd.rec(frames, samplerate=rate, channels=1, dtype=dtype, device=device_index)
+            sd.wait()
+        return audio
+
+    # ---- Persistent probe cache ---------------------------------------------
+
+    def _probe_key(self, device_index: int) -> Optional[str]:
+        try:
+            dev = sd.query_devices(device_index)
+            try:
+                api = sd.query_hostapis(dev["hostapi"])["name"]
+            except Exception:
+                api = "Unknown"
+            return f"{dev['name']}|{api}|{_device_fingerprint(dev)}"
+        except Exception:
+            return None
+
+    def _load_probe_cache(self) -> Dict[str, Dict[str, Any]]:
+        if self._probe_cache_path is None:
+            return {}
+        try:
+            data = json.loads(self._probe_cache_path.read_text(encoding="utf-8"))
+            if data.get("version") == PROBE_CACHE_VERSION:
+                return dict(data.get("devices", {}))
+        except Exception:
+            pass
+        return {}
+
+    def _remember_probe(self, device_index: int, key: Optional[str], dtype: str, rate: int) -> None:
+        with self._probe_lock:
+            self._probed_dtypes[device_index] = dtype
+            self._probed_rates[device_index] = rate
+            if key is None or self._probe_cache_path is None:
+                return
+            self._probe_cache[key] = {"dtype": dtype, "rate": rate}
+            payload = {"version": PROBE_CACHE_VERSION, "devices": dict(self._probe_cache)}
+            try:
+                self._probe_cache_path.parent.mkdir(parents=True, exist_ok=True)
+                tmp = self._probe_cache_path.with_suffix(".tmp")
+                tmp.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+                os.replace(tmp, self._probe_cache_path)
+            except Exception as exc:
+                logger.debug("Could not write probe cache: %s", exc)
+
+    def clear_probe_cache(self) -> None:
+        """Forget all probe results, in memory and on disk."""
+        with self._probe_lock:
+            self._probed_dtypes.clear()
+            self._probed_rates.clear()
+            self._probe_cache.clear()
+            if self._probe_cache_path is not None:
+                try:
+                    self._probe_cache_path.unlink()
+                except FileNotFoundError:
+                    pass
+                except Exception as exc:
+                    logger.debug("Could not remove probe cache: %s", exc)
+
     def get_working_dtype(self, device_index: int) -> str:
         """Return the probed working dtype for a device, or the default dtype."""
         return self._probed_dtypes.get(device_index, self._config.dtype)
@@ -173,11 +871,14 @@ class MicrophoneManager:
 
         return best or devices[0]
 
-    def get_best_working_device(self) -> Optional[Dict]:
+    def get_best_working_device(self, max_workers: int = PROBE_WORKERS) -> Optional[Dict]:
         """Find the best device that actually produces valid audio.
 
-        Probes candidates in score order and returns the first that works.
-        Falls back to get_default_device() if probing is inconclusive.
+        Probes candidates concurrently and returns the highest-scoring one
+        that works as soon as every better-scoring candidate has failed;
+        the remaining probes are abandoned.  Cached devices resolve without
+        recording.  Falls back to get_default_device() if probing is
+        inconclusive.
         """
         devices = self.list_devices()
         if not devices:
@@ -203,12 +904,32 @@ class MicrophoneManager:
 
         candidates = sorted(devices, key=_score, reverse=True)
 
-        for dev in candidates:
-            dtype = self.probe_device(dev["index"])
-            if dtype:
-                logger.info("Best working device: [%d] %s (dtype=%s, api=%s)",
-                            dev["index"], dev["name"], dtype, dev.get("hostapi"))
-                return dev
+        stop = threading.Event()
+        results: Dict[int, Optional[str]] = {}
+        pool = ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(candidates))),
+                                  thread_name_prefix="tv-probe")
+        futures = {
+            pool.submit(self.probe_device, dev["index"], None, stop): rank
+            for rank, dev in enumerate(candidates)
+        }
+        try:
+            for future in as_completed(futures):
+                try:
+                    results[futures[future]] = future.result()
+                except Exception as exc:
+                    logger.debug("Probe failed: %s", exc)
+                    results[futures[future]] = None
+                # The best candidate wins once everything ranked above it has failed.
+                for rank, dev in enumerate(candidates):
+                    if rank not in results:
+                        break
+                    if results[rank]:
+                        logger.info("Best working device: [%d] %s (dtype=%s, api=%s)",
+                                    dev["index"], dev["name"], results[rank], dev.get("hostapi"))
+                        return dev
+        finally:
+            stop.set()
+            pool.shutdown(wait=False, cancel_futures=True)
 
         logger.warning("No working input device found during probing, falling back to heuristic")
         return self.get_default_device()
@@ -249,16 +970,74 @@ class MicrophoneManager:
             logger.error("Device test failed: %s", exc)
             return 0.0
 
+    def capture_engine(self, device_index: Optional[int] = None, output_rate: Optional[int] = None) -> CaptureEngine:
+        """Return the shared capture engine for a device (probed dtype and rate).
+
+        Audio is delivered at *output_rate* (default: ``AudioConfig.sample_rate``,
+        16 kHz), resampled in the stream if the device runs at another rate.
+        """
+        dtype = self.get_working_dtype(device_index) if device_index is not None else self._config.dtype
+        rate = self.get_working_sample_rate(device_index) if device_index is not None else self._config.sample_rate
+        output_rate = output_rate or self._config.sample_rate
+        key = (device_index, rate, dtype, output_rate)
+        with self._engines_lock:
+            engine = self._engines.get(key)
+            if engine is None:
+                engine = CaptureEngine(
+                    device_index=device_index,
+                    sample_rate=rate,
+                    channels=self._config.channels,
+                    dtype=dtype,
+                    output_rate=output_rate,
+                )
+                self._engines[key] = engine
+            return engine
+
+    def close_engines(self) -> None:
+        """Close every shared capture stream (e.g. on exit)."""
+        with self._engines_lock:
+            engines = list(self._engines.values())
+            self._engines.clear()
+        for engine in engines:
+            engine.close()
+
     def start_level_monitor(
         self,
         callback: Callable[[float], None],
         device_index: Optional[int] = None,
         interval: float = 0.05,
+        engine: Optional[CaptureEngine] = None,
     ) -> None:
-        """Start a background thread that pushes RMS levels to *callback*."""
+        """Push RMS levels to *callback* every *interval* seconds.
+
+        With *engine* the meter taps the shared capture stream instead of
+        opening the device a second time; otherwise it runs its own sd.rec
+        loop in a background thread.
+        """
         self.stop_level_monitor()
         self._monitor_stop.clear()
 
+        if engine is not None:
+            state = {"sum_sq": 0.0, "n": 0}
+            period = max(int(engine.sample_rate * interval), 1)
+
+            def _on_block(block: np.ndarray) -> None:
+                if _is_valid_audio(block):
+                    state["sum_sq"] += float(np.dot(block, block))
+                state["n"] += block.size
+                if state["n"] < period:
+                    return
+                rms = float(np.sqrt(state["sum_sq"] / state["n"]))
+                state["sum_sq"], state["n"] = 0.0, 0
+                try:
+                    callback(rms)
+                except Exception:
+                    pass
+
+            self._monitor_engine = engine
+            self._monitor_token = engine.subscribe(_on_block)
+            return
+
         dtype = self.get_working_dtype(device_index) if device_index is not None else self._config.dtype
         rate = self.get_working_sample_rate(device_index) if device_index is not None else self._config.sample_rate
         chunk_frames = max(int(rate * interval), 800)
@@ -290,6 +1069,10 @@ class MicrophoneManager:
         self._monitor_thread.start()
 
     def stop_level_monitor(self) -> None:
+        if self._monitor_engine is not None and self._monitor_token is not None:
+            self._monitor_engine.unsubscribe(self._monitor_token)
+        self._monitor_engine = None
+        self._monitor_token = None
         self._monitor_stop.set()
         if self._monitor_thread and self._monitor_thread.is_alive():
             self._monitor_thread.join(timeout=2)
@@ -301,17 +1084,21 @@ class MicrophoneManager:
 # ---------------------------------------------------------------------------
 
 class VoiceRecorder:
-    """Record audio from the microphone with energy-based VAD.
+    """Record audio from the microphone with voice activity detection.
 
     Supports two usage patterns:
     - **Manual**: call start_manual_recording() / stop_manual_recording()
     - **Auto-listen**: call start_auto_listen() with callbacks
 
-    Uses a blocking-read thread approach (compatible with all host APIs
-    including WDM-KS on Windows Server) with automatic fallback from
-    callback-based streams when they don't work.
+    When given a shared :class:`CaptureEngine` the recorder subscribes to
+    its continuous stream (no device open/close per chunk, no gaps between
+    reads).  Without one it uses a blocking-read thread approach
+    (compatible with all host APIs including WDM-KS on Windows Server).
 
     Audio is always returned as float32 regardless of the hardware dtype.
+    Captured chunks are converted straight into a preallocated
+    :class:`AudioBuffer` sized for ``MAX_DURATION_S``; the returned clip is a
+    zero-copy view of that buffer.
     """
 
     MAX_DURATION_S = 30.0
@@ -323,14 +1110,18 @@ class VoiceRecorder:
         device_index: Optional[int] = None,
         silence_ms: int = 1200,
         device_dtype: Optional[str] = None,
+        engine: Optional[CaptureEngine] = None,
+        detector: Optional[VoiceActivityDetector] = None,
     ):
         self._config = config or AudioConfig()
         self._device_index = device_index
+        self._engine = engine
+        self._engine_token: Optional[int] = None
         self._silence_ms = silence_ms
         # The dtype to use when opening the stream.  If None, uses config.dtype.
         self._device_dtype = device_dtype or self._config.dtype
 
-        self._chunks: list[np.ndarray] = []
+        self._buffer = AudioBuffer(self._capacity_frames())
         self._recording = False
         self._stream: Optional[sd.InputStream] = None
         self._record_thread: Optional[threading.Thread] = None
@@ -338,32 +1129,49 @@ class VoiceRecorder:
         self._stop_event = threading.Event()
 
         # Auto-listen state
+        self._detector = detector
+        self._vad: Optional[VADStage] = None
         self._auto_listening = False
         self._speech_active = False
-        self._silence_start: Optional[float] = None
+        self._keep_frames = 0  # buffer size at the last frame worth keeping
         self._on_speech_start: Optional[Callable] = None
         self._on_speech_end: Optional[Callable] = None
         self._on_audio_ready: Optional[Callable[[np.ndarray], None]] = None
         self._record_start_time: Optional[float] = None
 
+    def _capacity_frames(self) -> int:
+        return int(self.MAX_DURATION_S * self._config.sample_rate) * max(1, self._config.channels)
+
     # ---- Manual recording ---------------------------------------------------
 
-    def start_manual_recording(self) -> None:
+    def start_manual_recording(self, on_chunk: Optional[Callable[[np.ndarray], None]] = None) -> None:
         """Begin capturing audio. Call stop_manual_recording() to finish.
 
-        Uses successive sd.rec() calls in a thread (compatible with all
-        host APIs including WDM-KS on Windows Server where InputStream
-        callbacks and blocking reads can fail).
+        Subscribes to the capture engine if one was given; otherwise uses
+        successive sd.rec() calls in a thread (compatible with all host APIs
+        including WDM-KS on Windows Server where InputStream callbacks and
+        blocking reads can fail).
+
+        If *on_chunk* is given it receives every captured chunk as a flat
+        float32 array while recording (e.g. to feed a StreamingTranscriber).
         """
         with self._lock:
             if self._recording:
                 return
-            self._chunks.clear()
+            self._buffer.clear()
             self._recording = True
             self._record_start_time = time.monotonic()
 
         self._stop_event.clear()
         dtype = self._device_dtype
+
+        if self._engine is not None:
+            self._engine_token = self._engine.subscribe(
+                lambda block: self._process_manual_chunk(block, on_chunk)
+            )
+            logger.info("Manual recording started (device=%s, dtype=%s, shared stream)", self._device_index, dtype)
+            return
+
         rate = self._config.sample_rate
         chunk_frames = int(rate * 0.5)  # 500ms chunks via sd.rec
 
@@ -379,13 +1187,8 @@ class VoiceRecorder:
                         device=self._device_index,
                         blocking=True,
                     )
-                    with self._lock:
-                        if not self._recording:
-                            break
-                        if self._record_start_time and (time.monotonic() - self._record_start_time) > self.MAX_DURATION_S:
-                            self._recording = False
-                            break
-                        self._chunks.append(data.copy())
+                    if not self._process_manual_chunk(data, on_chunk):
+                        break
             except Exception as exc:
                 logger.error("Recording thread error: %s", exc)
                 with self._lock:
@@ -395,28 +1198,58 @@ class VoiceRecorder:
         self._record_thread.start()
         logger.info("Manual recording started (device=%s, dtype=%s)", self._device_index, dtype)
 
-    def stop_manual_recording(self) -> Optional[np.ndarray]:
-        """Stop recording and return the captured float32 numpy array (or None)."""
+    def _process_manual_chunk(
+        self, data: np.ndarray, on_chunk: Optional[Callable[[np.ndarray], None]]
+    ) -> bool:
+        """Append one captured chunk; returns False once capture should stop."""
         with self._lock:
-            self._recording = False
-        self._stop_event.set()
-        try:
-            sd.stop()  # Interrupt any in-progress sd.rec()
-        except Exception:
-            pass
+            if not self._recording:
+                return False
+            if self._record_start_time and (time.monotonic() - self._record_start_time) > self.MAX_DURATION_S:
+                self._recording = False
+                return False
+            written = self._buffer.write(data)
+            full = self._buffer.is_full
+            if full:
+                self._recording = False
+        if on_chunk and written.size:
+            try:
+                on_chunk(written)
+            except Exception as exc:
+                logger.error("on_chunk callback error: %s", exc)
+        if full:
+            logger.info("Recording buffer full (%.0fs) — stopping capture", self.MAX_DURATION_S)
+            return False
+        return True
 
-        if self._record_thread and self._record_thread.is_alive():
-            self._record_thread.join(timeout=3)
-        self._record_thread = None
+    def _detach_engine(self) -> None:
+        if self._engine is not None and self._engine_token is not None:
+            self._engine.unsubscribe(self._engine_token)
+            self._engine_token = None
 
-        with self._lock:
-            if not self._chunks:
-                return None
-            audio = np.concatenate(self._chunks, axis=0).flatten()
-            self._chunks.clear()
+    def stop_manual_recording(self) -> Optional[np.ndarray]:
+        """Stop recording and return the captured float32 numpy array (or None)."""
+        with Telemetry.shared().span("capture_stop") as span:
+            with self._lock:
+                self._recording = False
+            self._stop_event.set()
+            if self._engine is not None:
+                self._detach_engine()
+            else:
+                try:
+                    sd.stop()  # Interrupt any in-progress sd.rec()
+                except Exception:
+                    pass
 
-        # Always return float32 regardless of capture dtype
-        audio = _to_float32(audio, self._device_dtype)
+            if self._record_thread and self._record_thread.is_alive():
+                self._record_thread.join(timeout=3)
+            self._record_thread = None
+
+            with self._lock:
+                if not self._buffer.size:
+                    return None
+                audio = self._buffer.detach()
+            span.set(samples=int(audio.size))
 
         duration = len(audio) / self._config.sample_rate
         if duration < self.MIN_DURATION_S:
@@ -434,7 +1267,11 @@ class VoiceRecorder:
         on_speech_end: Optional[Callable] = None,
         on_audio_ready: Optional[Callable[[np.ndarray], None]] = None,
     ) -> None:
-        """Start energy-based auto-listen that fires callbacks on speech boundaries."""
+        """Start auto-listen that fires callbacks on speech boundaries.
+
+        Speech is segmented by a :class:`VADStage` using the configured
+        detector (``AudioConfig.vad_mode``) unless one was passed in.
+        """
         self.stop_auto_listen()
 
         self._on_speech_start = on_speech_start
@@ -442,14 +1279,22 @@ class VoiceRecorder:
         self._on_audio_ready = on_audio_ready
         self._auto_listening = True
         self._speech_active = False
-        self._silence_start = None
-        self._chunks.clear()
+        self._keep_frames = 0
+        self._buffer.clear()
         self._record_start_time = None
         self._stop_event.clear()
+        self._vad = self._create_vad_stage()
 
         dtype = self._device_dtype
         rate = self._config.sample_rate
 
+        vad_name = type(self._vad.detector).__name__
+        if self._engine is not None:
+            self._engine_token = self._engine.subscribe(self._on_auto_block)
+            logger.info("Auto-listen started (%s, threshold=%.4f, silence=%dms, dtype=%s, shared stream)",
+                         vad_name, self._config.energy_threshold, self._silence_ms, dtype)
+            return
+
         def _auto_read():
             """Thread that reads audio using sd.rec() for auto-listen VAD."""
             chunk_frames = int(rate * 0.1)  # 100ms chunks for responsive VAD
@@ -463,49 +1308,73 @@ class VoiceRecorder:
                         device=self._device_index,
                         blocking=True,
                     )
-
                     # Convert to float32 for RMS calculation
-                    f32 = _to_float32(data, dtype)
-                    rms = float(np.sqrt(np.mean(f32 ** 2))) if _is_valid_audio(f32) else 0.0
-                    now = time.monotonic()
-
-                    if rms >= self._config.energy_threshold:
-                        # Speech detected
-                        if not self._speech_active:
-                            self._speech_active = True
-                            self._chunks.clear()
-                            self._record_start_time = now
-                            self._silence_start = None
-                            if self._on_speech_start:
-                                try:
-                                    self._on_speech_start()
-                                except Exception:
-                                    pass
-                        else:
-                            self._silence_start = None
-
-                        self._chunks.append(data.copy())
-
-                        if self._record_start_time and (now - self._record_start_time) > self.MAX_DURATION_S:
-                            self._finalize_auto()
-                    elif self._speech_active:
-                        self._chunks.append(data.copy())
-                        if self._silence_start is None:
-                            self._silence_start = now
-                        elif (now - self._silence_start) * 1000 >= self._silence_ms:
-                            self._finalize_auto()
+                    self._process_auto_chunk(_to_float32(data, dtype), time.monotonic())
             except Exception as exc:
                 logger.error("Auto-listen thread error: %s", exc)
 
         self._record_thread = threading.Thread(target=_auto_read, daemon=True)
         self._record_thread.start()
-        logger.info("Auto-listen started (threshold=%.4f, silence=%dms, dtype=%s, blocking-read)",
-                     self._config.energy_threshold, self._silence_ms, dtype)
+        logger.info("Auto-listen started (%s, threshold=%.4f, silence=%dms, dtype=%s, blocking-read)",
+                     vad_name, self._config.energy_threshold, self._silence_ms, dtype)
+
+    def _create_vad_stage(self) -> VADStage:
+        detector = self._detector or create_vad_detector(
+            self._config.vad_mode,
+            energy_threshold=self._config.energy_threshold,
+            sample_rate=self._config.sample_rate,
+        )
+        detector.reset()
+        return VADStage(
+            detector,
+            sample_rate=self._config.sample_rate,
+            channels=self._config.channels,
+            silence_ms=self._silence_ms,
+            pre_roll_ms=self._config.pre_roll_ms,
+            hangover_ms=self._config.hangover_ms,
+        )
+
+    def _on_auto_block(self, block: np.ndarray) -> None:
+        if self._auto_listening and not self._stop_event.is_set():
+            self._process_auto_chunk(block, time.monotonic())
+
+    def _process_auto_chunk(self, f32: np.ndarray, now: float) -> None:
+        """Run the VAD stage on one float32 chunk and capture speech into the buffer."""
+        if self._vad is None:
+            return
+        for event, frame in self._vad.process(f32):
+            if event == VADStage.END:
+                # Cut the trailing silence beyond the hangover.
+                self._buffer.truncate(self._keep_frames)
+                self._finalize_auto()
+                continue
+
+            if event == VADStage.START:
+                self._speech_active = True
+                self._buffer.clear()
+                self._record_start_time = now
+                if self._on_speech_start:
+                    try:
+                        self._on_speech_start()
+                    except Exception:
+                        pass
+            elif not self._speech_active:
+                continue
+
+            self._buffer.write(frame)
+            if event != VADStage.PAUSE:
+                self._keep_frames = self._buffer.size
+
+            if self._buffer.is_full or (
+                self._record_start_time and (now - self._record_start_time) > self.MAX_DURATION_S
+            ):
+                self._vad.end_utterance()
+                self._finalize_auto()
 
     def _finalize_auto(self) -> None:
         """Package captured audio and fire on_audio_ready."""
         self._speech_active = False
-        self._silence_start = None
+        self._keep_frames = 0
 
         if self._on_speech_end:
             try:
@@ -513,22 +1382,19 @@ class VoiceRecorder:
             except Exception:
                 pass
 
-        chunks = list(self._chunks)
-        self._chunks.clear()
         self._record_start_time = None
-
-        if not chunks:
+        if not self._buffer.size:
             return
 
-        audio = np.concatenate(chunks, axis=0).flatten()
-        # Convert to float32 for downstream (Whisper expects float32)
-        audio = _to_float32(audio, self._device_dtype)
+        # Hand the arena to the consumer; the next utterance gets a fresh one.
+        audio = self._buffer.detach()
         duration = len(audio) / self._config.sample_rate
         if duration < self.MIN_DURATION_S:
             logger.info("Auto-listen clip too short (%.2fs) — discarded", duration)
             return
 
         logger.info("Auto-listen captured %.2fs of speech", duration)
+        Telemetry.shared().count("utterances")
         if self._on_audio_ready:
             try:
                 self._on_audio_ready(audio)
@@ -539,6 +1405,7 @@ class VoiceRecorder:
         self._auto_listening = False
         self._speech_active = False
         self._stop_event.set()
+        self._detach_engine()
         if self._record_thread and self._record_thread.is_alive():
             self._record_thread.join(timeout=3)
         self._record_thread = None
@@ -0,0 +1,247 @@
+"""Flat-memory audio file reader producing 16 kHz float32 windows.
+
+Decoding a file in one go keeps the whole recording in memory several times
+over (interleaved source samples, float copy, resampled copy): an hour of
+44.1 kHz stereo is well over a gigabyte.  :class:`AudioFileReader` instead
+walks the file in fixed-size pieces:
+
+* PCM and float WAV files are memory-mapped and converted a block at a time
+  through :class:`~tiltedvoice.resample.StreamingResampler`, so only the
+  pages being read are resident;
+* anything else (FLAC, Opus, MP3, M4A, …) is decoded frame by frame with
+  PyAV and resampled by libswresample as it streams.
+
+:meth:`AudioFileReader.windows` yields mono 16 kHz float32 arrays of a fixed
+length (only the last one is shorter), so peak memory depends on the window
+size, not on the length of the file.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import struct
+from dataclasses import dataclass
+from typing import Iterable, Iterator, Optional, Union
+
+import numpy as np
+
+from tiltedvoice.resample import StreamingResampler
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_RATE = 16_000
+DEFAULT_WINDOW_S = 30.0
+# Seconds of source audio converted per step on the WAV path; the resampler
+# gathers (outputs x taps) samples per step, so larger steps cost memory.
+WAV_BLOCK_S = 1.0
+
+_WAVE_FORMAT_PCM = 0x0001
+_WAVE_FORMAT_IEEE_FLOAT = 0x0003
+_WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+PathLike = Union[str, os.PathLike]
+
+
+@dataclass(frozen=True)
+class WavInfo:
+    """Layout of the sample data in a RIFF/WAVE file."""
+
+    format_tag: int
+    channels: int
+    sample_rate: int
+    bits: int
+    block_align: int
+    data_offset: int
+    frames: int
+
+    @property
+    def duration_s(self) -> float:
+        return self.frames / float(self.sample_rate)
+
+
+def read_wav_info(path: PathLike) -> Optional[WavInfo]:
+    """Parse the header of a PCM/float WAV file; None if not one we can map."""
+    try:
+        file_size = os.path.getsize(path)
+        with open(path, "rb") as f:
+            riff = f.read(12)
+            if len(riff) < 12 or riff[:4] != b"RIFF" or riff[8:12] != b"WAVE":
+                return None
+            fmt = None
+            while True:
+                header = f.read(8)
+                if len(header) < 8:
+                    return None
+                chunk_id, size = header[:4], struct.unpack("<I", header[4:])[0]
+                if chunk_id == b"fmt ":
+                    fmt = f.read(size)
+                    if size % 2:
+                        f.seek(1, os.SEEK_CUR)
+                elif chunk_id == b"data":
+                    if fmt is None or len(fmt) < 16:
+                        return None
+                    data_offset = f.tell()
+                    # Streamed or truncated recordings often carry a bogus size.
+                    size = min(size, file_size - data_offset)
+                    break
+                else:
+                    f.seek(size + (size % 2), os.SEEK_CUR)
+    except OSError:
+        return None
+
+    format_tag, channels, sample_rate, _, block_align, bits = struct.unpack("<HHIIHH", fmt[:16])
+    if format_tag == _WAVE_FORMAT_EXTENSIBLE and len(fmt) >= 26:
+        format_tag = struct.unpack("<H", fmt[24:26])[0]
+    supported = (
+        (format_tag == _WAVE_FORMAT_PCM and bits in (8, 16, 24, 32))
+        or (format_tag == _WAVE_FORMAT_IEEE_FLOAT and bits in (32, 64))
+    )
+    if not supported or channels < 1 or sample_rate <= 0 or block_align != channels * bits // 8:
+        return None
+    return WavInfo(format_tag, channels, sample_rate, bits, block_align, data_offset, size // block_align)
+
+
+def _pcm_to_mono(raw: np.ndarray, info: WavInfo) -> np.ndarray:
+    """Convert raw little-endian sample bytes to mono float32 in [-1, 1]."""
+    if info.format_tag == _WAVE_FORMAT_IEEE_FLOAT:
+        samples = raw.view("<f4" if info.bits == 32 else "<f8").astype(np.float32)
+    elif info.bits == 8:
+        samples = (raw.astype(np.float32) - 128.0) / 128.0
+    elif info.bits == 16:
+        samples = raw.view("<i2").astype(np.float32) / 32768.0
+    elif info.bits == 24:
+        b = raw.reshape(-1, 3).astype(np.int32)
+        ints = b[:, 0] | (b[:, 1] << 8) | (b[:, 2] << 16)
+        ints = np.where(ints & 0x800000, ints - 0x1000000, ints)
+        samples = ints.astype(np.float32) / 8388608.0
+    else:
+        samples = raw.view("<i4").astype(np.float32) / 2147483648.0
+    if info.channels > 1:
+        samples = samples.reshape(-1, info.channels).mean(axis=1)
+    return samples
+
+
+def _fixed_windows(blocks: Iterable[np.ndarray], size: int) -> Iterator[np.ndarray]:
+    """Re-cut a stream of arrays into arrays of exactly *size* (last may be shorter)."""
+    window = np.empty(size, dtype=np.float32)
+    filled = 0
+    for block in blocks:
+        pos = 0
+        while pos < block.size:
+            take = min(size - filled, block.size - pos)
+            window[filled:filled + take] = block[pos:pos + take]
+            filled += take
+            pos += take
+            if filled == size:
+                yield window
+                window = np.empty(size, dtype=np.float32)
+                filled = 0
+    if filled:
+        yield window[:filled]
+
+
+class AudioFileReader:
+    """Read an audio file as mono float32 at *sample_rate* without loading it whole."""
+
+    def __init__(self, path: PathLike, sample_rate: int = SAMPLE_RATE):
+        self.path = os.fspath(path)
+        self.sample_rate = int(sample_rate)
+        self.wav = read_wav_info(self.path)
+
+    @property
+    def duration_s(self) -> Optional[float]:
+        """Duration from the file header, without decoding; None if unknown."""
+        if self.wav is not None:
+            return self.wav.duration_s
+        try:
+            import av
+
+            with av.open(self.path, mode="r", metadata_errors="ignore") as container:
+                if container.duration is not None:
+                    return container.duration / float(av.time_base)
+                stream = container.streams.audio[0]
+                if stream.duration is not None and stream.time_base is not None:
+                    return float(stream.duration * stream.time_base)
+        except Exception as exc:
+            logger.debug("Could not read duration of %s: %s", self.path, exc)
+        return None
+
+    def windows(self, window_s: float = DEFAULT_WINDOW_S) -> Iterator[np.ndarray]:
+        """Yield consecutive windows of ``window_s`` seconds; the last may be shorter."""
+        size = max(1, int(round(window_s * self.sample_rate)))
+        return _fixed_windows(self.blocks(), size)
+
+    def blocks(self) -> Iterator[np.ndarray]:
+        """Yield resampled audio in whatever block sizes the source produces."""
+        if self.wav is not None:
+            return self._wav_blocks(self.wav)
+        return self._av_blocks()
+
+    def read(self) -> np.ndarray:
+        """Decode the whole file into one array, allocated once from the header length."""
+        expected = self.duration_s
+        out = np.empty(int(expected * self.sample_rate) + 1 if expected else 0, dtype=np.float32)
+        n = 0
+        for block in self.blocks():
+            if n + block.size > out.size:
+                out = np.resize(out, max(n + block.size, int(out.size * 1.5)))
+            out[n:n + block.size] = block
+            n += block.size
+        return out[:n]
+
+    def _wav_blocks(self, info: WavInfo) -> Iterator[np.ndarray]:
+        if info.frames == 0:
+            return
+        data = np.memmap(self.path, dtype=np.uint8, mode="r", offset=info.data_offset,
+                         shape=(info.frames * info.block_align,))
+        resampler = StreamingResampler(info.sample_rate, self.sample_rate)
+        step = max(1, int(WAV_BLOCK_S * info.sample_rate))
+        expected = -(-info.frames * self.sample_rate // info.sample_rate)
+        emitted = 0
+        try:
+            for start in range(0, info.frames, step):
+                stop = min(info.frames, start + step)
+                raw = np.asarray(data[start * info.block_align:stop * info.block_align])
+                out = resampler.process(_pcm_to_mono(raw, info))
+                out = out[:expected - emitted]
+                emitted += out.size
+                if out.size:
+                    yield out
+            tail = resampler.flush()[:expected - emitted]
+            if tail.size:
+                yield tail
+        finally:
+            del data
+
+    def _av_blocks(self) -> Iterator[np.ndarray]:
+        import av
+
+        resampler = av.audio.resampler.AudioResampler(format="flt", layout="mono", rate=self.sample_rate)
+        with av.open(self.path, mode="r", metadata_errors="ignore") as container:
+            stream = container.streams.audio[0]
+            skipped = 0
+            # Decode packet by packet so one corrupt packet is dropped rather than
+            # ending the stream; demux() ends with an empty packet that flushes the decoder
+            for packet in container.demux(stream):
+                try:
+                    frames = packet.decode()
+                except av.error.InvalidDataError as exc:
+                    skipped += 1
+                    logger.debug("Skipping invalid audio packet: %s", exc)
+                    continue
+                for frame in frames:
+                    for out in resampler.resample(frame):
+                        yield out.to_ndarray().reshape(-1).astype(np.float32, copy=False)
+            for out in resampler.resample(None):
+                yield out.to_ndarray().reshape(-1).astype(np.float32, copy=False)
+            if skipped:
+                logger.warning("%s: skipped %d corrupt audio packet(s); the transcript may have gaps",
+                               self.path, skipped)
+
+
+def audio_duration_s(path: PathLike) -> Optional[float]:
+    """Header duration of an audio file, or None if it cannot be read."""
+    if not os.path.isfile(path):
+        return None
+    return AudioFileReader(path).duration_s
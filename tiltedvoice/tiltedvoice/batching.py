@@ -0,0 +1,96 @@
+"""Batched decoding of several short clips in one CTranslate2 generate call.
+
+Whisper's encoder always sees a padded 30 s window, so the cost of a batch
+is driven by the decoder: clips of similar length produce similar token
+counts and finish together.  Clips are therefore bucketed by duration before
+being stacked into a batch.
+"""
+
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+from typing import Any, List, Optional, Sequence, Union
+
+import numpy as np
+
+BATCH_MAX_CLIP_S = 30.0
+DEFAULT_BATCH_SIZE = 8
+
+
+@dataclass
+class BatchDecodeOutput:
+    """Decoder output for one clip of a batch."""
+
+    text: str
+    avg_logprob: float = 0.0
+    no_speech_prob: float = 0.0
+
+
+def load_clip(clip: Union[np.ndarray, str], sample_rate: int = 16_000) -> np.ndarray:
+    """Return *clip* as a flat float32 array, decoding file paths with :class:`AudioFileReader`."""
+    if isinstance(clip, np.ndarray):
+        return np.asarray(clip, dtype=np.float32).reshape(-1)
+    from tiltedvoice.audio_file import AudioFileReader
+
+    return AudioFileReader(clip, sample_rate).read()
+
+
+def bucket_by_duration(durations: Sequence[float], batch_size: int) -> List[List[int]]:
+    """Group clip indices into batches of similar duration (shortest first)."""
+    batch_size = max(1, int(batch_size))
+    order = sorted(range(len(durations)), key=lambda i: durations[i])
+    return [order[i:i + batch_size] for i in range(0, len(order), batch_size)]
+
+
+def decode_batch(
+    model: Any,
+    audios: Sequence[np.ndarray],
+    language: str,
+    beam_size: int,
+    no_speech_threshold: float,
+    abort_event: Optional[threading.Event] = None,
+) -> Optional[List[BatchDecodeOutput]]:
+    """Encode and decode up to 30 s clips together with a faster-whisper model.
+
+    Returns None if *abort_event* was set before the generate call started.
+    """
+    from faster_whisper.audio import pad_or_trim
+    from faster_whisper.tokenizer import Tokenizer
+    from faster_whisper.transcribe import get_suppressed_tokens
+
+    features = np.stack([pad_or_trim(model.feature_extractor(audio)[..., :-1]) for audio in audios])
+    tokenizer = Tokenizer(
+        model.hf_tokenizer,
+        model.model.is_multilingual,
+        task="transcribe",
+        language=language,
+    )
+    prompt = model.get_prompt(tokenizer, [], without_timestamps=True)
+    if abort_event is not None and abort_event.is_set():
+        return None
+
+    encoder_output = model.encode(features)
+    results = model.model.generate(
+        encoder_output,
+        [list(prompt) for _ in audios],
+        beam_size=beam_size,
+        max_length=model.max_length,
+        suppress_blank=True,
+        suppress_tokens=get_suppressed_tokens(tokenizer, [-1]),
+        return_scores=True,
+        return_no_speech_prob=True,
+    )
+
+    outputs: List[BatchDecodeOutput] = []
+    for result in results:
+        tokens = result.sequences_ids[0]
+        avg_logprob = result.scores[0] * len(tokens) / (len(tokens) + 1)
+        text = tokenizer.decode(tokens).strip()
+        # Same silence rule faster-whisper applies per segment.
+        if result.no_speech_prob > no_speech_threshold and avg_logprob < -1.0:
+            text = ""
+        outputs.append(
+            BatchDecodeOutput(text=text, avg_logprob=avg_logprob, no_speech_prob=result.no_speech_prob)
+        )
+    return outputs
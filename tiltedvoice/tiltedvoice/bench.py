@@ -0,0 +1,501 @@
+"""Transcription benchmark harness (``tiltedvoice bench``).
+
+Runs a corpus of audio files through :class:`Transcriber` for every
+combination of model, compute type, beam size and VAD setting, and reports
+per configuration:
+
+- real-time factor (total decode time / total audio time; < 1 is faster
+  than real time),
+- time to first segment and p50/p95 per-clip latency,
+- model load time and peak resident memory,
+- word error rate against reference transcripts.
+
+A corpus is a list of audio files and/or directories.  The reference text
+for ``clip.wav`` is read from ``clip.txt`` next to it, if present.  Results
+are written as JSON and can be compared against a previous run used as a
+baseline; regressions beyond the tolerance make the command exit non-zero.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import platform
+import re
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from itertools import product
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from tiltedvoice.batching import load_clip
+from tiltedvoice.models import TranscriberConfig, WhisperModel
+from tiltedvoice.telemetry import JsonlExporter, Telemetry, write_openmetrics
+from tiltedvoice.transcriber import SAMPLE_RATE, Transcriber
+
+logger = logging.getLogger(__name__)
+
+BENCH_VERSION = 1
+AUDIO_EXTENSIONS = (".wav", ".flac", ".mp3", ".ogg", ".m4a")
+DEFAULT_TOLERANCE = 0.10  # relative, for timing and memory metrics
+DEFAULT_WER_TOLERANCE = 0.01  # absolute
+
+# metric -> how a regression is measured against the baseline
+_COMPARED_METRICS = {
+    "rtf": "relative",
+    "latency_p50_ms": "relative",
+    "latency_p95_ms": "relative",
+    "first_segment_p50_ms": "relative",
+    "rss_growth_mb": "relative",
+    "wer": "absolute",
+}
+
+
+@dataclass
+class BenchClip:
+    """One corpus entry, decoded to 16 kHz float32."""
+
+    path: Path
+    audio: np.ndarray
+    reference: Optional[str] = None
+
+    @property
+    def duration_s(self) -> float:
+        return len(self.audio) / float(SAMPLE_RATE)
+
+
+@dataclass
+class BenchConfig:
+    """One point of the benchmark matrix."""
+
+    model: WhisperModel
+    compute_type: str = "auto"
+    beam_size: int = 1
+    vad: bool = True
+    device: str = "auto"
+
+    @property
+    def key(self) -> str:
+        return f"{self.model.value}/{self.compute_type}/beam{self.beam_size}/{'vad' if self.vad else 'novad'}"
+
+    def transcriber_config(self) -> TranscriberConfig:
+        return TranscriberConfig(
+            model=self.model,
+            device=self.device,
+            compute_type=self.compute_type,
+            beam_size=self.beam_size,
+            vad_filter=self.vad,
+        )
+
+
+# ---------------------------------------------------------------------------
+# Corpus
+# ---------------------------------------------------------------------------
+
+def load_corpus(paths: Sequence[os.PathLike]) -> List[BenchClip]:
+    """Collect audio files (directories are searched recursively) with sidecar references."""
+    files: List[Path] = []
+    for raw in paths:
+        path = Path(raw)
+        if path.is_dir():
+            files.extend(sorted(p for p in path.rglob("*") if p.suffix.lower() in AUDIO_EXTENSIONS))
+        elif path.is_file():
+            files.append(path)
+        else:
+            raise FileNotFoundError(f"Corpus path not found: {path}")
+
+    clips = []
+    for path in files:
+        ref_path = path.with_suffix(".txt")
+        reference = ref_path.read_text(encoding="utf-8").strip() if ref_path.is_file() else None
+        clips.append(BenchClip(path=path, audio=load_clip(str(path), SAMPLE_RATE), reference=reference))
+    return clips
+
+
+# ---------------------------------------------------------------------------
+# Metrics
+# ---------------------------------------------------------------------------
+
+_PUNCT_RE = re.compile(r"[^\w\s']")
+
+
+def normalize_words(text: str) -> List[str]:
+    """Lower-case, strip punctuation and split into words for WER scoring."""
+    return _PUNCT_RE.sub(" ", text.lower()).split()
+
+
+def word_errors(reference: str, hypothesis: str) -> Tuple[int, int]:
+    """Return (substitutions + deletions + insertions, reference word count)."""
+    ref = normalize_words(reference)
+    hyp = normalize_words(hypothesis)
+    prev = list(range(len(hyp) + 1))
+    for i, r in enumerate(ref, 1):
+        cur = [i] + [0] * len(hyp)
+        for j, h in enumerate(hyp, 1):
+            cur[j] = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (r != h))
+        prev = cur
+    return prev[-1], len(ref)
+
+
+def percentile(values: Sequence[float], q: float) -> Optional[float]:
+    if not values:
+        return None
+    return float(np.percentile(np.asarray(values, dtype=np.float64), q))
+
+
+def time_to_first_segment_ms(debug_info: Dict[str, Any]) -> Optional[float]:
+    """Time from the start of decoding to the first text segment, across passes."""
+    before = 0.0
+    for p in debug_info.get("passes", []):
+        if p.get("first_segment_ms") is not None:
+            return before + float(p["first_segment_ms"])
+        before += float(p.get("elapsed_ms") or 0.0)
+    return None
+
+
+def current_rss_mb() -> Optional[float]:
+    """Resident set size of this process in MB, or None if it cannot be read."""
+    try:
+        import psutil
+
+        return psutil.Process().memory_info().rss / 1e6
+    except Exception:
+        pass
+    try:
+        with open("/proc/self/statm", encoding="ascii") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1e6
+    except Exception:
+        pass
+    if sys.platform == "win32":
+        try:
+            import ctypes
+            from ctypes import wintypes
+
+            class _Counters(ctypes.Structure):
+                _fields_ = [
+                    ("cb", wintypes.DWORD),
+                    ("PageFaultCount", wintypes.DWORD),
+                    ("PeakWorkingSetSize", ctypes.c_size_t),
+                    ("WorkingSetSize", ctypes.c_size_t),
+                    ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+                    ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                    ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+                    ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                    ("PagefileUsage", ctypes.c_size_t),
+                    ("PeakPagefileUsage", ctypes.c_size_t),
+                ]
+
+            counters = _Counters()
+            counters.cb = ctypes.sizeof(counters)
+            handle = ctypes.windll.kernel32.GetCurrentProcess()
+            if ctypes.windll.psapi.GetProcessMemoryInfo(handle, ctypes.byref(counters), counters.cb):
+                return counters.WorkingSetSize / 1e6
+        except Exception:
+            pass
+    return None
+
+
+class _RssSampler:
+    """Track the peak RSS while a configuration runs (sampled every 50 ms).
+
+    RSS is process-wide and the allocator keeps memory from earlier
+    configurations, so :attr:`growth_mb` (peak over the RSS at the start) is
+    what one configuration costs.
+    """
+
+    def __init__(self, interval_s: float = 0.05):
+        self._interval_s = interval_s
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.start_mb: Optional[float] = None
+        self.peak_mb: Optional[float] = None
+
+    @property
+    def growth_mb(self) -> Optional[float]:
+        if self.start_mb is None or self.peak_mb is None:
+            return None
+        return self.peak_mb - self.start_mb
+
+    def _sample(self) -> None:
+        rss = current_rss_mb()
+        if rss is not None and self.start_mb is None:
+            self.start_mb = rss
+        if rss is not None and (self.peak_mb is None or rss > self.peak_mb):
+            self.peak_mb = rss
+
+    def _run(self) -> None:
+        while not self._stop.wait(self._interval_s):
+            self._sample()
+
+    def __enter__(self) -> "_RssSampler":
+        self._sample()
+        self._thread = threading.Thread(target=self._run, name="tv-bench-rss", daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1)
+        self._sample()
+
+
+# ---------------------------------------------------------------------------
+# Running
+# ---------------------------------------------------------------------------
+
+def run_config(
+    config: BenchConfig,
+    clips: Sequence[BenchClip],
+    warmup: int = 1,
+    repeat: int = 1,
+    transcriber: Optional[Transcriber] = None,
+) -> Dict[str, Any]:
+    """Benchmark one configuration over *clips*; returns its JSON-ready summary."""
+    transcriber = transcriber or Transcriber(config.transcriber_config())
+    clip_rows: List[Dict[str, Any]] = []
+
+    try:
+        with _RssSampler() as rss:
+            t_load = time.perf_counter()
+            transcriber.load_model()
+            load_ms = (time.perf_counter() - t_load) * 1000
+
+            for clip in list(clips)[:max(0, warmup)]:
+                transcriber.transcribe(clip.audio)
+
+            for _ in range(max(1, repeat)):
+                for clip in clips:
+                    t0 = time.perf_counter()
+                    result = transcriber.transcribe(clip.audio)
+                    elapsed_ms = (time.perf_counter() - t0) * 1000
+                    row: Dict[str, Any] = {
+                        "path": str(clip.path),
+                        "duration_s": clip.duration_s,
+                        "latency_ms": elapsed_ms,
+                        "rtf": elapsed_ms / 1000.0 / clip.duration_s if clip.duration_s else None,
+                        "first_segment_ms": time_to_first_segment_ms(result.debug_info),
+                        "text": result.text,
+                    }
+                    if clip.reference is not None:
+                        errors, words = word_errors(clip.reference, result.text)
+                        row.update(errors=errors, ref_words=words)
+                    clip_rows.append(row)
+    finally:
+        # A failed configuration must not leave its model loaded for the next one
+        transcriber.unload()
+
+    audio_s = sum(r["duration_s"] for r in clip_rows)
+    decode_s = sum(r["latency_ms"] for r in clip_rows) / 1000.0
+    latencies = [r["latency_ms"] for r in clip_rows]
+    firsts = [r["first_segment_ms"] for r in clip_rows if r["first_segment_ms"] is not None]
+    scored = [r for r in clip_rows if "errors" in r]
+    ref_words = sum(r["ref_words"] for r in scored)
+    summary = {
+        "key": config.key,
+        "model": config.model.value,
+        "compute_type": config.compute_type,
+        "beam_size": config.beam_size,
+        "vad": config.vad,
+        "device": getattr(transcriber, "_device", None) or config.device,
+        "resolved_compute_type": getattr(transcriber, "_compute_type", None) or config.compute_type,
+        "clips": len(clip_rows),
+        "audio_s": audio_s,
+        "decode_s": decode_s,
+        "rtf": decode_s / audio_s if audio_s else None,
+        "load_ms": load_ms,
+        "latency_p50_ms": percentile(latencies, 50),
+        "latency_p95_ms": percentile(latencies, 95),
+        "first_segment_p50_ms": percentile(firsts, 50),
+        "first_segment_p95_ms": percentile(firsts, 95),
+        "rss_growth_mb": rss.growth_mb,
+        "wer": (sum(r["errors"] for r in scored) / ref_words) if ref_words else None,
+        "clip_results": clip_rows,
+    }
+    logger.info("bench %s: rtf=%s p95=%s wer=%s", config.key, summary["rtf"], summary["latency_p95_ms"], summary["wer"])
+    return summary
+
+
+def run_bench(
+    configs: Sequence[BenchConfig],
+    clips: Sequence[BenchClip],
+    warmup: int = 1,
+    repeat: int = 1,
+) -> Dict[str, Any]:
+    """Run every configuration and return the full report."""
+    from tiltedvoice import __version__
+
+    runs = []
+    for config in configs:
+        try:
+            runs.append(run_config(config, clips, warmup=warmup, repeat=repeat))
+        except Exception as exc:
+            logger.error("bench %s failed: %s", config.key, exc)
+            runs.append({"key": config.key, "error": str(exc)})
+    return {
+        "version": BENCH_VERSION,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "system": {
+            "tiltedvoice": __version__,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "processor": platform.processor(),
+            "cpu_count": os.cpu_count(),
+        },
+        "corpus": {
+            "clips": len(clips),
+            "audio_s": sum(c.duration_s for c in clips),
+            "with_reference": sum(1 for c in clips if c.reference is not None),
+        },
+        "runs": runs,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Baseline comparison
+# ---------------------------------------------------------------------------
+
+def compare_to_baseline(
+    report: Dict[str, Any],
+    baseline: Dict[str, Any],
+    tolerance: float = DEFAULT_TOLERANCE,
+    wer_tolerance: float = DEFAULT_WER_TOLERANCE,
+) -> List[Dict[str, Any]]:
+    """Compare runs with the same key; every metric gets a delta and a regression flag."""
+    base_runs = {r["key"]: r for r in baseline.get("runs", []) if "error" not in r}
+    rows = []
+    for run in report.get("runs", []):
+        base = base_runs.get(run.get("key"))
+        if base is None or "error" in run:
+            continue
+        for metric, mode in _COMPARED_METRICS.items():
+            new, old = run.get(metric), base.get(metric)
+            if new is None or old is None:
+                continue
+            if mode == "relative":
+                delta = (new - old) / old if old else 0.0
+                regressed = delta > tolerance
+            else:
+                delta = new - old
+                regressed = delta > wer_tolerance
+            rows.append({
+                "key": run["key"],
+                "metric": metric,
+                "baseline": old,
+                "current": new,
+                "delta": delta,
+                "mode": mode,
+                "regressed": regressed,
+            })
+    return rows
+
+
+# ---------------------------------------------------------------------------
+# Reporting
+# ---------------------------------------------------------------------------
+
+def _fmt(value: Any, spec: str) -> str:
+    return "-" if value is None else format(value, spec)
+
+
+def format_report(report: Dict[str, Any], comparison: Optional[List[Dict[str, Any]]] = None) -> str:
+    corpus = report["corpus"]
+    lines = [
+        f"Corpus: {corpus['clips']} clips, {corpus['audio_s']:.1f}s audio, "
+        f"{corpus['with_reference']} with reference text",
+        "",
+        f"{'config':<36} {'RTF':>6} {'p50 ms':>8} {'p95 ms':>8} {'TTFS ms':>8} "
+        f"{'load ms':>8} {'+RSS MB':>7} {'WER':>6}",
+    ]
+    for run in report["runs"]:
+        if "error" in run:
+            lines.append(f"{run['key']:<36} error: {run['error']}")
+            continue
+        lines.append(
+            f"{run['key']:<36} {_fmt(run['rtf'], '6.3f')} {_fmt(run['latency_p50_ms'], '8.0f')} "
+            f"{_fmt(run['latency_p95_ms'], '8.0f')} {_fmt(run['first_segment_p50_ms'], '8.0f')} "
+            f"{_fmt(run['load_ms'], '8.0f')} {_fmt(run.get('rss_growth_mb'), '7.0f')} {_fmt(run['wer'], '6.1%')}"
+        )
+    if comparison:
+        lines += ["", "Against baseline:"]
+        for row in comparison:
+            delta = f"{row['delta']:+.1%}" if row["mode"] == "relative" else f"{row['delta']:+.3f}"
+            flag = "  REGRESSION" if row["regressed"] else ""
+            lines.append(f"  {row['key']:<36} {row['metric']:<22} {delta:>8}{flag}")
+    return "\n".join(lines)
+
+
+# ---------------------------------------------------------------------------
+# Command line
+# ---------------------------------------------------------------------------
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("corpus", nargs="+", help="Audio files or directories (clip.txt holds the reference)")
+    parser.add_argument("--model", action="append", choices=[m.value for m in WhisperModel],
+                        help="Model to benchmark (repeatable, default base.en)")
+    parser.add_argument("--compute-type", action="append", help="CTranslate2 compute type (repeatable, default auto)")
+    parser.add_argument("--beam-size", action="append", type=int, help="Beam size (repeatable, default 1)")
+    parser.add_argument("--vad", action="append", choices=["on", "off"], help="VAD filter (repeatable, default on)")
+    parser.add_argument("--device", default="auto", help="cpu, cuda or auto")
+    parser.add_argument("--warmup", type=int, default=1, help="Untimed clips per configuration")
+    parser.add_argument("--repeat", type=int, default=1, help="Timed passes over the corpus")
+    parser.add_argument("--output", type=Path, help="Write the JSON report here")
+    parser.add_argument("--baseline", type=Path, help="Compare against a previous JSON report")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="Relative slowdown/memory growth counted as a regression")
+    parser.add_argument("--wer-tolerance", type=float, default=DEFAULT_WER_TOLERANCE,
+                        help="Absolute WER increase counted as a regression")
+    parser.add_argument("--trace", type=Path, help="Append timing spans to this JSONL file")
+    parser.add_argument("--metrics", type=Path, help="Write counters and histograms here (OpenMetrics text)")
+    parser.set_defaults(func=run_cli)
+
+
+def build_configs(args: argparse.Namespace) -> List[BenchConfig]:
+    models = [WhisperModel(m) for m in (args.model or [WhisperModel.BASE_EN.value])]
+    return [
+        BenchConfig(model=model, compute_type=compute, beam_size=beam, vad=(vad == "on"), device=args.device)
+        for model, compute, beam, vad in product(
+            models, args.compute_type or ["auto"], args.beam_size or [1], args.vad or ["on"]
+        )
+    ]
+
+
+def run_cli(args: argparse.Namespace) -> int:
+    clips = load_corpus(args.corpus)
+    if not clips:
+        print("No audio files found in corpus", file=sys.stderr)
+        return 2
+    tel = Telemetry.shared()
+    exporter = JsonlExporter(args.trace) if args.trace else None
+    if exporter is not None:
+        tel.add_exporter(exporter)
+    try:
+        report = run_bench(build_configs(args), clips, warmup=args.warmup, repeat=args.repeat)
+    finally:
+        if exporter is not None:
+            tel.remove_exporter(exporter)
+    if args.metrics:
+        write_openmetrics(args.metrics, tel)
+
+    comparison = None
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        comparison = compare_to_baseline(report, baseline, args.tolerance, args.wer_tolerance)
+        report["baseline"] = {"path": str(args.baseline), "comparison": comparison}
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(format_report(report, comparison))
+
+    if any("error" in run for run in report["runs"]):
+        return 1
+    if comparison and any(row["regressed"] for row in comparison):
+        return 1
+    return 0
@@ -0,0 +1,41 @@
+"""Command-line entry point: ``tiltedvoice <command>``.
+
+The desktop app is launched with ``tilted-voice``; this entry point hosts
+the headless tools.
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+from typing import Optional, Sequence
+
+from tiltedvoice import __version__
+
+
+def build_parser() -> argparse.ArgumentParser:
+    from tiltedvoice import bench, longform, serve
+
+    parser = argparse.ArgumentParser(prog="tiltedvoice", description="TiltedVoice command-line tools")
+    parser.add_argument("--version", action="version", version=f"%(prog)s {__version__}")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Log progress to stderr")
+    commands = parser.add_subparsers(dest="command", required=True)
+    bench.add_arguments(
+        commands.add_parser("bench", help="Benchmark models and settings on a corpus of audio files")
+    )
+    longform.add_arguments(
+        commands.add_parser("transcribe", help="Transcribe a long recording in resumable chunks")
+    )
+    serve.add_arguments(
+        commands.add_parser("serve", help="Run a headless daemon with a local HTTP API and one warm model")
+    )
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(
+        level=logging.INFO if args.verbose else logging.WARNING,
+        format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
+    )
+    return args.func(args)
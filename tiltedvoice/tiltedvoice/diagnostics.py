@@ -0,0 +1,95 @@
+"""Bounded, thread-safe diagnostics log.
+
+The desktop app used to format every diagnostics line on the Tk thread,
+scheduling one ``after(0, ...)`` callback and one full text-box rewrite per
+event, and its line buffer had no fixed bound.  :class:`DiagnosticsLog` is
+written to directly from any thread instead:
+
+* :meth:`DiagnosticsLog.record` appends a structured :class:`DiagEvent` to a
+  ``deque`` with a fixed ``maxlen``; appends are atomic in CPython, so
+  recording takes no lock and never waits on the UI;
+* readers poll :attr:`DiagnosticsLog.version` and re-render only when it has
+  moved (the app does this every ``REFRESH_MS``), so a burst of events costs
+  one UI update;
+* :meth:`DiagnosticsLog.dump` writes the whole ring to a file on demand.
+"""
+
+from __future__ import annotations
+
+import itertools
+import os
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Union
+
+DEFAULT_CAPACITY = 1000
+# How often the app redraws the diagnostics box, at most
+REFRESH_MS = 100
+
+
+def _format_value(value: Any) -> str:
+    if isinstance(value, float):
+        return f"{value:.5g}"
+    if isinstance(value, str) and (not value or " " in value):
+        return repr(value)
+    return str(value)
+
+
+@dataclass(frozen=True)
+class DiagEvent:
+    """One diagnostics event: a name plus key/value fields."""
+
+    name: str
+    fields: Dict[str, Any] = field(default_factory=dict)
+    created: float = field(default_factory=lambda: time.time())
+
+    def format(self) -> str:
+        stamp = datetime.fromtimestamp(self.created).strftime("%H:%M:%S")
+        parts = [self.name] + [f"{k}={_format_value(v)}" for k, v in self.fields.items()]
+        return f"[{stamp}] " + " ".join(parts)
+
+
+class DiagnosticsLog:
+    """Ring buffer of the last *capacity* diagnostics events."""
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        self.capacity = capacity
+        self._ring: "deque[DiagEvent]" = deque(maxlen=capacity)
+        self._counter = itertools.count(1)
+        # Changes on every record; readers compare it to skip redundant redraws
+        self.version = 0
+
+    def record(self, event: str, **fields: Any) -> None:
+        """Append an event; safe to call from any thread."""
+        self._ring.append(DiagEvent(event, fields))
+        self.version = next(self._counter)
+
+    def events(self) -> List[DiagEvent]:
+        """The buffered events, oldest first."""
+        return list(self._ring)
+
+    def lines(self, last: int = 0) -> List[str]:
+        """Formatted events, oldest first; only the *last* ones if given."""
+        events = self.events()
+        if last:
+            events = events[-last:]
+        return [e.format() for e in events]
+
+    def text(self) -> str:
+        return "\n".join(self.lines())
+
+    def clear(self) -> None:
+        self._ring.clear()
+        self.version = next(self._counter)
+
+    def dump(self, path: Union[str, os.PathLike]) -> Path:
+        """Write all buffered events to *path* as text; returns the path."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        tmp.write_text(self.text() + "\n", encoding="utf-8")
+        os.replace(tmp, path)
+        return path
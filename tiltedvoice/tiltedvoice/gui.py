@@ -7,7 +7,6 @@ from __future__ import annotations
 
 import ctypes
 import ctypes.wintypes as wintypes
-import json
 import logging
 import os
 import sys
@@ -20,15 +19,25 @@ from typing import Optional
 import customtkinter as ctk
 import numpy as np
 
+from tiltedvoice import paths
 from tiltedvoice.audio import MicrophoneManager, VoiceRecorder
+from tiltedvoice.diagnostics import REFRESH_MS, DiagnosticsLog
+from tiltedvoice.history import HistoryEntry, HistoryStore, PagedRows
+from tiltedvoice.model_pool import ModelPool
 from tiltedvoice.models import (
     AppSettings,
     AudioConfig,
     RecordingMode,
+    VADMode,
     TranscriberConfig,
     TranscriptionResult,
     WhisperModel,
 )
+from tiltedvoice.refine import DraftRefiner, text_edits, wants_draft
+from tiltedvoice.result_cache import ResultCache
+from tiltedvoice.scheduler import ModelScheduler
+from tiltedvoice.settings_store import SettingsStore
+from tiltedvoice.streaming import StreamingTranscriber
 from tiltedvoice.transcriber import Transcriber
 
 logger = logging.getLogger(__name__)
@@ -126,6 +135,15 @@ THEMES = {
 DEFAULT_THEME = "Midnight"
 
 SIDEBAR_W = 240
+# History entries fetched from the store at a time
+HISTORY_PAGE_SIZE = 50
+# Fixed height of a history row (the list is virtualized) and its text preview
+HISTORY_ROW_H = 120
+HISTORY_ROW_CHARS = 280
+HISTORY_SEARCH_DEBOUNCE_MS = 200
+# Diagnostics box: redraw period and number of lines shown (the log keeps more)
+DIAG_REFRESH_MS = REFRESH_MS
+DIAG_VIEW_LINES = 120
 
 NAV_ITEMS = [
     ("\u2302", "Overview"),
@@ -135,78 +153,16 @@ NAV_ITEMS = [
 ]
 
 
-def _settings_path() -> Path:
-    return Path(os.environ.get("APPDATA", ".")) / "TiltedVoice" / "settings.json"
+def _probe_cache_path() -> Path:
+    return paths.probe_cache_path()
 
 
-def _load_settings_data() -> dict:
-    """Load raw settings dict from disk."""
-    try:
-        return json.loads(_settings_path().read_text(encoding="utf-8"))
-    except Exception:
-        return {}
+def _result_cache_dir() -> Path:
+    return paths.result_cache_dir()
 
 
-def _save_settings_data(data: dict):
-    """Write settings dict to disk."""
-    p = _settings_path()
-    try:
-        p.parent.mkdir(parents=True, exist_ok=True)
-        p.write_text(json.dumps(data, indent=2), encoding="utf-8")
-    except Exception:
-        pass
-
-
-def _load_theme_pref() -> str:
-    name = _load_settings_data().get("theme", DEFAULT_THEME)
-    return name if name in THEMES else DEFAULT_THEME
-
-
-def _save_theme_pref(name: str):
-    data = _load_settings_data()
-    data["theme"] = name
-    _save_settings_data(data)
-
-
-def _load_app_settings() -> AppSettings:
-    """Load full AppSettings from disk, merging with defaults."""
-    data = _load_settings_data()
-    return AppSettings.from_dict(data)
-
-
-def _save_app_settings(settings: AppSettings, theme: str = ""):
-    """Save full AppSettings + theme to disk."""
-    data = settings.to_dict()
-    if theme:
-        data["theme"] = theme
-    else:
-        # Preserve existing theme
-        existing = _load_settings_data()
-        data["theme"] = existing.get("theme", DEFAULT_THEME)
-    _save_settings_data(data)
-
-
-def _history_path() -> Path:
-    return Path(os.environ.get("APPDATA", ".")) / "TiltedVoice" / "history.json"
-
-
-def _load_history() -> list:
-    """Load transcription history from disk."""
-    try:
-        return json.loads(_history_path().read_text(encoding="utf-8"))
-    except Exception:
-        return []
-
-
-def _save_history(history: list):
-    """Save transcription history to disk (capped at 500 entries)."""
-    p = _history_path()
-    try:
-        p.parent.mkdir(parents=True, exist_ok=True)
-        capped = history[-500:] if len(history) > 500 else history
-        p.write_text(json.dumps(capped, indent=2, ensure_ascii=False), encoding="utf-8")
-    except Exception:
-        pass
+def _model_speed_path() -> Path:
+    return paths.model_speed_path()
 
 
 # ---------------------------------------------------------------------------
@@ -289,6 +245,151 @@ class FloatingPTTButton(ctk.CTkToplevel):
             self._btn.configure(text="\U0001f3a4", fg_color=T("primary"))
 
 
+# =========================================================================
+# Virtualized history list
+# =========================================================================
+
+class _HistoryRow(ctk.CTkFrame):
+    """One recyclable history card; :meth:`show` rebinds it to another entry."""
+
+    def __init__(self, master, app: "TiltedVoiceApp"):
+        super().__init__(master, fg_color=T("card"), corner_radius=16, border_width=1, border_color=T("border"))
+        self.index: Optional[int] = None
+        self._text = ""
+        hdr = ctk.CTkFrame(self, fg_color="transparent")
+        hdr.pack(fill="x", padx=16, pady=(12, 4))
+        self._title = ctk.CTkLabel(hdr, text="", font=ctk.CTkFont(size=11), text_color=T("text_muted"))
+        self._title.pack(side="left")
+        ctk.CTkButton(
+            hdr, text="Copy", width=48, height=22,
+            fg_color=T("surface"), hover_color=T("card_hover"),
+            text_color=T("text_muted"), font=ctk.CTkFont(size=10),
+            command=lambda: app._copy_to_clipboard(self._text),
+        ).pack(side="right", padx=(6, 0))
+        self._ms = ctk.CTkLabel(hdr, text="", font=ctk.CTkFont(size=11), text_color=T("primary"))
+        self._ms.pack(side="right")
+        self._body = ctk.CTkLabel(
+            self, text="", font=ctk.CTkFont(size=13), text_color=T("text"),
+            anchor="nw", justify="left", wraplength=600,
+        )
+        self._body.pack(fill="both", expand=True, padx=16, pady=(2, 12))
+
+    def show(self, index: int, entry: HistoryEntry, number: Optional[int]):
+        self.index = index
+        self._text = entry.text
+        if number is not None:
+            title = f"#{number}  {entry.time}"
+        else:
+            title = f"{datetime.fromtimestamp(entry.created):%Y-%m-%d}  {entry.time}"
+        self._title.configure(text=title)
+        self._ms.configure(text=f"{entry.ms}ms")
+        body = entry.text
+        if len(body) > HISTORY_ROW_CHARS:
+            body = body[:HISTORY_ROW_CHARS].rstrip() + "…"
+        self._body.configure(text=body)
+
+    def set_wrap(self, width: int):
+        self._body.configure(wraplength=max(100, width - 40))
+
+
+class VirtualHistoryList(ctk.CTkFrame):
+    """Scrollable history list that only creates widgets for visible rows.
+
+    Rows have a fixed height and are placed by hand.  Scrolling moves a
+    window over a :class:`PagedRows` source and rebinds the same handful of
+    row widgets to new entries, so building the page and jumping anywhere in
+    it cost the same for ten entries or a hundred thousand.
+    """
+
+    def __init__(self, master, app: "TiltedVoiceApp", row_height: int = HISTORY_ROW_H):
+        super().__init__(master, fg_color="transparent")
+        self._app = app
+        self._row_h = row_height
+        self._rows: list[_HistoryRow] = []
+        self._source: Optional[PagedRows] = None
+        self._numbered = True
+        self._top = 0.0  # scroll offset in pixels
+
+        self._viewport = ctk.CTkFrame(self, fg_color="transparent")
+        self._viewport.pack(side="left", fill="both", expand=True)
+        self._scrollbar = ctk.CTkScrollbar(
+            self, command=self._on_scrollbar,
+            button_color=T("border"), button_hover_color=T("text_muted"),
+        )
+        self._scrollbar.pack(side="right", fill="y")
+        self._viewport.bind("<Configure>", lambda e: self._layout())
+        self._bind_wheel(self._viewport)
+
+    def set_source(self, source: PagedRows, numbered: bool = True):
+        self._source = source
+        self._numbered = numbered
+        self._top = 0.0
+        for row in self._rows:
+            row.index = None
+        self._render()
+
+    def _content_h(self) -> int:
+        return len(self._source) * self._row_h if self._source else 0
+
+    def _view_h(self) -> int:
+        return max(1, self._viewport.winfo_height())
+
+    def _layout(self):
+        # Enough rows to cover the viewport plus one partly scrolled in
+        needed = self._view_h() // self._row_h + 2
+        while len(self._rows) < needed:
+            row = _HistoryRow(self._viewport, self._app)
+            self._bind_wheel(row)
+            self._rows.append(row)
+        width = self._viewport.winfo_width()
+        for row in self._rows:
+            row.set_wrap(width)
+        self._scroll_to(self._top)
+
+    def _scroll_to(self, top: float):
+        limit = max(0, self._content_h() - self._view_h())
+        self._top = max(0.0, min(float(top), float(limit)))
+        self._render()
+
+    def _render(self):
+        if self._source is None:
+            return
+        total, view_h = len(self._source), self._view_h()
+        first = int(self._top // self._row_h)
+        shift = self._top - first * self._row_h
+        for i, row in enumerate(self._rows):
+            index = first + i
+            y = i * self._row_h - shift
+            entry = self._source.get(index) if index < total and y < view_h else None
+            if entry is None:
+                row.place_forget()
+                row.index = None
+                continue
+            if row.index != index:
+                row.show(index, entry, total - index if self._numbered else None)
+            row.place(x=0, y=int(y), relwidth=1.0, height=self._row_h - 8)
+        content = self._content_h()
+        if content <= view_h:
+            self._scrollbar.set(0.0, 1.0)
+        else:
+            self._scrollbar.set(self._top / content, (self._top + view_h) / content)
+
+    def _on_scrollbar(self, action, amount, unit=None):
+        if action == "moveto":
+            self._scroll_to(float(amount) * self._content_h())
+        elif action == "scroll":
+            step = self._view_h() if unit == "pages" else self._row_h // 2
+            self._scroll_to(self._top + int(amount) * step)
+
+    def _bind_wheel(self, widget):
+        step = self._row_h // 2
+        widget.bind("<MouseWheel>", lambda e: self._scroll_to(self._top - e.delta / 120 * step), add="+")
+        widget.bind("<Button-4>", lambda e: self._scroll_to(self._top - step), add="+")
+        widget.bind("<Button-5>", lambda e: self._scroll_to(self._top + step), add="+")
+        for child in widget.winfo_children():
+            self._bind_wheel(child)
+
+
 # =========================================================================
 # Main Application
 # =========================================================================
@@ -299,26 +400,39 @@ class TiltedVoiceApp(ctk.CTk):
         super().__init__()
 
         global _current_theme
-        self._theme_name = _load_theme_pref()
+        # Kept in memory; saved in the background once changes settle
+        self._settings_store = SettingsStore(paths.settings_path())
+        theme = self._settings_store.get("theme", DEFAULT_THEME)
+        self._theme_name = theme if theme in THEMES else DEFAULT_THEME
         _current_theme = THEMES[self._theme_name]
 
-        self.settings = _load_app_settings()
+        self.settings = AppSettings.from_dict(self._settings_store.snapshot())
         self._transcriber: Optional[Transcriber] = None
         self._recorder: Optional[VoiceRecorder] = None
-        self._mic_manager = MicrophoneManager()
+        self._stream: Optional[StreamingTranscriber] = None
+        self._auto_backlog: list[np.ndarray] = []
+        self._mic_manager = MicrophoneManager(probe_cache_path=_probe_cache_path())
+        self._result_cache = ResultCache(_result_cache_dir())
+        self._model_scheduler = ModelScheduler(path=_model_speed_path())
         self._recording = False
         self._transcribing = False
         self._transcription_count = 0
+        self._refiner: Optional[DraftRefiner] = None
+        self._draft_text: Optional[str] = None  # draft shown in the output box, awaiting refinement
         self._cancel_event: Optional[threading.Event] = None
         self._timer_id: Optional[str] = None
         self._timer_start: Optional[float] = None
         self._ptt_button: Optional[FloatingPTTButton] = None
         self._tray_icon = None
         self._hotkeys_registered = False
-        self._diag_lines: list[str] = []
+        # Recorded from any thread; the Diagnostics box redraws on a timer
+        self._diag = DiagnosticsLog()
+        self._diag_shown = -1
+        self._diag_text = None  # built with the Settings page
         self._diag_peak: float = 0.0
         self._diag_rms_last: float = 0.0
-        self._history: list[dict] = _load_history()
+        self._history = HistoryStore(paths.history_path(), legacy_json=paths.legacy_history_path())
+        self._history_query = ""
         self._current_page = "Overview"
         self._nav_buttons: dict[str, ctk.CTkButton] = {}
 
@@ -353,6 +467,8 @@ class TiltedVoiceApp(ctk.CTk):
         self.after(400, self._start_tray)
         self.after(500, self._register_hotkeys)
         self.after(600, self._create_floating_ptt)
+        self.after(800, self._preload_model)
+        self.after(DIAG_REFRESH_MS, self._refresh_diag)
         if not self.settings.onboarding_complete:
             self.after(700, self._show_onboarding)
         self.protocol("WM_DELETE_WINDOW", self._on_close)
@@ -370,8 +486,8 @@ class TiltedVoiceApp(ctk.CTk):
     # ==================================================================
 
     def _persist_settings(self):
-        """Save all current settings to disk (debounce-safe to call frequently)."""
-        _save_app_settings(self.settings, theme=self._theme_name)
+        """Queue the current settings for saving; cheap enough to call on every slider tick."""
+        self._settings_store.update({**self.settings.to_dict(), "theme": self._theme_name})
 
     def _apply_theme(self, name: str):
         global _current_theme
@@ -379,7 +495,6 @@ class TiltedVoiceApp(ctk.CTk):
             return
         self._theme_name = name
         _current_theme = THEMES[name]
-        _save_theme_pref(name)
         self._persist_settings()
         is_light = name == "Arctic"
         ctk.set_appearance_mode("light" if is_light else "dark")
@@ -708,6 +823,8 @@ class TiltedVoiceApp(ctk.CTk):
             border_width=1, border_color=T("border_light"),
         )
         self._output.pack(fill="x", padx=14, pady=(0, 14))
+        self._output.tag_config("draft", foreground=T("text_dim"))
+        self._output.tag_config("refined", foreground=T("primary"))
 
         # Action bar
         action_row = ctk.CTkFrame(page, fg_color="transparent")
@@ -754,11 +871,9 @@ class TiltedVoiceApp(ctk.CTk):
             corner_radius=8, height=70, wrap="none",
         )
         self._diag_text.pack(fill="x", padx=14, pady=(2, 12))
-        if self._diag_lines:
-            self._diag_text.insert("end", "\n".join(self._diag_lines) + "\n")
-        else:
-            self._diag_text.insert("end", "Diagnostics ready.\n")
+        self._diag_text.insert("end", "Diagnostics ready.\n")
         self._diag_text.configure(state="disabled")
+        self._diag_shown = -1
 
         self._repopulate_devices_if_needed()
 
@@ -766,10 +881,9 @@ class TiltedVoiceApp(ctk.CTk):
     # History page
     # ------------------------------------------------------------------
     def _build_history_page(self):
-        page = ctk.CTkScrollableFrame(self._content, fg_color=T("bg"), corner_radius=0,
-                                       scrollbar_button_color=T("border"),
-                                       scrollbar_button_hover_color=T("text_muted"))
+        page = ctk.CTkFrame(self._content, fg_color=T("bg"), corner_radius=0)
         page.pack(fill="both", expand=True, padx=28, pady=20)
+        total = self._history.count()
 
         # Header row
         hdr_row = ctk.CTkFrame(page, fg_color="transparent")
@@ -779,7 +893,7 @@ class TiltedVoiceApp(ctk.CTk):
             font=ctk.CTkFont(size=32, weight="bold"), text_color=T("text"), anchor="w",
         ).pack(side="left")
 
-        if self._history:
+        if total:
             # Export + Clear buttons
             btn_frame = ctk.CTkFrame(hdr_row, fg_color="transparent")
             btn_frame.pack(side="right")
@@ -798,12 +912,13 @@ class TiltedVoiceApp(ctk.CTk):
                 command=self._clear_history,
             ).pack(side="left")
 
-        ctk.CTkLabel(
-            page, text=f"{len(self._history)} transcription(s) saved.",
+        count_label = ctk.CTkLabel(
+            page, text=f"{total} transcription(s) saved.",
             font=ctk.CTkFont(size=13), text_color=T("text_dim"), anchor="w",
-        ).pack(fill="x", pady=(0, 18))
+        )
+        count_label.pack(fill="x", pady=(0, 18))
 
-        if not self._history:
+        if not total:
             empty = self._make_card(page)
             empty.pack(fill="x", pady=20)
             ctk.CTkLabel(
@@ -816,36 +931,39 @@ class TiltedVoiceApp(ctk.CTk):
             ).pack(pady=(0, 28))
             return
 
-        for i, entry in enumerate(reversed(self._history)):
-            card = self._make_card(page)
-            card.pack(fill="x", pady=4)
-            hdr = ctk.CTkFrame(card, fg_color="transparent")
-            hdr.pack(fill="x", padx=16, pady=(12, 4))
-            ctk.CTkLabel(
-                hdr, text=f"#{len(self._history) - i}  {entry['time']}",
-                font=ctk.CTkFont(size=11), text_color=T("text_muted"),
-            ).pack(side="left")
-            # Copy button per entry
-            entry_text = entry["text"]
-            ctk.CTkButton(
-                hdr, text="Copy", width=48, height=22,
-                fg_color=T("surface"), hover_color=T("card_hover"),
-                text_color=T("text_muted"), font=ctk.CTkFont(size=10),
-                command=lambda t=entry_text: self._copy_to_clipboard(t),
-            ).pack(side="right", padx=(6, 0))
-            ctk.CTkLabel(
-                hdr, text=f"{entry['ms']}ms",
-                font=ctk.CTkFont(size=11), text_color=T("primary"),
-            ).pack(side="right")
-            # Use CTkTextbox instead of label for proper wrapping
-            tb = ctk.CTkTextbox(
-                card, fg_color="transparent", text_color=T("text"),
-                font=ctk.CTkFont(size=13), height=60, wrap="word",
-                corner_radius=0, border_width=0, activate_scrollbars=False,
-            )
-            tb.pack(fill="x", padx=16, pady=(2, 14))
-            tb.insert("1.0", entry["text"])
-            tb.configure(state="disabled")
+        query_var = ctk.StringVar(value=self._history_query)
+        ctk.CTkEntry(
+            page, textvariable=query_var, height=34,
+            placeholder_text='Search history \u2014 words, prefixes, "exact phrases"',
+            fg_color=T("surface"), border_color=T("border"), text_color=T("text"),
+            font=ctk.CTkFont(size=13), corner_radius=8,
+        ).pack(fill="x", pady=(0, 12))
+
+        # Only the rows on screen exist as widgets; entries are fetched per page.
+        history_list = VirtualHistoryList(page, self)
+        history_list.pack(fill="both", expand=True)
+        pending = {"after_id": None}
+
+        def _run_search():
+            pending["after_id"] = None
+            self._history_query = query = query_var.get().strip()
+            if query:
+                matches = self._history.search_count(query)
+                count_label.configure(text=f"{matches} of {total} transcription(s) match.")
+                source = PagedRows(lambda o, n: self._history.search(query, o, n), matches, HISTORY_PAGE_SIZE)
+            else:
+                count_label.configure(text=f"{total} transcription(s) saved.")
+                source = PagedRows(self._history.page, total, HISTORY_PAGE_SIZE)
+            history_list.set_source(source, numbered=not query)
+
+        def _on_query_change(*_):
+            # Search once typing pauses
+            if pending["after_id"] is not None:
+                self.after_cancel(pending["after_id"])
+            pending["after_id"] = self.after(HISTORY_SEARCH_DEBOUNCE_MS, _run_search)
+
+        query_var.trace_add("write", _on_query_change)
+        _run_search()
 
     def _export_history_txt(self):
         """Export history to a .txt file via save dialog."""
@@ -859,19 +977,18 @@ class TiltedVoiceApp(ctk.CTk):
             )
             if not path:
                 return
-            lines = []
-            for i, entry in enumerate(self._history, 1):
-                lines.append(f"#{i}  {entry['time']}  ({entry['ms']}ms)")
-                lines.append(entry["text"])
-                lines.append("")
-            Path(path).write_text("\n".join(lines), encoding="utf-8")
-            self._set_status(f"Exported {len(self._history)} entries", T("success"))
+            exported = 0
+            with open(path, "w", encoding="utf-8") as f:
+                for exported, entry in enumerate(self._history.iter_entries(), 1):
+                    f.write(f"#{exported}  {entry.time}  ({entry.ms}ms)\n{entry.text}\n\n")
+            self._set_status(f"Exported {exported} entries", T("success"))
         except Exception as exc:
             self._set_status(f"Export failed: {exc}", T("error"))
 
     def _clear_history(self):
         """Clear all history (with confirmation)."""
-        if not self._history:
+        total = self._history.count()
+        if not total:
             return
         # Simple confirmation via a top-level dialog
         dialog = ctk.CTkToplevel(self)
@@ -882,7 +999,7 @@ class TiltedVoiceApp(ctk.CTk):
         dialog.resizable(False, False)
         dialog.configure(fg_color=T("bg"))
         ctk.CTkLabel(
-            dialog, text=f"Delete all {len(self._history)} transcriptions?",
+            dialog, text=f"Delete all {total} transcriptions?",
             font=ctk.CTkFont(size=14, weight="bold"), text_color=T("text"),
         ).pack(pady=(20, 10))
         btn_row = ctk.CTkFrame(dialog, fg_color="transparent")
@@ -894,7 +1011,6 @@ class TiltedVoiceApp(ctk.CTk):
         ).pack(side="left", padx=8)
         def _confirm():
             self._history.clear()
-            _save_history(self._history)
             dialog.destroy()
             self._navigate("History")
             self._set_status("History cleared", T("success"))
@@ -1053,6 +1169,32 @@ class TiltedVoiceApp(ctk.CTk):
 
         _toggle_row(gen, "Auto-copy transcription to clipboard", self._auto_copy_var, _on_auto_copy)
         _toggle_row(gen, "Auto-paste into active window", self._auto_paste_var, _on_auto_paste)
+
+        self._speculative_var = ctk.BooleanVar(value=self.settings.speculative_decoding)
+
+        def _on_speculative():
+            self.settings.speculative_decoding = self._speculative_var.get()
+            self._persist_settings()
+            self._reset_transcriber()
+
+        _toggle_row(gen, "Parallel fallback decoding (uses more CPU)", self._speculative_var, _on_speculative)
+
+        self._adaptive_var = ctk.BooleanVar(value=self.settings.adaptive_model)
+
+        def _on_adaptive():
+            self.settings.adaptive_model = self._adaptive_var.get()
+            self._persist_settings()
+            self._reset_transcriber()
+
+        _toggle_row(gen, "Use a faster model when this PC is too slow", self._adaptive_var, _on_adaptive)
+
+        self._draft_var = ctk.BooleanVar(value=self.settings.draft_refine)
+
+        def _on_draft_refine():
+            self.settings.draft_refine = self._draft_var.get()
+            self._persist_settings()
+
+        _toggle_row(gen, "Quick tiny.en draft for small/medium models on CPU", self._draft_var, _on_draft_refine)
         ctk.CTkFrame(gen, fg_color="transparent", height=8).pack()
 
         # -- Audio --
@@ -1080,6 +1222,38 @@ class TiltedVoiceApp(ctk.CTk):
                       fg_color=T("surface"), border_color=T("border"),
                       text_color=T("text")).pack(side="right")
 
+        row_pre = ctk.CTkFrame(aud, fg_color="transparent")
+        row_pre.pack(fill="x", padx=18, pady=5)
+        ctk.CTkLabel(row_pre, text="Pre-roll (ms)",
+                      font=ctk.CTkFont(size=13), text_color=T("text"), anchor="w").pack(side="left")
+        self._pre_roll_var = ctk.StringVar(value=str(self.settings.pre_roll_ms))
+        ctk.CTkEntry(row_pre, textvariable=self._pre_roll_var, width=90,
+                      fg_color=T("surface"), border_color=T("border"),
+                      text_color=T("text")).pack(side="right")
+
+        row3 = ctk.CTkFrame(aud, fg_color="transparent")
+        row3.pack(fill="x", padx=18, pady=5)
+        ctk.CTkLabel(row3, text="Speech detector (auto mode)",
+                      font=ctk.CTkFont(size=13), text_color=T("text"), anchor="w").pack(side="left")
+        self._vad_var = ctk.StringVar(value=self.settings.vad_mode.value)
+
+        def _on_vad_change(value: str):
+            try:
+                self.settings.vad_mode = VADMode(value)
+            except ValueError:
+                return
+            self._persist_settings()
+
+        ctk.CTkOptionMenu(
+            row3, variable=self._vad_var, values=[m.value for m in VADMode],
+            fg_color=T("surface"), button_color=T("surface"),
+            button_hover_color=T("card_hover"),
+            font=ctk.CTkFont(size=12), width=120, command=_on_vad_change,
+            dropdown_fg_color=T("card"), dropdown_hover_color=T("nav_active"),
+            dropdown_text_color=T("text"),
+            text_color=T("text"),
+        ).pack(side="right")
+
         # Wire audio settings to persist on change
         def _on_energy_change(*_args):
             try:
@@ -1099,8 +1273,18 @@ class TiltedVoiceApp(ctk.CTk):
             except (ValueError, TypeError):
                 pass
 
+        def _on_pre_roll_change(*_args):
+            try:
+                val = int(self._pre_roll_var.get())
+                if 0 <= val <= 2000:
+                    self.settings.pre_roll_ms = val
+                    self._persist_settings()
+            except (ValueError, TypeError):
+                pass
+
         self._energy_var.trace_add("write", _on_energy_change)
         self._silence_var.trace_add("write", _on_silence_change)
+        self._pre_roll_var.trace_add("write", _on_pre_roll_change)
 
         ctk.CTkFrame(aud, fg_color="transparent", height=8).pack()
 
@@ -1404,11 +1588,44 @@ class TiltedVoiceApp(ctk.CTk):
             self.settings.model = WhisperModel(value)
         except ValueError:
             return
-        if self._transcriber and self._transcriber.is_loaded:
-            self._transcriber.unload()
-            self._transcriber = None
+        if self._transcriber and self._transcriber._config.model != self.settings.model:
+            self._reset_transcriber()
         self._set_status(f"Model \u2192 {value}", T("primary"))
         self._persist_settings()
+        self._preload_model()
+
+    def _ensure_transcriber(self) -> Transcriber:
+        if self._transcriber is None:
+            self._transcriber = Transcriber(
+                config=TranscriberConfig(
+                    model=self.settings.model,
+                    speculative_fallback=self.settings.speculative_decoding,
+                ),
+                pool=ModelPool.shared(),
+                cache=self._result_cache,
+                scheduler=self._model_scheduler if self.settings.adaptive_model else None,
+            )
+        return self._transcriber
+
+    def _ensure_refiner(self) -> DraftRefiner:
+        if self._refiner is None:
+            self._refiner = DraftRefiner(self._ensure_transcriber())
+        return self._refiner
+
+    def _reset_transcriber(self):
+        """Drop the current Transcriber; its model goes back to the shared pool and stays warm."""
+        if self._refiner:
+            self._refiner.unload()
+            self._refiner = None
+        if self._transcriber:
+            self._transcriber.unload()
+            self._transcriber = None
+
+    def _preload_model(self):
+        """Warm the selected model in the background so the first dictation skips loading."""
+        if self._transcribing:
+            return
+        self._ensure_transcriber().preload()
 
     def _on_mode_change(self, value):
         try:
@@ -1432,6 +1649,10 @@ class TiltedVoiceApp(ctk.CTk):
         if self._transcribing:
             if self._cancel_event:
                 self._cancel_event.set()
+            if self._stream:
+                self._stream.cancel()
+            # Cancel drops queued auto-listen clips too, rather than decoding them next
+            self._auto_backlog = []
             self._transcription_cleanup()
             self._set_status("Cancelled", T("text_dim"))
             return
@@ -1449,14 +1670,22 @@ class TiltedVoiceApp(ctk.CTk):
         selected_mic = self._mic_var.get()
         self._diag_peak = 0.0
         self._diag_rms_last = 0.0
-        self._append_diag(f"record_start mode={mode.value} mic='{selected_mic}' device_index={device_idx}")
+        self._diag.record("record_start", mode=mode.value, mic=selected_mic, device_index=device_idx)
         # Probe device for working dtype/sample rate (cached after first probe)
         probed_dtype = self._mic_manager.probe_device(device_idx) if device_idx is not None else None
         working_dtype = self._mic_manager.get_working_dtype(device_idx) if device_idx is not None else "float32"
         working_rate = self._mic_manager.get_working_sample_rate(device_idx) if device_idx is not None else 16000
-        self._append_diag(f"device_probe dtype={working_dtype} rate={working_rate}")
-        audio_cfg = AudioConfig(sample_rate=working_rate, energy_threshold=self.settings.energy_threshold)
-        self._recorder = VoiceRecorder(config=audio_cfg, device_index=device_idx, silence_ms=self.settings.silence_ms, device_dtype=working_dtype)
+        self._diag.record("device_probe", dtype=working_dtype, rate=working_rate)
+        # Recorder and level meter share one continuous stream on the device,
+        # resampled to 16 kHz in the stream when the device runs at another rate.
+        engine = self._mic_manager.capture_engine(device_idx, output_rate=16000)
+        audio_cfg = AudioConfig(
+            sample_rate=engine.sample_rate,
+            energy_threshold=self.settings.energy_threshold,
+            vad_mode=self.settings.vad_mode,
+            pre_roll_ms=self.settings.pre_roll_ms,
+        )
+        self._recorder = VoiceRecorder(config=audio_cfg, device_index=device_idx, silence_ms=self.settings.silence_ms, device_dtype=working_dtype, engine=engine)
 
         if mode == RecordingMode.AUTO:
             self._recorder.start_auto_listen(
@@ -1465,7 +1694,9 @@ class TiltedVoiceApp(ctk.CTk):
                 on_audio_ready=lambda audio: self.after(0, lambda a=audio: self._on_audio_captured(a)),
             )
         else:
-            self._recorder.start_manual_recording()
+            # Decode while recording so only the last window is left on release.
+            self._stream = self._start_stream()
+            self._recorder.start_manual_recording(on_chunk=self._stream.feed)
 
         self._set_status("Recording\u2026", T("error"))
         self._start_btn.configure(text="\u25a0  Stop", fg_color=T("error"), hover_color="#dc2626")
@@ -1477,7 +1708,21 @@ class TiltedVoiceApp(ctk.CTk):
             self._diag_peak = max(self._diag_peak, rms)
             self.after(0, lambda r=rms: self._level_bar.set(min(r * 10, 1.0)))
 
-        self._mic_manager.start_level_monitor(callback=_level_cb, device_index=device_idx)
+        self._mic_manager.start_level_monitor(callback=_level_cb, device_index=device_idx, engine=engine)
+
+    def _start_stream(self) -> StreamingTranscriber:
+        transcriber = self._ensure_transcriber()
+        committed: list[str] = []
+
+        def _update_cb(segments, final):
+            if final:
+                committed.extend(seg.text for seg in segments)
+                return
+            text = " ".join(committed + [seg.text for seg in segments])
+            if text and self._recording:
+                self.after(0, lambda: self._set_status(f"Recording\u2026 {text[-60:]}", T("error")))
+
+        return StreamingTranscriber(transcriber, on_update=_update_cb).start()
 
     def _stop_recording(self):
         if not self._recording:
@@ -1488,7 +1733,7 @@ class TiltedVoiceApp(ctk.CTk):
         if self._ptt_button:
             self._ptt_button.set_recording(False)
         mode = self.settings.recording_mode
-        self._append_diag(f"record_stop mode={mode.value} live_rms={self._diag_rms_last:.5f} peak_rms={self._diag_peak:.5f}")
+        self._diag.record("record_stop", mode=mode.value, live_rms=self._diag_rms_last, peak_rms=self._diag_peak)
         if mode == RecordingMode.AUTO:
             if self._recorder:
                 self._recorder.stop_auto_listen()
@@ -1502,6 +1747,9 @@ class TiltedVoiceApp(ctk.CTk):
         if audio is not None:
             self._on_audio_captured(audio)
         else:
+            if self._stream:
+                self._stream.cancel()
+                self._stream = None
             self._set_status("No audio captured", T("warning"))
 
     def _on_audio_captured(self, audio: np.ndarray):
@@ -1510,52 +1758,89 @@ class TiltedVoiceApp(ctk.CTk):
         rms = float(np.sqrt(np.mean(audio ** 2)))
         peak = float(np.max(np.abs(audio))) if len(audio) else 0.0
         logger.info("Audio captured: %.2fs, rms=%.5f peak=%.5f", dur, rms, peak)
-        self._append_diag(f"audio_captured dur={dur:.2f}s rms={rms:.5f} peak={peak:.5f} samples={len(audio)}")
+        self._diag.record("audio_captured", dur_s=dur, rms=rms, peak=peak, samples=len(audio))
         if rms < 0.0005:
             self._set_status(f"Mic too quiet (level={rms:.5f})", T("warning"))
-            self._append_diag("audio_rejected reason=low_rms")
+            self._diag.record("audio_rejected", reason="low_rms")
+            if self._stream:
+                self._stream.cancel()
+                self._stream = None
+            return
+        if self._transcribing:
+            # Auto-listen produced a clip while the previous one is still decoding.
+            self._auto_backlog.append(audio)
+            self._diag.record("auto_backlog", queued=len(self._auto_backlog))
             return
         self._transcribing = True
+        self._draft_text = None
         self._cancel_event = threading.Event()
         self._start_btn.configure(text="\u2715  Cancel", fg_color=T("warning"))
         self._set_status("Loading model\u2026", T("warning"))
         self._timer_start = time.monotonic()
         self._update_timer()
         cancel = self._cancel_event
+        stream = self._stream
 
         def _status_cb(msg):
             if not cancel.is_set():
                 self.after(0, lambda: self._set_status(msg, T("warning")))
-                self.after(0, lambda: self._append_diag(f"status {msg}"))
+                self._diag.record("status", message=msg)
 
         def _debug_cb(evt):
             if cancel.is_set():
                 return
             event = evt.get("event")
             if event == "timeout_budget":
-                self.after(0, lambda: self._append_diag(f"timeout_budget audio={evt.get('audio_duration_s', 0.0):.2f}s total={evt.get('total_budget_s', 0.0):.1f}s"))
+                self._diag.record("timeout_budget", audio_s=evt.get("audio_duration_s", 0.0), total_s=evt.get("total_budget_s", 0.0))
             elif event == "audio":
-                self.after(0, lambda: self._append_diag(f"fw_audio dur={evt.get('duration_s', 0.0):.2f}s rms={evt.get('rms', 0.0):.5f} peak={evt.get('peak', 0.0):.5f}"))
+                self._diag.record("fw_audio", dur_s=evt.get("duration_s", 0.0), rms=evt.get("rms", 0.0), peak=evt.get("peak", 0.0))
             elif event == "pass_start":
-                self.after(0, lambda: self._append_diag(f"pass_start name={evt.get('pass_name')} vad={evt.get('use_vad')}"))
+                self._diag.record("pass_start", pass_name=evt.get("pass_name"), vad=evt.get("use_vad"))
             elif event == "engine_call_start":
-                self.after(0, lambda: self._append_diag(f"engine_call_start pass={evt.get('pass_name')} timeout={evt.get('timeout_s', 0.0):.1f}s"))
+                self._diag.record("engine_call_start", pass_name=evt.get("pass_name"), timeout_s=evt.get("timeout_s", 0.0))
             elif event == "engine_call_end":
-                self.after(0, lambda: self._append_diag(f"engine_call_end pass={evt.get('pass_name')}"))
+                self._diag.record("engine_call_end", pass_name=evt.get("pass_name"))
             elif event == "pass_end":
-                self.after(0, lambda: self._append_diag(f"pass_end name={evt.get('name')} segs={evt.get('segment_count')} reason={evt.get('stop_reason')} elapsed={evt.get('elapsed_ms', 0.0):.0f}ms"))
+                self._diag.record("pass_end", pass_name=evt.get("name"), segs=evt.get("segment_count"),
+                                  reason=evt.get("stop_reason"), elapsed_ms=round(evt.get("elapsed_ms", 0.0)))
 
         def _run():
             try:
-                if self._transcriber is None:
-                    self._transcriber = Transcriber(config=TranscriberConfig(model=self.settings.model))
-                result = self._transcriber.transcribe(audio, cancel_event=cancel, on_status=_status_cb, on_debug=_debug_cb)
+                transcriber = self._ensure_transcriber()
+                drafting = self.settings.draft_refine and wants_draft(transcriber)
+                drafted = False
+                if stream is not None and drafting:
+                    # Committed text is final; tiny.en drafts the tail while the selected model decodes it.
+                    committed, tail = stream.snapshot()
+                    draft = self._ensure_refiner().draft_tail(committed, tail, cancel_event=cancel, on_debug=_debug_cb)
+                    if draft.text and not cancel.is_set():
+                        self.after(0, lambda: self._on_draft(draft))
+                        drafted = True
+                result = stream.finish() if stream is not None else None
+                if result is not None and not cancel.is_set():
+                    # The last window was cut short: decode what the stream had not committed
+                    result = stream.decode_tail(result, cancel_event=cancel, on_status=_status_cb, on_debug=_debug_cb)
+                if result is None or (not result.text.strip() and not cancel.is_set()):
+                    # No stream, or streaming windows found nothing: full decode with VAD-off retry.
+                    if drafting and not drafted:
+                        # Show a tiny.en draft now; the selected model replaces it when done.
+                        result = self._ensure_refiner().transcribe(
+                            audio,
+                            on_draft=lambda draft: self.after(0, lambda: self._on_draft(draft)),
+                            cancel_event=cancel,
+                            on_status=_status_cb,
+                            on_debug=_debug_cb,
+                        )
+                    else:
+                        result = transcriber.transcribe(
+                            audio, cancel_event=cancel, on_status=_status_cb, on_debug=_debug_cb
+                        )
                 if not cancel.is_set():
                     self.after(0, lambda: self._on_transcription_done(result))
             except Exception as exc:
                 logger.error("Transcription failed: %s", exc)
                 if not cancel.is_set():
-                    self.after(0, lambda: self._set_status(f"Error: {exc}", T("error")))
+                    self.after(0, lambda e=exc: self._set_status(f"Error: {e}", T("error")))
             finally:
                 if not cancel.is_set():
                     self.after(0, self._transcription_cleanup)
@@ -1576,6 +1861,7 @@ class TiltedVoiceApp(ctk.CTk):
     def _transcription_cleanup(self):
         self._transcribing = False
         self._cancel_event = None
+        self._stream = None
         if self._timer_id:
             try:
                 self.after_cancel(self._timer_id)
@@ -1584,35 +1870,113 @@ class TiltedVoiceApp(ctk.CTk):
             self._timer_id = None
         self._timer_start = None
         self._start_btn.configure(text="\u25cf  Start Recording", fg_color=T("primary"), hover_color=T("primary_hover"))
+        if self._auto_backlog:
+            clips, self._auto_backlog = self._auto_backlog, []
+            self._transcribe_backlog(clips)
+
+    def _transcribe_backlog(self, clips: list):
+        """Drain queued auto-listen clips with one batched decode."""
+        if len(clips) == 1:
+            self._on_audio_captured(clips[0])
+            return
+        self._transcribing = True
+        self._cancel_event = threading.Event()
+        cancel = self._cancel_event
+        self._start_btn.configure(text="\u2715  Cancel", fg_color=T("warning"))
+        self._set_status(f"Transcribing {len(clips)} queued clips\u2026", T("warning"))
+        self._diag.record("auto_backlog_batch", clips=len(clips))
+
+        def _run():
+            try:
+                results = self._ensure_transcriber().transcribe_batch(clips, cancel_event=cancel)
+                if not cancel.is_set():
+                    for result in results:
+                        self.after(0, lambda r=result: self._on_transcription_done(r))
+            except Exception as exc:
+                logger.error("Batch transcription failed: %s", exc)
+                if not cancel.is_set():
+                    self.after(0, lambda e=exc: self._set_status(f"Error: {e}", T("error")))
+            finally:
+                if not cancel.is_set():
+                    self.after(0, self._transcription_cleanup)
+
+        threading.Thread(target=_run, daemon=True).start()
+
+    def _on_draft(self, result: TranscriptionResult):
+        """Show a draft in the output box; _on_transcription_done refines it in place."""
+        if not self._transcribing:
+            return
+        self._transcription_count += 1
+        now = datetime.now().strftime("%H:%M:%S")
+        ms = int(result.processing_time_ms)
+        out = self._output
+        out.configure(state="normal")
+        if self._transcription_count > 1:
+            out.insert("end", "\n" + "\u2500" * 50 + "\n")
+        out.insert("end", f"[{now}]  #{self._transcription_count}  ")
+        # Marks keep left gravity so text inserted after them stays outside the ranges.
+        out.mark_set("draft_info", "end-1c")
+        out.mark_gravity("draft_info", "left")
+        out.insert("end", f"(draft {ms}ms)\n")
+        out.mark_set("draft_start", "end-1c")
+        out.mark_gravity("draft_start", "left")
+        out.insert("end", result.text, ("draft",))
+        out.mark_set("draft_end", "end-1c")
+        out.mark_gravity("draft_end", "left")
+        out.insert("end", "\n")
+        out.configure(state="disabled")
+        out.see("end")
+        self._draft_text = result.text
+        self._set_status(f"Draft in {ms}ms \u2014 refining\u2026", T("warning"))
+        self._diag.record("draft_done", model=result.model_name, elapsed_ms=ms, chars=len(result.text))
+
+    def _refine_output(self, result: TranscriptionResult) -> None:
+        """Turn the draft in the output box into *result*, touching only changed words."""
+        draft, self._draft_text = self._draft_text, None
+        out = self._output
+        out.configure(state="normal")
+        out.delete("draft_info", "draft_info lineend")
+        out.insert("draft_info", f"({int(result.processing_time_ms)}ms)")
+        edits = text_edits(draft, result.text)
+        for start, end, replacement in reversed(edits):
+            out.delete(f"draft_start+{start}c", f"draft_start+{end}c")
+            out.insert(f"draft_start+{start}c", replacement, ("refined",))
+        out.tag_remove("draft", "draft_start", "draft_end")
+        for mark in ("draft_info", "draft_start", "draft_end"):
+            out.mark_unset(mark)
+        out.configure(state="disabled")
+        self._diag.record("draft_refined", edits=len(edits))
 
     def _on_transcription_done(self, result: TranscriptionResult):
         if result.debug_info:
             selected_pass = result.debug_info.get("selected_pass", "?")
             proc_ms = int(result.debug_info.get("processing_time_ms", 0))
-            self._append_diag(f"transcribe_done pass={selected_pass} elapsed={proc_ms}ms")
+            self._diag.record("transcribe_done", pass_name=selected_pass, elapsed_ms=proc_ms)
         if not result.text.strip():
             ms = int(result.processing_time_ms)
             self._set_status(f"No speech detected ({ms}ms)", T("text_dim"))
-            self._append_diag("result_empty")
+            self._diag.record("result_empty")
             return
 
-        self._transcription_count += 1
         now = datetime.now().strftime("%H:%M:%S")
         ms = int(result.processing_time_ms)
 
-        self._history.append({"time": now, "ms": ms, "text": result.text, "wpm": result.words_per_minute})
-        _save_history(self._history)
+        self._history.append(HistoryEntry(text=result.text, ms=ms, wpm=result.words_per_minute, time=now))
 
-        self._output.configure(state="normal")
-        if self._transcription_count > 1:
-            self._output.insert("end", "\n" + "\u2500" * 50 + "\n")
-        self._output.insert("end", f"[{now}]  #{self._transcription_count}  ({ms}ms)\n")
-        self._output.insert("end", result.text + "\n")
-        self._output.configure(state="disabled")
-        self._output.see("end")
+        if self._draft_text is not None:
+            self._refine_output(result)
+        else:
+            self._transcription_count += 1
+            self._output.configure(state="normal")
+            if self._transcription_count > 1:
+                self._output.insert("end", "\n" + "\u2500" * 50 + "\n")
+            self._output.insert("end", f"[{now}]  #{self._transcription_count}  ({ms}ms)\n")
+            self._output.insert("end", result.text + "\n")
+            self._output.configure(state="disabled")
+            self._output.see("end")
 
         self._set_status(f"Done \u2014 {ms}ms, {result.words_per_minute:.0f} WPM", T("success"))
-        self._append_diag(f"result_text chars={len(result.text)} wpm={result.words_per_minute:.1f}")
+        self._diag.record("result_text", chars=len(result.text), wpm=round(result.words_per_minute, 1))
 
         if self.settings.auto_copy:
             self._copy_to_clipboard(result.text)
@@ -1655,6 +2019,7 @@ class TiltedVoiceApp(ctk.CTk):
         self._output.delete("1.0", "end")
         self._output.configure(state="disabled")
         self._transcription_count = 0
+        self._draft_text = None
         self._set_status("Cleared", T("text_dim"))
 
     # ==================================================================
@@ -1679,26 +2044,37 @@ class TiltedVoiceApp(ctk.CTk):
                 return d["index"]
         return None
 
-    def _append_diag(self, message):
-        stamp = datetime.now().strftime("%H:%M:%S")
-        line = f"[{stamp}] {message}"
-        self._diag_lines.append(line)
-        if len(self._diag_lines) > 120:
-            self._diag_lines = self._diag_lines[-120:]
+    def _refresh_diag(self):
+        """Redraw the Diagnostics box if events arrived since the last tick."""
+        self.after(DIAG_REFRESH_MS, self._refresh_diag)
+        version = self._diag.version
+        if version == self._diag_shown or not version:
+            return
+        # The box lives on the Settings page; skip formatting while it isn't built
+        box = self._diag_text
+        if box is None or not box.winfo_exists():
+            return
+        # Marked shown even if the redraw fails, so a broken box isn't retried every tick
+        self._diag_shown = version
         try:
-            self._diag_text.configure(state="normal")
-            self._diag_text.delete("1.0", "end")
-            self._diag_text.insert("end", "\n".join(self._diag_lines) + "\n")
-            self._diag_text.configure(state="disabled")
-            self._diag_text.see("end")
-        except Exception:
-            pass
+            lines = self._diag.lines(last=DIAG_VIEW_LINES)
+            box.configure(state="normal")
+            box.delete("1.0", "end")
+            box.insert("end", "\n".join(lines) + "\n")
+            box.configure(state="disabled")
+            box.see("end")
+        except Exception as exc:
+            logger.debug("Diagnostics redraw failed: %s", exc)
 
     def _copy_diagnostics(self):
-        text = "\n".join(self._diag_lines).strip()
+        text = self._diag.text().strip()
         if text:
             self._copy_to_clipboard(text)
-            self._set_status("Diagnostics copied", T("success"))
+            try:
+                path = self._diag.dump(paths.diagnostics_path())
+                self._set_status(f"Diagnostics copied (saved to {path.name})", T("success"))
+            except OSError:
+                self._set_status("Diagnostics copied", T("success"))
 
     # ==================================================================
     # System tray
@@ -1810,10 +2186,15 @@ class TiltedVoiceApp(ctk.CTk):
                 threading.Thread(target=self._tray_icon.stop, daemon=True).start()
             except Exception:
                 pass
+        if self._stream:
+            self._stream.cancel()
         if self._recorder:
             self._recorder.stop_manual_recording()
             self._recorder.stop_auto_listen()
         self._mic_manager.stop_level_monitor()
+        self._mic_manager.close_engines()
+        self._settings_store.close(timeout=0.5)
+        self._history.close(timeout=1.0)
         try:
             self.quit()
             self.destroy()
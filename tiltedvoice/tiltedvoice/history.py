@@ -0,0 +1,468 @@
+"""Append-only transcription history in SQLite.
+
+The old ``history.json`` was rewritten in full (and capped at 500 entries)
+after every transcription, on the UI thread.  :class:`HistoryStore` keeps one
+row per transcription in a WAL-mode SQLite database instead:
+
+* :meth:`HistoryStore.append` only queues the entry; a background writer
+  inserts whatever has queued up in one transaction, so a write is O(1) and
+  never blocks the caller;
+* readers page through history newest-first with :meth:`HistoryStore.page`
+  and never load more than they show;
+* retention is unbounded.
+
+Entries that are queued but not written yet are merged into reads, so the
+history page always shows the transcription that just finished.  An existing
+``history.json`` is imported once and renamed to ``history.json.migrated``.
+
+:meth:`HistoryStore.search` runs full-text queries against an FTS5 index that
+triggers keep in step with the table.  Words match whole words except the last,
+which matches as a prefix (search as you type); quoted text matches as a
+phrase.  Results are ranked by BM25.  Builds of SQLite without
+FTS5 fall back to a (slow) substring scan.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import queue
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Iterator, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_VERSION = 2  # 2: history_fts index
+# Entries written per transaction at most; the rest wait for the next batch.
+WRITE_BATCH = 256
+EXPORT_CHUNK = 500
+# Search ranks this many of the newest matches by BM25.
+RANK_WINDOW = 2000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS history (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    created REAL NOT NULL,
+    time TEXT NOT NULL,
+    ms INTEGER NOT NULL,
+    text TEXT NOT NULL,
+    wpm REAL NOT NULL DEFAULT 0
+)
+"""
+
+# External-content FTS5 index over history.text, kept in step by triggers.
+_FTS_DELETE_TRIGGER = (
+    "CREATE TRIGGER IF NOT EXISTS history_ad AFTER DELETE ON history BEGIN "
+    "INSERT INTO history_fts(history_fts, rowid, text) VALUES ('delete', old.id, old.text); END"
+)
+_FTS_SCHEMA = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS history_fts USING fts5("
+    "text, content='history', content_rowid='id', tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+    "CREATE TRIGGER IF NOT EXISTS history_ai AFTER INSERT ON history BEGIN "
+    "INSERT INTO history_fts(rowid, text) VALUES (new.id, new.text); END",
+    _FTS_DELETE_TRIGGER,
+)
+
+# Search term kinds
+WORD, PREFIX, PHRASE = "word", "prefix", "phrase"
+
+_COLUMNS = "history.id, history.created, history.time, history.ms, history.text, history.wpm"
+_QUERY_RE = re.compile(r'"([^"]*)"?|(\S+)')
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+
+@dataclass
+class HistoryEntry:
+    """One finished transcription."""
+
+    text: str
+    ms: int = 0
+    wpm: float = 0.0
+    time: str = ""  # wall-clock time shown in the UI (HH:MM:SS)
+    created: float = field(default_factory=lambda: time.time())
+    id: Optional[int] = None  # row id once written
+
+    def __post_init__(self):
+        if not self.time:
+            self.time = time.strftime("%H:%M:%S", time.localtime(self.created))
+
+
+# ("append", entry) | ("flush", threading.Event) | ("stop", None)
+_Op = Tuple[str, Any]
+
+
+class HistoryStore:
+    """Transcription history backed by SQLite, written from a background thread."""
+
+    def __init__(self, path: Union[str, os.PathLike], legacy_json: Optional[Union[str, os.PathLike]] = None):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(_SCHEMA)
+        self._fts = self._init_fts()
+        self._conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+        self._count = self._conn.execute("SELECT COUNT(*) FROM history").fetchone()[0]
+        # Queued entries not yet written, oldest first
+        self._pending: List[HistoryEntry] = []
+        self._queue: "queue.Queue[_Op]" = queue.Queue()
+        if legacy_json is not None:
+            self._import_legacy(Path(legacy_json))
+        self._writer = threading.Thread(target=self._run_writer, name="tv-history", daemon=True)
+        self._writer.start()
+
+    # ------------------------------------------------------------------
+    # Writes (any thread; append never blocks)
+    # ------------------------------------------------------------------
+
+    def append(self, entry: HistoryEntry) -> None:
+        with self._lock:
+            self._pending.append(entry)
+        self._queue.put(("append", entry))
+
+    def clear(self) -> None:
+        """Delete every entry, queued ones included; reads see an empty history at once."""
+        with self._lock:
+            # Queued appends are dropped too: the writer skips entries no longer pending.
+            self._pending.clear()
+            try:
+                self._delete_all()
+            except sqlite3.Error as exc:
+                logger.error("Could not clear history: %s", exc)
+                if self._conn.in_transaction:
+                    self._conn.execute("ROLLBACK")
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until everything queued so far is written; False on timeout."""
+        done = threading.Event()
+        self._queue.put(("flush", done))
+        return done.wait(timeout)
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Write what is queued and stop the writer."""
+        if self._writer.is_alive():
+            self._queue.put(("stop", None))
+            self._writer.join(timeout)
+        with self._lock:
+            self._conn.close()
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def count(self) -> int:
+        with self._lock:
+            return self._count + len(self._pending)
+
+    def __len__(self) -> int:
+        return self.count()
+
+    def page(self, offset: int = 0, limit: int = 50) -> List[HistoryEntry]:
+        """Entries newest first, skipping *offset* of them."""
+        offset, limit = max(0, offset), max(0, limit)
+        with self._lock:
+            pending = self._pending[::-1]
+            out = pending[offset:offset + limit]
+            db_offset = max(0, offset - len(pending))
+            remaining = limit - len(out)
+            if remaining:
+                lo, hi = self._conn.execute("SELECT MIN(id), MAX(id) FROM history").fetchone()
+                if hi is not None and hi - lo + 1 == self._count:
+                    # Rows are only appended or cleared together, so ids are
+                    # dense and an offset maps straight to an id: seeking on
+                    # the primary key stays constant-time on deep pages.
+                    rows = self._conn.execute(
+                        "SELECT id, created, time, ms, text, wpm FROM history WHERE id <= ? "
+                        "ORDER BY id DESC LIMIT ?",
+                        (hi - db_offset, remaining),
+                    ).fetchall()
+                else:
+                    rows = self._conn.execute(
+                        "SELECT id, created, time, ms, text, wpm FROM history ORDER BY id DESC LIMIT ? OFFSET ?",
+                        (remaining, db_offset),
+                    ).fetchall()
+                out.extend(self._entry(row) for row in rows)
+        return out
+
+    def iter_entries(self) -> Iterator[HistoryEntry]:
+        """All entries oldest first, read in chunks."""
+        last_id = 0
+        while True:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT id, created, time, ms, text, wpm FROM history WHERE id > ? ORDER BY id LIMIT ?",
+                    (last_id, EXPORT_CHUNK),
+                ).fetchall()
+                pending = list(self._pending) if not rows else []
+            if not rows:
+                yield from pending
+                return
+            for row in rows:
+                yield self._entry(row)
+            last_id = rows[-1][0]
+
+    def search(self, query: str, offset: int = 0, limit: int = 50) -> List[HistoryEntry]:
+        """Entries matching *query* (see :func:`parse_query`), best match first.
+
+        BM25 ranking covers the newest ``RANK_WINDOW`` matches, which keeps
+        broad queries fast; matches beyond that follow newest first.
+        """
+        terms = parse_query(query)
+        if not terms:
+            return []
+        offset, limit = max(0, offset), max(0, limit)
+        with self._lock:
+            pending = [e for e in reversed(self._pending) if _matches(e.text, terms)]
+            out = pending[offset:offset + limit]
+            if len(out) < limit:
+                rows = self._search_rows(terms, max(0, offset - len(pending)), limit - len(out))
+                out.extend(self._entry(row) for row in rows)
+        return out
+
+    def search_count(self, query: str) -> int:
+        terms = parse_query(query)
+        if not terms:
+            return 0
+        with self._lock:
+            pending = sum(1 for e in self._pending if _matches(e.text, terms))
+            if self._fts:
+                sql, params = "SELECT COUNT(*) FROM history_fts WHERE history_fts MATCH ?", [fts_expression(terms)]
+            else:
+                where, params = _like_clause(terms)
+                sql = f"SELECT COUNT(*) FROM history WHERE {where}"
+            return pending + self._conn.execute(sql, params).fetchone()[0]
+
+    def _search_rows(self, terms: List[Tuple[str, str]], offset: int, limit: int) -> List[Any]:
+        if not self._fts:
+            where, params = _like_clause(terms)
+            return self._conn.execute(
+                f"SELECT {_COLUMNS} FROM history WHERE {where} ORDER BY history.id DESC LIMIT ? OFFSET ?",
+                params + [limit, offset],
+            ).fetchall()
+        expr = fts_expression(terms)
+        rows: List[Any] = []
+        if offset < RANK_WINDOW:
+            rows = self._conn.execute(
+                f"SELECT {_COLUMNS} FROM (SELECT rowid AS match_id, rank AS match_rank FROM history_fts "
+                "WHERE history_fts MATCH ? ORDER BY rowid DESC LIMIT ?) "
+                "JOIN history ON history.id = match_id ORDER BY match_rank, history.id DESC LIMIT ? OFFSET ?",
+                (expr, RANK_WINDOW, limit, offset),
+            ).fetchall()
+            if len(rows) == limit or len(rows) + offset < RANK_WINDOW:
+                return rows
+        rows += self._conn.execute(
+            f"SELECT {_COLUMNS} FROM history_fts JOIN history ON history.id = history_fts.rowid "
+            "WHERE history_fts MATCH ? ORDER BY history_fts.rowid DESC LIMIT ? OFFSET ?",
+            (expr, limit - len(rows), max(offset, RANK_WINDOW)),
+        ).fetchall()
+        return rows
+
+    @staticmethod
+    def _entry(row) -> HistoryEntry:
+        return HistoryEntry(id=row[0], created=row[1], time=row[2], ms=row[3], text=row[4], wpm=row[5])
+
+    # ------------------------------------------------------------------
+    # Writer
+    # ------------------------------------------------------------------
+
+    def _run_writer(self) -> None:
+        while True:
+            ops = [self._queue.get()]
+            while len(ops) < WRITE_BATCH:
+                try:
+                    ops.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = False
+            batch: List[HistoryEntry] = []
+            for kind, arg in ops:
+                if kind == "append":
+                    batch.append(arg)
+                    continue
+                self._write(batch)
+                batch = []
+                if kind == "flush":
+                    arg.set()
+                elif kind == "stop":
+                    stop = True
+            self._write(batch)
+            if stop:
+                return
+
+    def _write(self, batch: List[HistoryEntry]) -> None:
+        if not batch:
+            return
+        try:
+            with self._lock:
+                # Entries cleared while queued are not written
+                queued = {id(e) for e in self._pending}
+                batch = [e for e in batch if id(e) in queued]
+                if not batch:
+                    return
+                self._conn.execute("BEGIN")
+                for entry in batch:
+                    cur = self._conn.execute(
+                        "INSERT INTO history (created, time, ms, text, wpm) VALUES (?, ?, ?, ?, ?)",
+                        (entry.created, entry.time, int(entry.ms), entry.text, float(entry.wpm or 0.0)),
+                    )
+                    entry.id = cur.lastrowid
+                self._conn.execute("COMMIT")
+                self._count += len(batch)
+                written = {id(e) for e in batch}
+                self._pending = [e for e in self._pending if id(e) not in written]
+        except sqlite3.Error as exc:
+            logger.error("Could not write %d history entries: %s", len(batch), exc)
+            with self._lock:
+                if self._conn.in_transaction:
+                    self._conn.execute("ROLLBACK")
+
+    def _delete_all(self) -> None:
+        """Empty the table (caller holds ``_lock``)."""
+        self._conn.execute("BEGIN")
+        if self._fts:
+            # Emptying the index in one step beats a delete trigger per row
+            self._conn.execute("DROP TRIGGER IF EXISTS history_ad")
+            self._conn.execute("DELETE FROM history")
+            self._conn.execute("INSERT INTO history_fts(history_fts) VALUES ('delete-all')")
+            self._conn.execute(_FTS_DELETE_TRIGGER)
+        else:
+            self._conn.execute("DELETE FROM history")
+        self._conn.execute("COMMIT")
+        self._count = 0
+
+    # ------------------------------------------------------------------
+    # Migration
+    # ------------------------------------------------------------------
+
+    def _init_fts(self) -> bool:
+        version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+        try:
+            for statement in _FTS_SCHEMA:
+                self._conn.execute(statement)
+        except sqlite3.OperationalError as exc:
+            logger.warning("SQLite has no FTS5 (%s); history search will scan", exc)
+            return False
+        if version < 2:
+            # Index rows written before the index existed.
+            self._conn.execute("INSERT INTO history_fts(history_fts) VALUES ('rebuild')")
+        return True
+
+    def _import_legacy(self, legacy: Path) -> None:
+        if not legacy.exists():
+            return
+        try:
+            entries = json.loads(legacy.read_text(encoding="utf-8"))
+        except Exception as exc:
+            logger.warning("Could not read %s for import: %s", legacy, exc)
+            return
+        created = legacy.stat().st_mtime
+        rows = [
+            (created, str(e.get("time", "")), int(e.get("ms", 0)), str(e["text"]), float(e.get("wpm") or 0.0))
+            for e in entries
+            if isinstance(e, dict) and e.get("text")
+        ]
+        with self._lock:
+            self._conn.execute("BEGIN")
+            self._conn.executemany("INSERT INTO history (created, time, ms, text, wpm) VALUES (?, ?, ?, ?, ?)", rows)
+            self._conn.execute("COMMIT")
+            self._count += len(rows)
+        os.replace(legacy, legacy.with_name(legacy.name + ".migrated"))
+        logger.info("Imported %d entries from %s", len(rows), legacy)
+
+
+# ----------------------------------------------------------------------
+# Query parsing
+# ----------------------------------------------------------------------
+
+
+def parse_query(query: str) -> List[Tuple[str, str]]:
+    """Split a search box query into ``(text, kind)`` terms.
+
+    *kind* is :data:`WORD`, :data:`PREFIX` or :data:`PHRASE`:
+    ``"quoted text"`` is one ``PHRASE`` term and other words are ``WORD``
+    terms, except a trailing word (the one being typed), which is a
+    ``PREFIX``.  Punctuation outside quotes is ignored.
+    """
+    terms: List[Tuple[str, str]] = []
+    for match in _QUERY_RE.finditer(query or ""):
+        phrase, bare = match.group(1), match.group(2)
+        if phrase is not None:
+            words = _WORD_RE.findall(phrase)
+            if words:
+                terms.append((" ".join(words), PHRASE))
+        else:
+            terms.extend((word, WORD) for word in _WORD_RE.findall(bare))
+    if terms and terms[-1][1] == WORD and not query[-1].isspace() and query[-1] != '"':
+        terms[-1] = (terms[-1][0], PREFIX)
+    return terms
+
+
+def fts_expression(terms: List[Tuple[str, str]]) -> str:
+    """FTS5 MATCH expression for parsed terms (all terms must match)."""
+    return " ".join(f'"{text}"*' if kind == PREFIX else f'"{text}"' for text, kind in terms)
+
+
+def _matches(text: str, terms: List[Tuple[str, str]]) -> bool:
+    """Python equivalent of the FTS match, for entries not written yet."""
+    words = [w.lower() for w in _WORD_RE.findall(text)]
+    joined = f" {' '.join(words)} "
+    for term, kind in terms:
+        term = term.lower()
+        if kind == PREFIX:
+            if not any(w.startswith(term) for w in words):
+                return False
+        elif f" {term} " not in joined:
+            return False
+    return True
+
+
+def _like_clause(terms: List[Tuple[str, str]]) -> Tuple[str, List[Any]]:
+    where = " AND ".join("history.text LIKE ? ESCAPE '\\'" for _ in terms)
+    return where, ["%" + _escape_like(term) + "%" for term, _ in terms]
+
+
+def _escape_like(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+class PagedRows:
+    """Random access to a result list fetched one page at a time.
+
+    ``fetch(offset, limit)`` returns rows in display order.  The last
+    *max_pages* pages are cached, so scrolling back and forth does not hit
+    the database and memory stays bounded however long the list is.
+    """
+
+    def __init__(self, fetch: Callable[[int, int], List[HistoryEntry]], total: int,
+                 page_size: int = 50, max_pages: int = 8):
+        self._fetch = fetch
+        self.total = total
+        self._page_size = page_size
+        self._max_pages = max_pages
+        self._pages: "OrderedDict[int, List[HistoryEntry]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return self.total
+
+    def get(self, index: int) -> Optional[HistoryEntry]:
+        if not 0 <= index < self.total:
+            return None
+        page_no, pos = divmod(index, self._page_size)
+        page = self._pages.get(page_no)
+        if page is None:
+            page = self._fetch(page_no * self._page_size, self._page_size)
+            self._pages[page_no] = page
+            while len(self._pages) > self._max_pages:
+                self._pages.popitem(last=False)
+        else:
+            self._pages.move_to_end(page_no)
+        return page[pos] if pos < len(page) else None
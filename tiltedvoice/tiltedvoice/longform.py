@@ -0,0 +1,487 @@
+"""Long-form file transcription: chunked, parallel and resumable.
+
+:meth:`Transcriber.transcribe` is built for dictation-sized clips (segment
+cap, fixed time budget).  :class:`LongFormTranscriber` handles recordings of
+any length instead:
+
+1. the file is read as a stream of 16 kHz windows by
+   :class:`~tiltedvoice.audio_file.AudioFileReader`, never as a whole;
+2. :class:`ChunkPlanner` cuts the stream into chunks of up to 30 s at the
+   longest pause near the end of each window, found with Silero VAD (the ONNX
+   model faster-whisper ships) or, where that cannot load, by RMS; where no
+   pause is found, neighbouring chunks overlap and the boundary is stitched
+   by keeping each segment in the chunk that owns its midpoint;
+3. chunks are decoded by a pool of Transcriber replicas sharing one
+   CTranslate2 model loaded with as many workers as there are replicas;
+4. every finished chunk is written to a checkpoint, so an interrupted run
+   resumes where it stopped instead of starting over.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import queue
+import sys
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import asdict, dataclass, replace
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Optional, Union
+
+import numpy as np
+
+from tiltedvoice.audio_file import AudioFileReader
+from tiltedvoice.model_pool import ModelPool
+from tiltedvoice.models import TranscriberConfig, TranscriptionResult, TranscriptionSegment, WhisperModel
+from tiltedvoice.result_cache import audio_fingerprint, cache_key
+from tiltedvoice.telemetry import Telemetry
+from tiltedvoice.transcriber import SAMPLE_RATE, Transcriber, is_complete
+
+if TYPE_CHECKING:
+    from tiltedvoice.audio import VoiceActivityDetector
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_VERSION = 1
+DEFAULT_WORKERS = 2
+TARGET_CHUNK_S = 25.0
+MAX_CHUNK_S = 30.0
+# Chunks may end anywhere in the last SEARCH_S seconds before MAX_CHUNK_S.
+SEARCH_S = 10.0
+OVERLAP_S = 1.0
+MIN_SILENCE_MS = 300
+FRAME_MS = 30
+STREAM_BLOCK_S = 10.0
+
+ProgressCallback = Callable[[float, int, int], None]  # (seconds done, chunks done, chunks planned)
+
+
+@dataclass
+class Chunk:
+    """One planned piece of the file; ``audio`` includes the overlap pads."""
+
+    index: int
+    start: int  # owned region, in samples from the start of the file
+    end: int
+    pad_start: int  # first sample of ``audio``
+    audio: np.ndarray
+
+    @property
+    def start_s(self) -> float:
+        return self.start / SAMPLE_RATE
+
+    @property
+    def end_s(self) -> float:
+        return self.end / SAMPLE_RATE
+
+    @property
+    def offset_s(self) -> float:
+        return self.pad_start / SAMPLE_RATE
+
+
+class ChunkPlanner:
+    """Cut a stream of 16 kHz samples into chunks at silences.
+
+    :meth:`feed` returns the chunks completed by a block; :meth:`flush`
+    returns the tail at end of stream.  Memory stays bounded by one chunk.
+    With a *detector*, pauses are frames it calls non-speech; without one,
+    frames well below the window's speech level.  Only the search window
+    near each cut is examined either way.
+    """
+
+    def __init__(
+        self,
+        sample_rate: int = SAMPLE_RATE,
+        target_s: float = TARGET_CHUNK_S,
+        max_s: float = MAX_CHUNK_S,
+        search_s: float = SEARCH_S,
+        overlap_s: float = OVERLAP_S,
+        min_silence_ms: int = MIN_SILENCE_MS,
+        detector: Optional["VoiceActivityDetector"] = None,
+    ):
+        self._rate = sample_rate
+        self._detector = detector
+        self._max = int(max_s * sample_rate)
+        self._search_from = int(max(0.0, min(target_s, max_s) - search_s) * sample_rate)
+        self._overlap = int(overlap_s * sample_rate)
+        frame_ms = detector.frame_ms if detector is not None else FRAME_MS
+        self._frame = int(sample_rate * frame_ms / 1000)
+        self._min_silence_frames = max(1, min_silence_ms // frame_ms)
+        self._buf = np.zeros(0, dtype=np.float32)
+        self._buf_start = 0  # file position of self._buf[0]
+        self._next_start = 0
+        self._pad_before = 0
+        self._index = 0
+
+    def feed(self, block: np.ndarray) -> List[Chunk]:
+        self._buf = np.concatenate([self._buf, np.asarray(block, dtype=np.float32).reshape(-1)])
+        chunks = []
+        while self._buf_start + self._buf.size >= self._next_start + self._max + self._overlap:
+            chunks.append(self._cut())
+        return chunks
+
+    def flush(self) -> List[Chunk]:
+        end = self._buf_start + self._buf.size
+        if end - self._next_start < self._frame:
+            return []
+        return [self._emit(end, pad_after=0)]
+
+    def _cut(self) -> Chunk:
+        lo = self._next_start + self._search_from
+        hi = self._next_start + self._max
+        split = self._find_silence(lo, hi)
+        if split is None:
+            return self._emit(hi, pad_after=self._overlap)
+        return self._emit(split, pad_after=0)
+
+    def _find_silence(self, lo: int, hi: int) -> Optional[int]:
+        """Middle of the longest quiet run in [lo, hi), or None."""
+        window = self._buf[lo - self._buf_start:hi - self._buf_start]
+        n = window.size // self._frame
+        if n == 0:
+            return None
+        frames = window[:n * self._frame].reshape(n, self._frame)
+        if self._detector is not None:
+            self._detector.reset()
+            quiet = [not self._detector.is_speech(frame) for frame in frames]
+        else:
+            rms = np.sqrt(np.mean(frames * frames, axis=1))
+            # Near the quietest frames, but always well below the speech level
+            threshold = max(1e-4, min(2.0 * float(np.percentile(rms, 10)), 0.25 * float(np.percentile(rms, 95))))
+            quiet = rms <= threshold
+        best_len, best_mid, run = 0, None, 0
+        for i, q in enumerate(quiet):
+            run = run + 1 if q else 0
+            if run > best_len:
+                best_len, best_mid = run, i - run // 2
+        if best_len < self._min_silence_frames:
+            return None
+        return lo + best_mid * self._frame
+
+    def _emit(self, end: int, pad_after: int) -> Chunk:
+        pad_start = max(0, self._next_start - self._pad_before)
+        stop = min(end + pad_after, self._buf_start + self._buf.size)
+        chunk = Chunk(
+            index=self._index,
+            start=self._next_start,
+            end=end,
+            pad_start=pad_start,
+            audio=self._buf[pad_start - self._buf_start:stop - self._buf_start].copy(),
+        )
+        self._index += 1
+        self._next_start = end
+        self._pad_before = pad_after
+        keep_from = max(self._buf_start, end - pad_after)
+        self._buf = self._buf[keep_from - self._buf_start:]
+        self._buf_start = keep_from
+        return chunk
+
+
+def default_planner() -> ChunkPlanner:
+    """A planner that finds pauses with Silero VAD, or by RMS if it cannot load."""
+    try:
+        # tiltedvoice.audio needs PortAudio; file transcription must work without it
+        from tiltedvoice.audio import SileroVAD
+
+        return ChunkPlanner(detector=SileroVAD())
+    except Exception as exc:
+        logger.info("Silero VAD unavailable (%s); finding chunk cut points by RMS", exc)
+        return ChunkPlanner()
+
+
+def stitch_segments(chunk: Chunk, segments: List[TranscriptionSegment], last: bool) -> List[TranscriptionSegment]:
+    """Shift *segments* to file time and keep those whose midpoint the chunk owns."""
+    kept = []
+    for seg in segments:
+        start, end = seg.start + chunk.offset_s, seg.end + chunk.offset_s
+        mid = (start + end) / 2
+        if chunk.start_s <= mid and (mid < chunk.end_s or last):
+            kept.append(replace(seg, start=round(start, 3), end=round(end, 3), words=None))
+    return kept
+
+
+class Checkpoint:
+    """Finished chunks of one file, persisted after every chunk."""
+
+    def __init__(self, path: Path, key: str):
+        self.path = path
+        self.key = key
+        self._lock = threading.Lock()
+        self.chunks: Dict[int, Dict[str, Any]] = {}
+        self.complete = False
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+            if data.get("version") == CHECKPOINT_VERSION and data.get("key") == key:
+                self.chunks = {int(k): v for k, v in data["chunks"].items()}
+                self.complete = bool(data.get("complete"))
+        except FileNotFoundError:
+            pass
+        except Exception as exc:
+            logger.warning("Ignoring unreadable checkpoint %s: %s", path, exc)
+
+    def get(self, chunk: Chunk) -> Optional[List[TranscriptionSegment]]:
+        entry = self.chunks.get(chunk.index)
+        if entry is None or entry["start"] != chunk.start or entry["end"] != chunk.end:
+            return None
+        return [TranscriptionSegment(**seg) for seg in entry["segments"]]
+
+    def put(self, chunk: Chunk, segments: List[TranscriptionSegment]) -> None:
+        with self._lock:
+            self.chunks[chunk.index] = {
+                "start": chunk.start,
+                "end": chunk.end,
+                "segments": [asdict(seg) for seg in segments],
+            }
+            self._write()
+
+    def finish(self) -> None:
+        with self._lock:
+            self.complete = True
+            self._write()
+
+    def _write(self) -> None:
+        payload = {"version": CHECKPOINT_VERSION, "key": self.key, "complete": self.complete,
+                   "chunks": self.chunks}
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+            tmp.write_text(json.dumps(payload), encoding="utf-8")
+            os.replace(tmp, self.path)
+        except Exception as exc:
+            logger.warning("Could not write checkpoint %s: %s", self.path, exc)
+
+
+def default_checkpoint_path(path: Union[str, os.PathLike]) -> Path:
+    path = Path(path)
+    return path.with_name(path.name + ".tvcheckpoint.json")
+
+
+class LongFormTranscriber:
+    """Transcribe files of any length across a pool of Transcriber replicas."""
+
+    def __init__(
+        self,
+        config: Optional[TranscriberConfig] = None,
+        workers: int = DEFAULT_WORKERS,
+        pool: Optional[ModelPool] = None,
+        planner_factory: Callable[[], ChunkPlanner] = default_planner,
+        replicas: Optional[List[Transcriber]] = None,
+    ):
+        self._config = config or TranscriberConfig()
+        self._workers = max(1, int(replicas and len(replicas) or workers))
+        self._planner_factory = planner_factory
+        if replicas is None:
+            pool = pool or ModelPool.shared()
+            # One pooled model with a CTranslate2 worker per replica.
+            replica_config = replace(self._config, num_workers=self._workers, speculative_fallback=False)
+            replicas = [Transcriber(config=replica_config, pool=pool) for _ in range(self._workers)]
+        self._replicas = replicas
+
+    def transcribe_file(
+        self,
+        path: Union[str, os.PathLike],
+        language: Optional[str] = None,
+        checkpoint_path: Optional[Union[str, os.PathLike]] = None,
+        cancel_event: Optional[threading.Event] = None,
+        on_progress: Optional[ProgressCallback] = None,
+        blocks: Optional[Iterable[np.ndarray]] = None,
+    ) -> TranscriptionResult:
+        """Transcribe *path* chunk by chunk, resuming from its checkpoint.
+
+        The checkpoint (default ``<file>.tvcheckpoint.json``) is marked
+        complete at the end and kept, so a finished file is not decoded
+        again.  *blocks* overrides the file decoder (16 kHz float32 blocks).
+        """
+        lang = language or self._config.language
+        t0 = time.perf_counter()
+        key = cache_key(audio_fingerprint(path), self._config, lang)
+        checkpoint = Checkpoint(Path(checkpoint_path or default_checkpoint_path(path)), key)
+        if checkpoint.chunks:
+            logger.info("Resuming %s: %d chunks already done", path, len(checkpoint.chunks))
+
+        planner = self._planner_factory()
+        replicas: "queue.Queue[Transcriber]" = queue.Queue()
+        for replica in self._replicas:
+            replicas.put(replica)
+        in_flight = threading.Semaphore(self._workers * 2)  # bounds decoded audio held in memory
+        results: Dict[int, List[TranscriptionSegment]] = {}
+        progress = {"seconds": 0.0, "done": 0, "planned": 0, "resumed": 0, "incomplete": 0}
+        progress_lock = threading.Lock()
+        chunks: List[Chunk] = []
+        # Result confidence of each chunk decoded in this run (resumed chunks carry none)
+        confidences: List[float] = []
+
+        def _done(chunk: Chunk, segments: List[TranscriptionSegment], resumed: bool) -> None:
+            with progress_lock:
+                results[chunk.index] = segments
+                progress["seconds"] += chunk.end_s - chunk.start_s
+                progress["done"] += 1
+                progress["resumed"] += int(resumed)
+                snapshot = (progress["seconds"], progress["done"], progress["planned"])
+            if on_progress:
+                try:
+                    on_progress(*snapshot)
+                except Exception:
+                    pass
+
+        def _decode(chunk: Chunk, last: bool) -> None:
+            try:
+                replica = replicas.get()
+                try:
+                    seconds = round(chunk.end_s - chunk.start_s, 2)
+                    with Telemetry.shared().span("longform_chunk", index=chunk.index, seconds=seconds):
+                        result = replica.transcribe(chunk.audio, language=lang, cancel_event=cancel_event)
+                finally:
+                    replicas.put(replica)
+                if cancel_event is not None and cancel_event.is_set():
+                    return
+                segments = stitch_segments(chunk, result.segments, last)
+                with progress_lock:
+                    confidences.append(result.confidence)
+                if is_complete(result):
+                    checkpoint.put(chunk, segments)
+                else:
+                    # Cut short (e.g. pass_timeout): not checkpointed, decoded again next run
+                    logger.warning("Chunk %d at %.0fs was cut short", chunk.index, chunk.start_s)
+                    with progress_lock:
+                        progress["incomplete"] += 1
+                _done(chunk, segments, resumed=False)
+            finally:
+                in_flight.release()
+
+        futures: List[Future] = []
+        executor = ThreadPoolExecutor(max_workers=self._workers, thread_name_prefix="tv-longform")
+        try:
+            source = blocks if blocks is not None else AudioFileReader(path).windows(STREAM_BLOCK_S)
+            pending: Optional[Chunk] = None  # held back one step so the last chunk is known
+
+            def _submit(chunk: Chunk, last: bool) -> None:
+                chunks.append(chunk)
+                with progress_lock:
+                    progress["planned"] += 1
+                cached = checkpoint.get(chunk)
+                if cached is not None:
+                    _done(chunk, cached, resumed=True)
+                    return
+                in_flight.acquire()
+                futures.append(executor.submit(_decode, chunk, last))
+
+            for block in source:
+                if cancel_event is not None and cancel_event.is_set():
+                    break
+                for chunk in planner.feed(block):
+                    if pending is not None:
+                        _submit(pending, last=False)
+                    pending = chunk
+            if not (cancel_event is not None and cancel_event.is_set()):
+                for chunk in planner.flush():
+                    if pending is not None:
+                        _submit(pending, last=False)
+                    pending = chunk
+                if pending is not None:
+                    _submit(pending, last=True)
+            for future in futures:
+                future.result()
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+        cancelled = cancel_event is not None and cancel_event.is_set()
+        complete = not cancelled and len(results) == len(chunks) and not progress["incomplete"]
+        if complete:
+            checkpoint.finish()
+
+        segments = [seg for i in sorted(results) for seg in results[i]]
+        duration = chunks[-1].end_s if chunks else 0.0
+        processing_ms = (time.perf_counter() - t0) * 1000
+        logger.info("Long-form: %d chunks (%d resumed), %.0fs audio in %.1fs",
+                    len(chunks), progress["resumed"], duration, processing_ms / 1000)
+        return TranscriptionResult(
+            text=" ".join(seg.text for seg in segments),
+            language=lang,
+            confidence=float(np.mean(confidences)) if confidences else 0.0,
+            duration=duration,
+            processing_time_ms=processing_ms,
+            segments=segments,
+            model_name=self._config.model.value,
+            debug_info={
+                "selected_pass": "longform",
+                "chunks": len(chunks),
+                "resumed_chunks": progress["resumed"],
+                "complete": complete,
+                "incomplete_chunks": progress["incomplete"],
+                "checkpoint": str(checkpoint.path),
+                "processing_time_ms": processing_ms,
+            },
+        )
+
+    def unload(self) -> None:
+        for replica in self._replicas:
+            replica.unload()
+
+
+# ----------------------------------------------------------------------
+# CLI: tiltedvoice transcribe
+# ----------------------------------------------------------------------
+
+
+def _format_timestamp(seconds: float) -> str:
+    h, rem = divmod(int(seconds), 3600)
+    m, s = divmod(rem, 60)
+    return f"{h:02d}:{m:02d}:{s:02d}"
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("file", type=Path, help="Audio or video file to transcribe")
+    parser.add_argument("--model", default=WhisperModel.BASE_EN.value, choices=[m.value for m in WhisperModel])
+    parser.add_argument("--device", default="auto", help="cpu, cuda or auto")
+    parser.add_argument("--compute-type", default="auto", help="CTranslate2 compute type")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="Parallel model replicas")
+    parser.add_argument("--checkpoint", type=Path, help="Checkpoint file (default: <file>.tvcheckpoint.json)")
+    parser.add_argument("--output", type=Path, help="Write the transcript here (.json for segments)")
+    parser.add_argument("--timestamps", action="store_true", help="Prefix each line with its start time")
+    parser.set_defaults(func=run_cli)
+
+
+def run_cli(args: argparse.Namespace) -> int:
+    if not args.file.exists():
+        print(f"No such file: {args.file}", file=sys.stderr)
+        return 2
+    config = TranscriberConfig(model=WhisperModel(args.model), device=args.device, compute_type=args.compute_type)
+    longform = LongFormTranscriber(config, workers=args.workers)
+
+    def _progress(seconds: float, done: int, planned: int) -> None:
+        print(f"\r{_format_timestamp(seconds)} transcribed ({done}/{planned} chunks)", end="", file=sys.stderr)
+
+    cancel = threading.Event()
+    try:
+        result = longform.transcribe_file(args.file, checkpoint_path=args.checkpoint,
+                                          cancel_event=cancel, on_progress=_progress)
+    except KeyboardInterrupt:
+        cancel.set()
+        print("\nInterrupted — run again to resume from the checkpoint", file=sys.stderr)
+        return 130
+    finally:
+        longform.unload()
+    print(file=sys.stderr)
+
+    if args.output and args.output.suffix == ".json":
+        text = json.dumps({"text": result.text, "duration": result.duration,
+                           "segments": [asdict(s) for s in result.segments]}, indent=2)
+    elif args.timestamps:
+        text = "\n".join(f"[{_format_timestamp(s.start)}] {s.text}" for s in result.segments)
+    else:
+        text = result.text
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+    if not result.debug_info["complete"]:
+        print(f"{result.debug_info['incomplete_chunks']} chunk(s) were cut short — run again to retry them",
+              file=sys.stderr)
+        return 1
+    return 0
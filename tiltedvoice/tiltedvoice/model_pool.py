@@ -0,0 +1,200 @@
+"""Process-wide pool of loaded faster-whisper models.
+
+Models are keyed by ``(model_name, device, compute_type)`` and shared between
+Transcriber instances with reference counting.  Unreferenced models stay warm
+until the pool exceeds its memory budget, at which point the least recently
+used idle models are evicted.  Switching back to a recently used model is
+therefore free.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from tiltedvoice.models import WhisperModel
+
+logger = logging.getLogger(__name__)
+
+PoolKey = Tuple[str, str, str]
+
+DEFAULT_BUDGET_MB = 2048
+
+
+def _create_whisper_model(model_name: str, device: str, compute_type: str, num_workers: int = 1) -> Any:
+    from faster_whisper import WhisperModel as FasterWhisperModel
+
+    return FasterWhisperModel(model_name, device=device, compute_type=compute_type, num_workers=num_workers)
+
+
+def _estimate_size_mb(model_name: str) -> int:
+    try:
+        return WhisperModel(model_name).size_mb
+    except ValueError:
+        return 0
+
+
+@dataclass
+class _PoolEntry:
+    model: Any
+    size_mb: int
+    refs: int = 0
+    last_used: float = 0.0
+    num_workers: int = 1
+
+
+class ModelPool:
+    """Reference-counted LRU cache of loaded Whisper models under a memory budget."""
+
+    _shared: Optional["ModelPool"] = None
+    _shared_lock = threading.Lock()
+
+    def __init__(
+        self,
+        budget_mb: int = DEFAULT_BUDGET_MB,
+        factory: Optional[Callable[..., Any]] = None,
+    ):
+        self._budget_mb = budget_mb
+        self._factory = factory or _create_whisper_model
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[PoolKey, _PoolEntry]" = OrderedDict()
+        self._key_locks: Dict[PoolKey, threading.Lock] = {}
+
+    @classmethod
+    def shared(cls) -> "ModelPool":
+        """Return the process-wide pool (created on first use)."""
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    # ------------------------------------------------------------------
+    # Acquire / release
+    # ------------------------------------------------------------------
+
+    def acquire(self, model_name: str, device: str, compute_type: str, num_workers: int = 1) -> Any:
+        """Return a loaded model for the key, loading it if needed (refcount +1).
+
+        An idle model loaded with fewer CTranslate2 workers than *num_workers*
+        is reloaded; one that is still in use is shared as-is.
+        """
+        key = (model_name, device, compute_type)
+        with self._key_lock(key):
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None and entry.num_workers < num_workers and entry.refs == 0:
+                    del self._entries[key]
+                    entry = None
+                if entry is not None:
+                    entry.refs += 1
+                    entry.last_used = time.monotonic()
+                    self._entries.move_to_end(key)
+                    logger.info("Model pool hit: %s on %s (%s)", *key)
+                    return entry.model
+
+            logger.info("Model pool miss: loading %s on %s (%s)…", *key)
+            t0 = time.perf_counter()
+            if num_workers > 1:
+                model = self._factory(model_name, device, compute_type, num_workers=num_workers)
+            else:
+                model = self._factory(model_name, device, compute_type)
+            logger.info("Model pool loaded %s in %.1fs", model_name, time.perf_counter() - t0)
+
+            with self._lock:
+                self._entries[key] = _PoolEntry(
+                    model=model,
+                    size_mb=_estimate_size_mb(model_name),
+                    refs=1,
+                    last_used=time.monotonic(),
+                    num_workers=num_workers,
+                )
+                self._evict_locked()
+            return model
+
+    def release(self, model_name: str, device: str, compute_type: str) -> None:
+        """Drop one reference; the model stays warm until evicted by the budget."""
+        key = (model_name, device, compute_type)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+            entry.refs = max(0, entry.refs - 1)
+            self._evict_locked()
+
+    def preload(self, model_name: str, device: str, compute_type: str) -> threading.Thread:
+        """Load a model in a background thread and leave it warm (unreferenced)."""
+
+        def _run():
+            try:
+                self.acquire(model_name, device, compute_type)
+                self.release(model_name, device, compute_type)
+            except Exception as exc:
+                logger.warning("Model preload failed for %s: %s", model_name, exc)
+
+        thread = threading.Thread(target=_run, name="tv-preload", daemon=True)
+        thread.start()
+        return thread
+
+    # ------------------------------------------------------------------
+    # Eviction
+    # ------------------------------------------------------------------
+
+    def evict(self, model_name: str, device: str, compute_type: str) -> bool:
+        """Evict an idle model now. Returns False if it is missing or still in use."""
+        key = (model_name, device, compute_type)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.refs > 0:
+                return False
+            del self._entries[key]
+        logger.info("Model pool evicted %s on %s (%s)", *key)
+        return True
+
+    def clear(self) -> None:
+        """Drop every idle model."""
+        with self._lock:
+            for key in [k for k, e in self._entries.items() if e.refs == 0]:
+                del self._entries[key]
+
+    def _evict_locked(self) -> None:
+        total = sum(e.size_mb for e in self._entries.values())
+        for key in list(self._entries):
+            if total <= self._budget_mb:
+                break
+            entry = self._entries[key]
+            if entry.refs > 0:
+                continue
+            del self._entries[key]
+            total -= entry.size_mb
+            logger.info("Model pool evicted %s on %s (%s) — over %d MB budget", *key, self._budget_mb)
+
+    def _key_lock(self, key: PoolKey) -> threading.Lock:
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    # ------------------------------------------------------------------
+    # Introspection
+    # ------------------------------------------------------------------
+
+    def is_loaded(self, model_name: str, device: str, compute_type: str) -> bool:
+        with self._lock:
+            return (model_name, device, compute_type) in self._entries
+
+    def refcount(self, model_name: str, device: str, compute_type: str) -> int:
+        with self._lock:
+            entry = self._entries.get((model_name, device, compute_type))
+            return entry.refs if entry else 0
+
+    @property
+    def loaded_keys(self) -> List[PoolKey]:
+        """Loaded keys, least recently used first."""
+        with self._lock:
+            return list(self._entries)
+
+    @property
+    def budget_mb(self) -> int:
+        return self._budget_mb
@@ -43,11 +43,29 @@ class RecordingMode(str, Enum):
         names = {
             "push-to-talk": "Push-to-Talk (hold Ctrl+Shift+Space)",
             "toggle": "Toggle (Ctrl+Shift+R)",
-            "auto": "Auto-Listen (energy VAD)",
+            "auto": "Auto-Listen (VAD)",
         }
         return names.get(self.value, self.value)
 
 
+class VADMode(str, Enum):
+    """Speech detector used by auto-listen."""
+
+    ENERGY = "energy"  # fixed RMS threshold
+    ADAPTIVE = "adaptive"  # RMS against a tracked noise floor
+    SILERO = "silero"  # Silero ONNX model on CPU
+
+
+@dataclass
+class TranscriptionWord:
+    """One word with its timing inside the clip."""
+
+    word: str
+    start: float
+    end: float
+    probability: float = 0.0
+
+
 @dataclass
 class TranscriptionSegment:
     """A single transcription segment returned by Whisper."""
@@ -56,6 +74,8 @@ class TranscriptionSegment:
     start: float
     end: float
     confidence: float = 0.0
+    # None until word timings are decoded or aligned (see Transcriber.align_words).
+    words: Optional[List[TranscriptionWord]] = None
 
 
 @dataclass
@@ -87,6 +107,10 @@ class AudioConfig:
     channels: int = 1
     dtype: str = "float32"
     energy_threshold: float = 0.01
+    vad_mode: VADMode = VADMode.ENERGY
+    # Audio kept before the first speech frame / after the last one.
+    pre_roll_ms: int = 300
+    hangover_ms: int = 300
 
 
 @dataclass
@@ -101,6 +125,10 @@ class TranscriberConfig:
     vad_filter: bool = True
     vad_threshold: float = 0.5
     word_timestamps: bool = False
+    # Run the VAD-off fallback pass alongside the VAD pass (needs spare cores).
+    speculative_fallback: bool = False
+    # CTranslate2 model replicas; >1 lets several threads decode at once.
+    num_workers: int = 1
 
 
 @dataclass
@@ -125,6 +153,14 @@ class AppSettings:
     silence_ms: int = 1200
     onboarding_complete: bool = False
     selected_device: str = ""
+    speculative_decoding: bool = False
+    vad_mode: VADMode = VADMode.ENERGY
+    pre_roll_ms: int = 300
+    # Use a smaller model for a clip when the selected one would be too slow here.
+    adaptive_model: bool = False
+    # Show a draft first when a slow model runs on the CPU (opt-in: the
+    # tiny.en draft model is a second download kept in memory).
+    draft_refine: bool = False
 
     def to_dict(self) -> Dict[str, Any]:
         """Serialize settings to a dict for JSON persistence."""
@@ -142,6 +178,11 @@ class AppSettings:
             "silence_ms": self.silence_ms,
             "onboarding_complete": self.onboarding_complete,
             "selected_device": self.selected_device,
+            "speculative_decoding": self.speculative_decoding,
+            "vad_mode": self.vad_mode.value,
+            "pre_roll_ms": self.pre_roll_ms,
+            "adaptive_model": self.adaptive_model,
+            "draft_refine": self.draft_refine,
         }
 
     @classmethod
@@ -156,6 +197,10 @@ class AppSettings:
             mode = RecordingMode(data.get("recording_mode", defaults.recording_mode.value))
         except ValueError:
             mode = defaults.recording_mode
+        try:
+            vad_mode = VADMode(data.get("vad_mode", defaults.vad_mode.value))
+        except ValueError:
+            vad_mode = defaults.vad_mode
         hotkey_data = data.get("hotkeys", {})
         return cls(
             model=model,
@@ -171,4 +216,9 @@ class AppSettings:
             silence_ms=int(data.get("silence_ms", defaults.silence_ms)),
             onboarding_complete=data.get("onboarding_complete", defaults.onboarding_complete),
             selected_device=data.get("selected_device", defaults.selected_device),
+            speculative_decoding=bool(data.get("speculative_decoding", defaults.speculative_decoding)),
+            vad_mode=vad_mode,
+            pre_roll_ms=int(data.get("pre_roll_ms", defaults.pre_roll_ms)),
+            adaptive_model=bool(data.get("adaptive_model", defaults.adaptive_model)),
+            draft_refine=bool(data.get("draft_refine", defaults.draft_refine)),
         )
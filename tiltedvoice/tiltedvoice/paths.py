@@ -0,0 +1,39 @@
+"""Per-user data locations shared by the desktop app and the headless tools."""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+
+def data_dir() -> Path:
+    return Path(os.environ.get("APPDATA", ".")) / "TiltedVoice"
+
+
+def settings_path() -> Path:
+    return data_dir() / "settings.json"
+
+
+def probe_cache_path() -> Path:
+    return data_dir() / "probe_cache.json"
+
+
+def result_cache_dir() -> Path:
+    return data_dir() / "cache"
+
+
+def model_speed_path() -> Path:
+    return data_dir() / "model_speed.json"
+
+
+def history_path() -> Path:
+    return data_dir() / "history.db"
+
+
+def legacy_history_path() -> Path:
+    """JSON history written by versions before the SQLite store; imported once."""
+    return data_dir() / "history.json"
+
+
+def diagnostics_path() -> Path:
+    return data_dir() / "diagnostics.log"
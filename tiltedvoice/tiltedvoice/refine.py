@@ -0,0 +1,143 @@
+"""Draft-then-refine transcription for slow model/device combinations.
+
+small.en and medium.en on CPU can take many seconds before any text shows
+up.  :class:`DraftRefiner` decodes the clip with ``tiny.en`` first and hands
+that draft to the caller right away, then decodes it again with the selected
+model and returns the refined result.  :func:`text_edits` turns the draft
+into the refined text with word-level replacements, so a text widget can
+update only the words that changed.
+
+This is opt-in (``AppSettings.draft_refine``).  When a recording was
+streamed, most of it is already committed by the selected model; only the
+uncommitted tail is decoded with tiny.en (:meth:`DraftRefiner.draft_tail`)
+and shown after the committed text while the stream's final window decodes.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+import threading
+from dataclasses import replace
+from difflib import SequenceMatcher
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from tiltedvoice.models import TranscriptionResult, TranscriptionSegment, WhisperModel
+from tiltedvoice.telemetry import Telemetry
+from tiltedvoice.transcriber import SAMPLE_RATE, Transcriber
+
+logger = logging.getLogger(__name__)
+
+DRAFT_MODEL = WhisperModel.TINY_EN
+# Models slow enough on CPU that a draft is worth the extra decode.
+REFINE_MODELS = frozenset({WhisperModel.SMALL_EN, WhisperModel.MEDIUM_EN})
+
+_TOKEN_RE = re.compile(r"\S+|\s+")
+
+
+def wants_draft(transcriber: Transcriber) -> bool:
+    """True when *transcriber* runs a slow model on the CPU."""
+    return transcriber._config.model in REFINE_MODELS and not transcriber._device_key().startswith("cuda")
+
+
+def text_edits(old: str, new: str) -> List[Tuple[int, int, str]]:
+    """Word-level ``(start, end, replacement)`` edits on *old* that produce *new*.
+
+    Offsets are character positions in *old*, in ascending order; apply them
+    from last to first so earlier offsets stay valid.
+    """
+    a, b = _TOKEN_RE.findall(old), _TOKEN_RE.findall(new)
+    offsets = [0]
+    for token in a:
+        offsets.append(offsets[-1] + len(token))
+    edits = []
+    for op, i1, i2, j1, j2 in SequenceMatcher(None, a, b, autojunk=False).get_opcodes():
+        if op != "equal":
+            edits.append((offsets[i1], offsets[i2], "".join(b[j1:j2])))
+    return edits
+
+
+def apply_edits(text: str, edits: List[Tuple[int, int, str]]) -> str:
+    for start, end, replacement in reversed(edits):
+        text = text[:start] + replacement + text[end:]
+    return text
+
+
+class DraftRefiner:
+    """Decode with a draft model first, then with the selected model.
+
+    The draft transcriber is created on demand from the final one's config
+    and shares its model pool and result cache.
+    """
+
+    def __init__(self, final: Transcriber, draft: Optional[Transcriber] = None):
+        self._final = final
+        self._draft = draft or Transcriber(
+            config=replace(final._config, model=DRAFT_MODEL, speculative_fallback=False),
+            pool=final._pool,
+            cache=final._cache,
+        )
+
+    @property
+    def draft_transcriber(self) -> Transcriber:
+        return self._draft
+
+    def transcribe(
+        self,
+        audio: Union[np.ndarray, str],
+        on_draft: Callable[[TranscriptionResult], None],
+        cancel_event: Optional[threading.Event] = None,
+        on_status: Optional[Callable[[str], None]] = None,
+        on_debug: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ) -> TranscriptionResult:
+        """Deliver the draft through *on_draft*, then return the refined result.
+
+        If the refined decode comes back empty (e.g. it timed out) while the
+        draft had text, the draft is returned instead.
+        """
+        with Telemetry.shared().span("draft_refine", model=self._final._config.model.value):
+            draft = self._draft.transcribe(audio, cancel_event=cancel_event, on_debug=on_debug)
+            cancelled = cancel_event is not None and cancel_event.is_set()
+            if draft.text.strip() and not cancelled:
+                try:
+                    on_draft(draft)
+                except Exception as exc:
+                    logger.error("on_draft callback error: %s", exc)
+            if cancelled:
+                return draft
+
+            if on_status:
+                on_status(f"Refining with {self._final._config.model.value}…")
+            final = self._final.transcribe(audio, cancel_event=cancel_event, on_status=on_status, on_debug=on_debug)
+        draft_info = {"text": draft.text, "model": draft.model_name, "processing_time_ms": draft.processing_time_ms}
+        if not final.text.strip() and draft.text.strip():
+            logger.warning("Refined decode returned no text; keeping the draft")
+            draft.debug_info["draft"] = dict(draft_info, refined=False)
+            return draft
+        final.debug_info["draft"] = dict(draft_info, refined=True)
+        return final
+
+    def draft_tail(
+        self,
+        committed: Sequence[TranscriptionSegment],
+        tail: np.ndarray,
+        cancel_event: Optional[threading.Event] = None,
+        on_debug: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ) -> TranscriptionResult:
+        """Draft for a streamed recording: its *committed* text plus a draft decode of *tail*."""
+        with Telemetry.shared().span("draft_tail", seconds=round(tail.size / float(SAMPLE_RATE), 2)):
+            draft = None
+            if tail.size:
+                draft = self._draft.transcribe(tail, cancel_event=cancel_event, on_debug=on_debug)
+        parts = [seg.text for seg in committed] + ([draft.text] if draft is not None else [])
+        return TranscriptionResult(
+            text=" ".join(p for p in parts if p.strip()).strip(),
+            language=draft.language if draft is not None else self._final._config.language,
+            processing_time_ms=draft.processing_time_ms if draft is not None else 0.0,
+            model_name=self._draft._config.model.value,
+        )
+
+    def unload(self) -> None:
+        self._draft.unload()
@@ -0,0 +1,122 @@
+"""Streaming polyphase resampler for the capture pipeline.
+
+Input devices often only open at 44.1 or 48 kHz while Whisper expects
+16 kHz.  :class:`StreamingResampler` converts chunk by chunk as audio
+arrives, carrying filter history between calls, so the recorder, VAD and
+streaming decoder all see 16 kHz and nothing has to be resampled at stop
+time.
+
+The filter is a Kaiser-windowed sinc designed at the common upsampled rate
+and split into ``up`` polyphase branches; each output sample costs
+``taps_per_phase`` multiply-adds (about 60 per channel).
+"""
+
+from __future__ import annotations
+
+from math import gcd
+
+import numpy as np
+
+DEFAULT_ZERO_CROSSINGS = 10
+DEFAULT_KAISER_BETA = 6.0
+DEFAULT_ROLLOFF = 0.94
+
+
+def _design_polyphase(up: int, down: int, zero_crossings: int, beta: float, rolloff: float) -> np.ndarray:
+    """Return the (up, taps_per_phase) polyphase bank for an up/down resampler."""
+    factor = max(up, down)
+    half = zero_crossings * factor
+    n = np.arange(-half, half + 1, dtype=np.float64)
+    cutoff = rolloff / factor  # fraction of the upsampled Nyquist
+    h = cutoff * np.sinc(cutoff * n) * np.kaiser(n.size, beta) * up
+    taps = -(-h.size // up)
+    h = np.concatenate([h, np.zeros(taps * up - h.size)])
+    # bank[p, k] = h[p + k * up]
+    return h.reshape(taps, up).T.astype(np.float32)
+
+
+class StreamingResampler:
+    """Resample interleaved float32 audio from *in_rate* to *out_rate* in chunks.
+
+    Call :meth:`process` with consecutive chunks; each call returns the
+    output samples that can be produced so far.  The filter's group delay is
+    compensated, so output sample *m* lines up with time ``m / out_rate``;
+    the last few output samples are produced once the next chunk arrives.
+    """
+
+    def __init__(
+        self,
+        in_rate: int,
+        out_rate: int = 16_000,
+        channels: int = 1,
+        zero_crossings: int = DEFAULT_ZERO_CROSSINGS,
+        beta: float = DEFAULT_KAISER_BETA,
+        rolloff: float = DEFAULT_ROLLOFF,
+    ):
+        if in_rate <= 0 or out_rate <= 0:
+            raise ValueError(f"Invalid sample rates: {in_rate} -> {out_rate}")
+        g = gcd(int(in_rate), int(out_rate))
+        self.in_rate = int(in_rate)
+        self.out_rate = int(out_rate)
+        self.up = self.out_rate // g
+        self.down = self.in_rate // g
+        self.channels = max(1, int(channels))
+        self._bank = _design_polyphase(self.up, self.down, zero_crossings, beta, rolloff)
+        self._taps = self._bank.shape[1]
+        self._half = zero_crossings * max(self.up, self.down)  # filter centre, upsampled units
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget filter history (start of a new stream)."""
+        # History starts as zeros at input indices [-taps, 0).
+        self._history = np.zeros((self._taps, self.channels), dtype=np.float32)
+        self._history_start = -self._taps
+        self._n_in = 0
+        self._n_out = 0
+
+    @property
+    def passthrough(self) -> bool:
+        return self.up == self.down
+
+    def process(self, chunk: np.ndarray) -> np.ndarray:
+        """Resample one chunk; returns interleaved float32 at ``out_rate``."""
+        frames = np.asarray(chunk, dtype=np.float32).reshape(-1, self.channels)
+        if self.passthrough:
+            return frames.reshape(-1)
+        buf = np.concatenate([self._history, frames])
+        buf_start = self._history_start
+        self._n_in += frames.shape[0]
+
+        # Output m is centred on upsampled position m * down and needs input
+        # up to floor((m * down + half) / up).
+        m_end = max(self._n_out, -(-(self._n_in * self.up - self._half) // self.down))
+        m = np.arange(self._n_out, m_end, dtype=np.int64)
+        if m.size:
+            pos = m * self.down + self._half
+            base = pos // self.up - buf_start
+            phase = pos % self.up
+            idx = base[:, None] - np.arange(self._taps)[None, :]
+            # (M, K, C) samples weighted by (M, K) coefficients
+            out = np.einsum("mkc,mk->mc", buf[idx], self._bank[phase])
+            self._n_out = int(m_end)
+        else:
+            out = np.zeros((0, self.channels), dtype=np.float32)
+
+        keep = min(buf.shape[0], self._taps + 1)
+        self._history = buf[-keep:].copy()
+        self._history_start = buf_start + buf.shape[0] - keep
+        return out.astype(np.float32, copy=False).reshape(-1)
+
+    def flush(self) -> np.ndarray:
+        """Return the output still held back for look-ahead and reset for a new stream."""
+        if self.passthrough:
+            return np.zeros(0, dtype=np.float32)
+        expected = -(-self._n_in * self.up // self.down)
+        missing = expected - self._n_out
+        if missing <= 0:
+            self.reset()
+            return np.zeros(0, dtype=np.float32)
+        pad = -(-self._half // self.up) + 1
+        out = self.process(np.zeros(pad * self.channels, dtype=np.float32))
+        self.reset()
+        return out[:missing * self.channels]
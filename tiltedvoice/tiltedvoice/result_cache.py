@@ -0,0 +1,219 @@
+"""On-disk cache of transcription results, addressed by audio content.
+
+Entries are keyed by a BLAKE2 hash of the audio samples (or file bytes)
+combined with everything that changes the decoder output — model, language,
+beam size and VAD setting.  Each entry is a small JSON file; the directory
+is kept under a byte budget by evicting the least recently used entries
+(access time is tracked through the file mtime, which a hit refreshes).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+import numpy as np
+
+from tiltedvoice.models import TranscriberConfig, TranscriptionResult, TranscriptionSegment, TranscriptionWord
+
+logger = logging.getLogger(__name__)
+
+CACHE_VERSION = 1
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+_HASH_BLOCK = 1 << 20
+
+
+def audio_fingerprint(audio: Union[np.ndarray, str, os.PathLike]) -> str:
+    """Fast content hash of float32 samples or of an audio file's bytes."""
+    h = hashlib.blake2b(digest_size=16)
+    if isinstance(audio, np.ndarray):
+        data = np.ascontiguousarray(audio, dtype=np.float32).reshape(-1)
+        h.update(b"pcm:")
+        h.update(data.size.to_bytes(8, "little"))
+        h.update(memoryview(data).cast("B"))
+    else:
+        h.update(b"file:")
+        with open(audio, "rb") as f:
+            for block in iter(lambda: f.read(_HASH_BLOCK), b""):
+                h.update(block)
+    return h.hexdigest()
+
+
+def cache_key(fingerprint: str, config: TranscriberConfig, language: str, variant: Optional[str] = None) -> str:
+    """Combine an audio fingerprint with the decoding settings that affect the text.
+
+    *variant* names a decode path whose results differ in shape from
+    :meth:`Transcriber.transcribe` (e.g. ``"batch"``), so they are kept apart.
+    """
+    params = {
+        "v": CACHE_VERSION,
+        "audio": fingerprint,
+        "model": config.model.value,
+        "language": language,
+        "beam_size": config.beam_size,
+        "vad_filter": config.vad_filter,
+        "word_timestamps": config.word_timestamps,
+    }
+    if variant:
+        params["variant"] = variant
+    return hashlib.blake2b(json.dumps(params, sort_keys=True).encode(), digest_size=16).hexdigest()
+
+
+class ResultCache:
+    """Size-bounded LRU cache of :class:`TranscriptionResult` objects on disk."""
+
+    def __init__(self, directory: Union[str, Path], max_bytes: int = DEFAULT_MAX_BYTES):
+        self._dir = Path(directory)
+        self._max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._index: Optional[Dict[str, int]] = None  # key -> size, built lazily
+        self._total = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[TranscriptionResult]:
+        path = self._path(key)
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+            os.utime(path)  # mark as recently used
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except Exception as exc:
+            logger.debug("Dropping unreadable cache entry %s: %s", key, exc)
+            self._remove(key)
+            self.misses += 1
+            return None
+        self.hits += 1
+        return self._decode(data)
+
+    def put(self, key: str, result: TranscriptionResult) -> None:
+        payload = json.dumps(self._encode(result), ensure_ascii=False).encode("utf-8")
+        path = self._path(key)
+        with self._lock:
+            index = self._load_index()
+            try:
+                self._dir.mkdir(parents=True, exist_ok=True)
+                tmp = path.with_suffix(".tmp")
+                tmp.write_bytes(payload)
+                os.replace(tmp, path)
+            except Exception as exc:
+                logger.debug("Could not write cache entry %s: %s", key, exc)
+                return
+            self._total += len(payload) - index.get(key, 0)
+            index[key] = len(payload)
+            self._evict_locked(keep=key)
+
+    def clear(self) -> None:
+        with self._lock:
+            for key in list(self._load_index()):
+                self._unlink(key)
+            self._index = {}
+            self._total = 0
+
+    @property
+    def size_bytes(self) -> int:
+        with self._lock:
+            self._load_index()
+            return self._total
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._load_index())
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _path(self, key: str) -> Path:
+        return self._dir / f"{key}.json"
+
+    def _load_index(self) -> Dict[str, int]:
+        if self._index is None:
+            self._index = {}
+            if self._dir.is_dir():
+                for entry in self._dir.glob("*.json"):
+                    try:
+                        self._index[entry.stem] = entry.stat().st_size
+                    except OSError:
+                        pass
+            self._total = sum(self._index.values())
+        return self._index
+
+    def _evict_locked(self, keep: str) -> None:
+        if self._total <= self._max_bytes:
+            return
+        index = self._load_index()
+
+        def _mtime(key: str) -> float:
+            try:
+                return self._path(key).stat().st_mtime
+            except OSError:
+                return 0.0
+
+        for key in sorted(index, key=_mtime):
+            if self._total <= self._max_bytes:
+                break
+            if key == keep:
+                continue
+            self._unlink(key)
+            self._total -= index.pop(key)
+
+    def _remove(self, key: str) -> None:
+        with self._lock:
+            index = self._load_index()
+            self._unlink(key)
+            self._total -= index.pop(key, 0)
+
+    def _unlink(self, key: str) -> None:
+        try:
+            self._path(key).unlink()
+        except FileNotFoundError:
+            pass
+        except OSError as exc:
+            logger.debug("Could not remove cache entry %s: %s", key, exc)
+
+    @staticmethod
+    def _encode(result: TranscriptionResult) -> Dict[str, Any]:
+        return {
+            "text": result.text,
+            "language": result.language,
+            "confidence": result.confidence,
+            "duration": result.duration,
+            "segments": [asdict(seg) for seg in result.segments],
+            "model_name": result.model_name,
+            # A re-stored cache hit keeps the pass that originally produced it.
+            "selected_pass": result.debug_info.get("cached_pass", result.debug_info.get("selected_pass")),
+            "processing_time_ms": result.processing_time_ms,
+            "stored_at": time.time(),
+        }
+
+    @staticmethod
+    def _decode(data: Dict[str, Any]) -> TranscriptionResult:
+        return TranscriptionResult(
+            text=data["text"],
+            language=data.get("language", "en"),
+            confidence=float(data.get("confidence", 0.0)),
+            duration=float(data.get("duration", 0.0)),
+            segments=[ResultCache._decode_segment(seg) for seg in data.get("segments", [])],
+            model_name=data.get("model_name", ""),
+            debug_info={
+                "selected_pass": "cache",
+                "cached_pass": data.get("selected_pass"),
+                "original_processing_time_ms": data.get("processing_time_ms"),
+            },
+        )
+
+    @staticmethod
+    def _decode_segment(data: Dict[str, Any]) -> TranscriptionSegment:
+        words = data.pop("words", None)
+        if words is not None:
+            words = [TranscriptionWord(**w) for w in words]
+        return TranscriptionSegment(words=words, **data)
@@ -0,0 +1,196 @@
+"""Adaptive model selection from measured decode speed.
+
+:class:`ModelScheduler` keeps a running real-time factor (decode seconds per
+audio second) for every model this machine has decoded with, per device and
+compute type.  For each clip it picks the largest model — up to the one the
+user selected — that is predicted to finish within the latency target, and
+drops to a smaller model when the selected one would be too slow.  Models
+that have not run yet are extrapolated from measured ones by their relative
+cost.  Estimates persist as JSON so the next start is already calibrated.
+
+A model is only re-measured when it runs, so every ``EXPLORE_EVERY``-th clip
+that would be downgraded goes one size up instead; one slow outlier can then
+not lock a model out for good.
+
+Only whole-clip decodes are routed: a streamed recording has no known length
+when it starts and decodes with the selected model.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Optional
+
+from tiltedvoice.models import WhisperModel
+
+logger = logging.getLogger(__name__)
+
+ESTIMATES_VERSION = 1
+
+# Smallest first.  Relative decode cost is only used to extrapolate to models
+# that have not been measured on this device yet.
+MODEL_ORDER = (WhisperModel.TINY_EN, WhisperModel.BASE_EN, WhisperModel.SMALL_EN, WhisperModel.MEDIUM_EN)
+RELATIVE_COST = {
+    WhisperModel.TINY_EN: 1.0,
+    WhisperModel.BASE_EN: 1.8,
+    WhisperModel.SMALL_EN: 5.0,
+    WhisperModel.MEDIUM_EN: 12.0,
+}
+
+DEFAULT_TARGET_RATIO = 0.3  # 1.5 s for a 5 s clip
+DEFAULT_MIN_TARGET_S = 1.0
+# Every decode has a fixed cost, so very short clips are billed as this long.
+MIN_BILLED_AUDIO_S = 1.0
+EWMA_ALPHA = 0.3
+# One in this many downgraded clips tries the next model up, to re-measure it.
+EXPLORE_EVERY = 20
+# Timeout budget as a multiple of the predicted decode time.
+BUDGET_FACTOR = 4.0
+MAX_BUDGET_S = 240.0
+
+
+class ModelScheduler:
+    """Running real-time-factor estimates and per-clip model choice."""
+
+    def __init__(
+        self,
+        target_ratio: float = DEFAULT_TARGET_RATIO,
+        min_target_s: float = DEFAULT_MIN_TARGET_S,
+        path: Optional[Path] = None,
+    ):
+        self.target_ratio = target_ratio
+        self.min_target_s = min_target_s
+        self._path = Path(path) if path else None
+        self._lock = threading.Lock()
+        # "<model>@<device>/<compute>" -> {"rtf": float, "samples": int}
+        self._estimates: Dict[str, Dict[str, float]] = self._load()
+        self._downgrades = 0
+
+    @staticmethod
+    def _key(model: WhisperModel, device_key: str) -> str:
+        return f"{model.value}@{device_key}"
+
+    # ------------------------------------------------------------------
+    # Estimates
+    # ------------------------------------------------------------------
+
+    def observe(self, model: WhisperModel, device_key: str, audio_s: float, elapsed_s: float) -> None:
+        """Fold one finished decode into the running estimate."""
+        if audio_s <= 0 or elapsed_s <= 0:
+            return
+        rtf = elapsed_s / max(audio_s, MIN_BILLED_AUDIO_S)
+        key = self._key(model, device_key)
+        with self._lock:
+            entry = self._estimates.get(key)
+            if entry is None:
+                entry = self._estimates[key] = {"rtf": rtf, "samples": 0}
+            else:
+                entry["rtf"] += EWMA_ALPHA * (rtf - entry["rtf"])
+            entry["samples"] += 1
+            snapshot = {k: dict(v) for k, v in self._estimates.items()}
+        logger.debug("RTF %s: %.3f (estimate %.3f)", key, rtf, entry["rtf"])
+        self._save(snapshot)
+
+    def rtf(self, model: WhisperModel, device_key: str) -> Optional[float]:
+        """Measured RTF, else one extrapolated from the nearest measured model, else None."""
+        with self._lock:
+            entry = self._estimates.get(self._key(model, device_key))
+            if entry is not None:
+                return entry["rtf"]
+            measured = [
+                (abs(MODEL_ORDER.index(m) - MODEL_ORDER.index(model)), m, e["rtf"])
+                for m in MODEL_ORDER
+                for e in [self._estimates.get(self._key(m, device_key))]
+                if e is not None
+            ]
+        if not measured:
+            return None
+        _, ref, ref_rtf = min(measured, key=lambda t: t[0])
+        return ref_rtf * RELATIVE_COST[model] / RELATIVE_COST[ref]
+
+    def predict_s(self, model: WhisperModel, device_key: str, audio_s: float) -> Optional[float]:
+        rtf = self.rtf(model, device_key)
+        if rtf is None:
+            return None
+        return rtf * max(audio_s, MIN_BILLED_AUDIO_S)
+
+    # ------------------------------------------------------------------
+    # Decisions
+    # ------------------------------------------------------------------
+
+    def target_s(self, audio_s: float) -> float:
+        return max(self.min_target_s, self.target_ratio * audio_s)
+
+    def choose(self, ceiling: WhisperModel, device_key: str, audio_s: float) -> WhisperModel:
+        """Largest model up to *ceiling* predicted to meet the latency target.
+
+        With no measurements on this device the user's model is used as is
+        (its first decode calibrates the estimates).  If nothing meets the
+        target, the smallest model is used.  Every ``EXPLORE_EVERY``-th
+        downgrade picks the next model up instead, so its estimate recovers
+        if the device has got faster.
+        """
+        if ceiling not in MODEL_ORDER:
+            return ceiling
+        candidates = MODEL_ORDER[:MODEL_ORDER.index(ceiling) + 1]
+        target = self.target_s(audio_s)
+        chosen = candidates[0]
+        for model in reversed(candidates):
+            predicted = self.predict_s(model, device_key, audio_s)
+            if predicted is None:
+                return ceiling
+            if predicted <= target:
+                chosen = model
+                break
+        if chosen == ceiling:
+            return chosen
+        with self._lock:
+            self._downgrades += 1
+            explore = self._downgrades % EXPLORE_EVERY == 0
+        if explore:
+            chosen = candidates[candidates.index(chosen) + 1]
+            logger.info("Scheduler trying %s to re-measure its speed", chosen.value)
+        return chosen
+
+    def timeout_budget_s(self, model: WhisperModel, device_key: str, audio_s: float, default_s: float) -> float:
+        """Widen *default_s* when this device is predicted to need longer."""
+        predicted = self.predict_s(model, device_key, audio_s)
+        if predicted is None:
+            return default_s
+        return min(MAX_BUDGET_S, max(default_s, predicted * BUDGET_FACTOR))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._estimates = {}
+        self._save({})
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def _load(self) -> Dict[str, Dict[str, float]]:
+        if self._path is None or not self._path.exists():
+            return {}
+        try:
+            data = json.loads(self._path.read_text(encoding="utf-8"))
+            if data.get("version") != ESTIMATES_VERSION:
+                return {}
+            return {k: {"rtf": float(v["rtf"]), "samples": int(v["samples"])} for k, v in data["models"].items()}
+        except Exception as exc:
+            logger.debug("Ignoring unreadable model speed file: %s", exc)
+            return {}
+
+    def _save(self, estimates: Dict[str, Dict[str, float]]) -> None:
+        if self._path is None:
+            return
+        try:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self._path.with_suffix(".tmp")
+            tmp.write_text(json.dumps({"version": ESTIMATES_VERSION, "models": estimates}), encoding="utf-8")
+            os.replace(tmp, self._path)
+        except Exception as exc:
+            logger.debug("Could not save model speed file: %s", exc)
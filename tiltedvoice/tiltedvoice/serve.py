@@ -0,0 +1,797 @@
+"""Headless transcription daemon: ``tiltedvoice serve``.
+
+One process owns the microphone and a warm :class:`Transcriber`; editors,
+scripts and the browser extension talk to it over a small JSON/HTTP API on
+localhost instead of each loading its own model.
+
+=======  =====================  ==============================================
+Method   Path                   Action
+=======  =====================  ==============================================
+GET      ``/status``            Model, recording state and queue counters
+POST     ``/transcribe``        Queue a file: ``{"path", "language"?, "longform"?}``
+GET      ``/jobs``              Recent jobs
+GET      ``/jobs/<id>``         One job; ``?wait=<s>`` blocks until it finishes
+DELETE   ``/jobs/<id>``         Cancel a queued or running job
+POST     ``/record/start``      Start recording from the configured microphone
+POST     ``/record/stop``       Stop recording and queue the final decode
+GET      ``/events``            Server-sent events: partials and job updates
+=======  =====================  ==============================================
+
+Decodes run on a bounded job queue: ``--workers`` at a time, each on its own
+Transcriber replica (long-form files included), ``--max-queue`` waiting and
+429 beyond that.  The live recording has a Transcriber of its own, and a new
+recording is refused (409) until the previous one's final decode is done.
+
+The server only binds to loopback by default, rejects requests whose ``Host``
+is not this server (DNS rebinding) or whose ``Origin`` is not listed with
+``--allow-origin``, and can require a bearer token (``--token`` or
+``TILTEDVOICE_SERVE_TOKEN``).
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import queue
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from enum import Enum
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from tiltedvoice import __version__, paths
+from tiltedvoice.model_pool import ModelPool
+from tiltedvoice.models import AppSettings, AudioConfig, TranscriberConfig, TranscriptionResult, WhisperModel
+from tiltedvoice.result_cache import ResultCache
+from tiltedvoice.scheduler import ModelScheduler
+from tiltedvoice.streaming import StreamingTranscriber
+from tiltedvoice.transcriber import SAMPLE_RATE, Transcriber
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 47820
+DEFAULT_WORKERS = 1
+DEFAULT_MAX_QUEUE = 16
+# Finished jobs kept for GET /jobs/<id>.
+KEEP_FINISHED = 200
+MAX_WAIT_S = 300.0
+EVENT_QUEUE_SIZE = 256
+SSE_KEEPALIVE_S = 15.0
+MAX_BODY_BYTES = 64 * 1024
+TOKEN_ENV = "TILTEDVOICE_SERVE_TOKEN"
+# Host header names always accepted, besides the bound address and --allow-host
+LOOPBACK_HOSTS = ("127.0.0.1", "localhost", "::1")
+_WILDCARD_HOSTS = ("", "0.0.0.0", "::")
+
+
+class JobStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+@dataclass
+class Job:
+    """One queued decode and, once finished, its result."""
+
+    kind: str
+    detail: Dict[str, Any] = field(default_factory=dict)
+    id: str = field(default_factory=lambda: uuid.uuid4().hex[:12])
+    status: JobStatus = JobStatus.QUEUED
+    created: float = field(default_factory=time.time)
+    started: Optional[float] = None
+    finished: Optional[float] = None
+    result: Optional[TranscriptionResult] = None
+    error: Optional[str] = None
+    cancel_event: threading.Event = field(default_factory=threading.Event, repr=False)
+    done: threading.Event = field(default_factory=threading.Event, repr=False)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "detail": self.detail,
+            "status": self.status.value,
+            "created": self.created,
+            "started": self.started,
+            "finished": self.finished,
+            "error": self.error,
+            "result": asdict(self.result) if self.result is not None else None,
+        }
+
+
+class QueueFullError(RuntimeError):
+    """Raised by :meth:`JobQueue.submit` when ``max_pending`` jobs are waiting."""
+
+
+class EventHub:
+    """Fan out events to any number of subscribers (one bounded queue each)."""
+
+    def __init__(self, maxsize: int = EVENT_QUEUE_SIZE):
+        self._maxsize = maxsize
+        self._lock = threading.Lock()
+        self._subscribers: List["queue.Queue[Optional[Dict[str, Any]]]"] = []
+
+    def subscribe(self) -> "queue.Queue[Optional[Dict[str, Any]]]":
+        q: "queue.Queue[Optional[Dict[str, Any]]]" = queue.Queue(self._maxsize)
+        with self._lock:
+            self._subscribers.append(q)
+        return q
+
+    def unsubscribe(self, q: "queue.Queue[Optional[Dict[str, Any]]]") -> None:
+        with self._lock:
+            if q in self._subscribers:
+                self._subscribers.remove(q)
+
+    def publish(self, event: Optional[Dict[str, Any]]) -> None:
+        """Deliver *event* to every subscriber; slow ones lose their oldest events."""
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for q in subscribers:
+            while True:
+                try:
+                    q.put_nowait(event)
+                    break
+                except queue.Full:
+                    try:
+                        q.get_nowait()
+                    except queue.Empty:
+                        pass
+
+    def close(self) -> None:
+        self.publish(None)
+
+
+class JobQueue:
+    """Run jobs on a fixed number of workers with a bounded backlog."""
+
+    def __init__(
+        self,
+        max_workers: int = DEFAULT_WORKERS,
+        max_pending: int = DEFAULT_MAX_QUEUE,
+        on_change: Optional[Callable[[Job], None]] = None,
+    ):
+        self.max_workers = max(1, int(max_workers))
+        self.max_pending = max(0, int(max_pending))
+        self._on_change = on_change
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="tv-serve-job")
+        self._lock = threading.Lock()
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+
+    def submit(self, job: Job, fn: Callable[[Job], TranscriptionResult]) -> Job:
+        with self._lock:
+            if self._count_locked(JobStatus.QUEUED) >= self.max_pending:
+                raise QueueFullError(f"{self.max_pending} jobs already waiting")
+            self._jobs[job.id] = job
+            self._trim_locked()
+        self._notify(job)
+        self._executor.submit(self._run, job, fn)
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def jobs(self) -> List[Job]:
+        with self._lock:
+            return list(self._jobs.values())
+
+    def cancel(self, job_id: str) -> Optional[Job]:
+        job = self.get(job_id)
+        if job is None:
+            return None
+        job.cancel_event.set()
+        with self._lock:
+            queued = job.status == JobStatus.QUEUED
+            if queued:
+                self._finish_locked(job, JobStatus.CANCELLED)
+        if queued:
+            self._notify(job)
+        return job
+
+    def count(self, status: JobStatus) -> int:
+        with self._lock:
+            return self._count_locked(status)
+
+    def _count_locked(self, status: JobStatus) -> int:
+        return sum(1 for job in self._jobs.values() if job.status == status)
+
+    def shutdown(self) -> None:
+        for job in self.jobs():
+            if job.status in (JobStatus.QUEUED, JobStatus.RUNNING):
+                self.cancel(job.id)
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def _run(self, job: Job, fn: Callable[[Job], TranscriptionResult]) -> None:
+        with self._lock:
+            if job.status != JobStatus.QUEUED:
+                return
+            job.status = JobStatus.RUNNING
+            job.started = time.time()
+        self._notify(job)
+        try:
+            result = fn(job)
+            status = JobStatus.CANCELLED if job.cancel_event.is_set() else JobStatus.DONE
+            with self._lock:
+                job.result = result
+                self._finish_locked(job, status)
+        except Exception as exc:
+            logger.error("Job %s (%s) failed: %s", job.id, job.kind, exc)
+            with self._lock:
+                job.error = str(exc)
+                self._finish_locked(job, JobStatus.FAILED)
+        self._notify(job)
+
+    def _finish_locked(self, job: Job, status: JobStatus) -> None:
+        job.status = status
+        job.finished = time.time()
+        job.done.set()
+
+    def _trim_locked(self) -> None:
+        finished = [j.id for j in self._jobs.values() if j.done.is_set()]
+        for job_id in finished[:max(0, len(finished) - KEEP_FINISHED)]:
+            del self._jobs[job_id]
+
+    def _notify(self, job: Job) -> None:
+        if self._on_change is not None:
+            try:
+                self._on_change(job)
+            except Exception as exc:
+                logger.debug("Job change callback error: %s", exc)
+
+
+class ServiceBusyError(RuntimeError):
+    """A recording is already running (or not running, for stop)."""
+
+
+class TranscriptionService:
+    """The daemon's state: warm transcribers, the microphone and the job queue.
+
+    A Transcriber decodes one clip at a time (and starts each pass's timeout
+    when the clip is handed to it), so every job worker checks out its own
+    replica, and live recording has one more.  They all share one pooled
+    model loaded with a CTranslate2 worker per replica, as in
+    :class:`~tiltedvoice.longform.LongFormTranscriber`.
+    """
+
+    def __init__(
+        self,
+        settings: Optional[AppSettings] = None,
+        transcriber: Optional[Transcriber] = None,
+        max_workers: int = DEFAULT_WORKERS,
+        max_pending: int = DEFAULT_MAX_QUEUE,
+        replicas: Optional[List[Transcriber]] = None,
+    ):
+        self.settings = settings or AppSettings()
+        if transcriber is not None and replicas is None:
+            replicas = [transcriber]  # a single injected transcriber serves everything
+        workers = max(1, int(replicas and len(replicas) or max_workers))
+        if transcriber is None:
+            config = TranscriberConfig(
+                model=self.settings.model,
+                language=self.settings.language,
+                speculative_fallback=self.settings.speculative_decoding,
+                num_workers=workers + 1,
+            )
+            cache = ResultCache(paths.result_cache_dir())
+            scheduler = ModelScheduler(path=paths.model_speed_path()) if self.settings.adaptive_model else None
+
+            def _make() -> Transcriber:
+                return Transcriber(config=config, pool=ModelPool.shared(), cache=cache, scheduler=scheduler)
+
+            transcriber = _make()
+            if replicas is None:
+                replicas = [_make() for _ in range(workers)]
+        self._transcriber = transcriber  # live recording
+        self._replicas = list(replicas)  # one per job worker
+        self._idle: "queue.Queue[Transcriber]" = queue.Queue()
+        for replica in self._replicas:
+            self._idle.put(replica)
+        self.events = EventHub()
+        self.jobs = JobQueue(workers, max_pending, on_change=self._on_job_change)
+        self._lock = threading.Lock()
+        self._mic_manager = None
+        self._recorder = None
+        self._stream: Optional[StreamingTranscriber] = None
+        self._recording_job: Optional[Job] = None  # final decode of the last recording
+        self._recording_started: Optional[float] = None
+
+    @property
+    def transcriber(self) -> Transcriber:
+        return self._transcriber
+
+    def preload(self) -> threading.Thread:
+        return self._transcriber.preload()
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "version": __version__,
+            "model": self._transcriber._config.model.value,
+            "model_loaded": self._transcriber.is_loaded,
+            "recording": self._recorder is not None,
+            "recording_s": round(time.monotonic() - self._recording_started, 2) if self._recording_started else 0.0,
+            "jobs": {s.value: self.jobs.count(s) for s in (JobStatus.QUEUED, JobStatus.RUNNING)},
+            "workers": self.jobs.max_workers,
+            "max_queue": self.jobs.max_pending,
+        }
+
+    # ------------------------------------------------------------------
+    # Files
+    # ------------------------------------------------------------------
+
+    def transcribe_file(self, path: str, language: Optional[str] = None, longform: bool = False) -> Job:
+        if not os.path.isfile(path):
+            raise FileNotFoundError(path)
+        job = Job(kind="longform" if longform else "file", detail={"path": path})
+
+        def _run(job: Job) -> TranscriptionResult:
+            if longform:
+                return self._transcribe_long(job, path, language)
+            with self._replica() as transcriber:
+                return transcriber.transcribe(
+                    path, language=language, cancel_event=job.cancel_event, on_status=self._status_cb(job)
+                )
+
+        return self.jobs.submit(job, _run)
+
+    @contextmanager
+    def _replica(self) -> Iterator[Transcriber]:
+        """Check out an idle job replica (there is one per worker, so none waits)."""
+        transcriber = self._idle.get()
+        try:
+            yield transcriber
+        finally:
+            self._idle.put(transcriber)
+
+    def _transcribe_long(self, job: Job, path: str, language: Optional[str]) -> TranscriptionResult:
+        from tiltedvoice.longform import LongFormTranscriber
+
+        def _progress(seconds: float, done: int, planned: int) -> None:
+            self.events.publish({"type": "progress", "job": job.id, "seconds": round(seconds, 1),
+                                 "chunks_done": done, "chunks_planned": planned})
+
+        # Chunks decode one at a time on this job's replica, so --workers still bounds concurrency
+        with self._replica() as transcriber:
+            longform = LongFormTranscriber(transcriber._config, replicas=[transcriber])
+            return longform.transcribe_file(path, language=language, cancel_event=job.cancel_event,
+                                            on_progress=_progress)
+
+    # ------------------------------------------------------------------
+    # Microphone
+    # ------------------------------------------------------------------
+
+    def start_recording(self) -> Dict[str, Any]:
+        # Imported here so file transcription works on machines without PortAudio.
+        from tiltedvoice.audio import MicrophoneManager, VoiceRecorder
+
+        with self._lock:
+            if self._recorder is not None:
+                raise ServiceBusyError("Already recording")
+            previous = self._recording_job
+            if previous is not None and previous.status in (JobStatus.QUEUED, JobStatus.RUNNING):
+                # Its final decode still runs on the live Transcriber
+                raise ServiceBusyError("Previous recording is still being transcribed")
+            if self._mic_manager is None:
+                self._mic_manager = MicrophoneManager(probe_cache_path=paths.probe_cache_path())
+            device_idx = self._selected_device_index()
+            if device_idx is not None:
+                self._mic_manager.probe_device(device_idx)
+            engine = self._mic_manager.capture_engine(device_idx, output_rate=SAMPLE_RATE)
+            config = AudioConfig(
+                sample_rate=engine.sample_rate,
+                energy_threshold=self.settings.energy_threshold,
+                vad_mode=self.settings.vad_mode,
+                pre_roll_ms=self.settings.pre_roll_ms,
+            )
+            recorder = VoiceRecorder(
+                config=config,
+                device_index=device_idx,
+                silence_ms=self.settings.silence_ms,
+                device_dtype=engine.dtype,
+                engine=engine,
+            )
+            self._stream = StreamingTranscriber(self._transcriber, on_update=self._on_partial).start()
+            recorder.start_manual_recording(on_chunk=self._stream.feed)
+            self._recorder = recorder
+            self._recording_started = time.monotonic()
+        self.events.publish({"type": "recording", "recording": True})
+        return {"recording": True, "device_index": device_idx, "max_duration_s": recorder.MAX_DURATION_S}
+
+    def stop_recording(self) -> Optional[Job]:
+        """Stop the microphone and queue the final decode; None if nothing was captured."""
+        job = Job(kind="recording")
+        with self._lock:
+            recorder, stream = self._recorder, self._stream
+            if recorder is None:
+                raise ServiceBusyError("Not recording")
+            self._recorder = self._stream = None
+            self._recording_started = None
+            # Held from now on, so start_recording() waits for this decode
+            self._recording_job = job
+        audio = recorder.stop_manual_recording()
+        self.events.publish({"type": "recording", "recording": False})
+        if audio is None:
+            if stream is not None:
+                stream.cancel()
+            self._release_recording_job(job)
+            return None
+        job.detail["duration_s"] = round(len(audio) / float(SAMPLE_RATE), 2)
+
+        def _run(job: Job) -> TranscriptionResult:
+            result = stream.finish() if stream is not None else None
+            if result is not None and not job.cancel_event.is_set():
+                result = stream.decode_tail(result, cancel_event=job.cancel_event, on_status=self._status_cb(job))
+            if result is None or (not result.text.strip() and not job.cancel_event.is_set()):
+                result = self._transcriber.transcribe(
+                    audio, cancel_event=job.cancel_event, on_status=self._status_cb(job)
+                )
+            return result
+
+        try:
+            return self.jobs.submit(job, _run)
+        except QueueFullError:
+            if stream is not None:
+                stream.cancel()
+            self._release_recording_job(job)
+            raise
+
+    def _release_recording_job(self, job: Job) -> None:
+        with self._lock:
+            if self._recording_job is job:
+                self._recording_job = None
+
+    def _selected_device_index(self) -> Optional[int]:
+        name = self.settings.selected_device
+        if not name or name == "Default":
+            return None
+        for device in self._mic_manager.list_devices():
+            if device["name"] == name:
+                return device["index"]
+        return None
+
+    # ------------------------------------------------------------------
+    # Events
+    # ------------------------------------------------------------------
+
+    def _on_partial(self, segments, final: bool) -> None:
+        self.events.publish({
+            "type": "committed" if final else "partial",
+            "text": " ".join(seg.text for seg in segments),
+            "segments": [asdict(seg) for seg in segments],
+        })
+
+    def _on_job_change(self, job: Job) -> None:
+        event = {"type": "job", "id": job.id, "kind": job.kind, "status": job.status.value}
+        if job.result is not None:
+            event["text"] = job.result.text
+        if job.error:
+            event["error"] = job.error
+        self.events.publish(event)
+
+    def _status_cb(self, job: Job) -> Callable[[str], None]:
+        return lambda msg: self.events.publish({"type": "status", "job": job.id, "message": msg})
+
+    def shutdown(self) -> None:
+        with self._lock:
+            recorder, stream = self._recorder, self._stream
+            self._recorder = self._stream = None
+        if recorder is not None:
+            recorder.stop_manual_recording()
+        if stream is not None:
+            stream.cancel()
+        self.jobs.shutdown()
+        self.events.close()
+        if self._mic_manager is not None:
+            self._mic_manager.close_engines()
+        self._transcriber.unload()
+        for replica in self._replicas:
+            replica.unload()
+
+
+# ----------------------------------------------------------------------
+# HTTP
+# ----------------------------------------------------------------------
+
+
+class _ApiError(Exception):
+    def __init__(self, status: HTTPStatus, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: "ServeHTTPServer"
+    protocol_version = "HTTP/1.1"
+
+    # -- plumbing --------------------------------------------------------
+
+    def log_message(self, format: str, *args: Any) -> None:
+        logger.debug("%s %s", self.address_string(), format % args)
+
+    def _send_json(self, status: HTTPStatus, payload: Any) -> None:
+        body = json.dumps(payload, default=str).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self._cors_headers()
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _cors_headers(self) -> None:
+        origin = self.headers.get("Origin")
+        if origin and origin in self.server.allow_origins:
+            self.send_header("Access-Control-Allow-Origin", origin)
+            self.send_header("Vary", "Origin")
+
+    def _check_access(self) -> None:
+        # A rebound DNS name makes a page same-origin with us and lets it omit
+        # Origin, but its requests still carry that name in Host.
+        host = self.headers.get("Host", "")
+        if not self.server.host_allowed(host):
+            raise _ApiError(HTTPStatus.FORBIDDEN, f"Host not allowed: {host}")
+        # Any web page can send requests to localhost; only listed origins may.
+        origin = self.headers.get("Origin")
+        if origin and origin not in self.server.allow_origins:
+            raise _ApiError(HTTPStatus.FORBIDDEN, f"Origin not allowed: {origin}")
+        token = self.server.token
+        if token and self.headers.get("Authorization", "") != f"Bearer {token}":
+            raise _ApiError(HTTPStatus.UNAUTHORIZED, "Missing or wrong bearer token")
+
+    def _read_json(self) -> Dict[str, Any]:
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > MAX_BODY_BYTES:
+            raise _ApiError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "Request body too large")
+        if not length:
+            return {}
+        try:
+            data = json.loads(self.rfile.read(length))
+        except ValueError:
+            raise _ApiError(HTTPStatus.BAD_REQUEST, "Body is not valid JSON")
+        if not isinstance(data, dict):
+            raise _ApiError(HTTPStatus.BAD_REQUEST, "Body must be a JSON object")
+        return data
+
+    def _dispatch(self, method: str) -> None:
+        url = urlparse(self.path)
+        parts = [p for p in url.path.split("/") if p]
+        try:
+            self._check_access()
+            route = self.server.routes(method, parts)
+            if route is None:
+                raise _ApiError(HTTPStatus.NOT_FOUND, f"No route for {method} {url.path}")
+            handler, args = route
+            handler(self, parse_qs(url.query), *args)
+        except _ApiError as exc:
+            self._send_json(exc.status, {"error": str(exc)})
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        except Exception as exc:
+            logger.exception("Unhandled error on %s %s", method, url.path)
+            self._send_json(HTTPStatus.INTERNAL_SERVER_ERROR, {"error": str(exc)})
+
+    def do_GET(self) -> None:
+        self._dispatch("GET")
+
+    def do_POST(self) -> None:
+        self._dispatch("POST")
+
+    def do_DELETE(self) -> None:
+        self._dispatch("DELETE")
+
+    def do_OPTIONS(self) -> None:
+        origin = self.headers.get("Origin")
+        if not origin or origin not in self.server.allow_origins:
+            self._send_json(HTTPStatus.FORBIDDEN, {"error": "Origin not allowed"})
+            return
+        self.send_response(HTTPStatus.NO_CONTENT)
+        self._cors_headers()
+        self.send_header("Access-Control-Allow-Methods", "GET, POST, DELETE")
+        self.send_header("Access-Control-Allow-Headers", "Authorization, Content-Type")
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    # -- endpoints -------------------------------------------------------
+
+    def status(self, query) -> None:
+        self._send_json(HTTPStatus.OK, self.server.service.status())
+
+    def transcribe(self, query) -> None:
+        body = self._read_json()
+        path = body.get("path")
+        if not isinstance(path, str) or not path:
+            raise _ApiError(HTTPStatus.BAD_REQUEST, "'path' is required")
+        try:
+            job = self.server.service.transcribe_file(path, body.get("language"), bool(body.get("longform")))
+        except FileNotFoundError:
+            raise _ApiError(HTTPStatus.BAD_REQUEST, f"No such file: {path}")
+        except QueueFullError as exc:
+            raise _ApiError(HTTPStatus.TOO_MANY_REQUESTS, str(exc))
+        self._send_json(HTTPStatus.ACCEPTED, job.to_dict())
+
+    def list_jobs(self, query) -> None:
+        self._send_json(HTTPStatus.OK, {"jobs": [job.to_dict() for job in self.server.service.jobs.jobs()]})
+
+    def get_job(self, query, job_id: str) -> None:
+        job = self.server.service.jobs.get(job_id)
+        if job is None:
+            raise _ApiError(HTTPStatus.NOT_FOUND, f"No job {job_id}")
+        try:
+            wait = float(query.get("wait", ["0"])[0])
+        except ValueError:
+            raise _ApiError(HTTPStatus.BAD_REQUEST, "'wait' must be a number of seconds")
+        if wait > 0:
+            job.done.wait(min(wait, MAX_WAIT_S))
+        self._send_json(HTTPStatus.OK, job.to_dict())
+
+    def cancel_job(self, query, job_id: str) -> None:
+        job = self.server.service.jobs.cancel(job_id)
+        if job is None:
+            raise _ApiError(HTTPStatus.NOT_FOUND, f"No job {job_id}")
+        self._send_json(HTTPStatus.OK, job.to_dict())
+
+    def record_start(self, query) -> None:
+        try:
+            info = self.server.service.start_recording()
+        except ServiceBusyError as exc:
+            raise _ApiError(HTTPStatus.CONFLICT, str(exc))
+        self._send_json(HTTPStatus.OK, info)
+
+    def record_stop(self, query) -> None:
+        try:
+            job = self.server.service.stop_recording()
+        except ServiceBusyError as exc:
+            raise _ApiError(HTTPStatus.CONFLICT, str(exc))
+        except QueueFullError as exc:
+            raise _ApiError(HTTPStatus.TOO_MANY_REQUESTS, str(exc))
+        if job is None:
+            self._send_json(HTTPStatus.OK, {"job": None, "error": "No audio captured"})
+            return
+        self._send_json(HTTPStatus.ACCEPTED, job.to_dict())
+
+    def events(self, query) -> None:
+        hub = self.server.service.events
+        q = hub.subscribe()
+        try:
+            self.send_response(HTTPStatus.OK)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Cache-Control", "no-cache")
+            self.send_header("Connection", "close")
+            self._cors_headers()
+            self.end_headers()
+            self.close_connection = True
+            while True:
+                try:
+                    event = q.get(timeout=SSE_KEEPALIVE_S)
+                except queue.Empty:
+                    self.wfile.write(b": keepalive\n\n")
+                    self.wfile.flush()
+                    continue
+                if event is None:
+                    return
+                data = json.dumps(event, default=str)
+                self.wfile.write(f"event: {event.get('type', 'message')}\ndata: {data}\n\n".encode("utf-8"))
+                self.wfile.flush()
+        finally:
+            hub.unsubscribe(q)
+
+
+_ROUTES: Sequence[Tuple[str, Tuple[str, ...], Callable[..., None]]] = (
+    ("GET", ("status",), _Handler.status),
+    ("POST", ("transcribe",), _Handler.transcribe),
+    ("GET", ("jobs",), _Handler.list_jobs),
+    ("GET", ("jobs", "*"), _Handler.get_job),
+    ("DELETE", ("jobs", "*"), _Handler.cancel_job),
+    ("POST", ("record", "start"), _Handler.record_start),
+    ("POST", ("record", "stop"), _Handler.record_stop),
+    ("GET", ("events",), _Handler.events),
+)
+
+
+class ServeHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address: Tuple[str, int],
+        service: TranscriptionService,
+        token: Optional[str] = None,
+        allow_origins: Sequence[str] = (),
+        allow_hosts: Sequence[str] = (),
+    ):
+        super().__init__(address, _Handler)
+        self.service = service
+        self.token = token
+        self.allow_origins = frozenset(allow_origins)
+        hosts = set(LOOPBACK_HOSTS) | {h.lower() for h in allow_hosts}
+        if address[0] not in _WILDCARD_HOSTS:
+            hosts.add(address[0].lower())
+        self.allow_hosts = frozenset(hosts)
+
+    def host_allowed(self, header: str) -> bool:
+        """True if a ``Host`` header names this server: a known host name and the bound port."""
+        host = header.strip().lower()
+        if host.startswith("["):  # [::1]:8765
+            name, _, rest = host[1:].partition("]")
+            port = rest[1:] if rest.startswith(":") else ""
+        elif host.count(":") == 1:
+            name, port = host.split(":")
+        else:
+            name, port = host, ""
+        if port and not port.isdigit():
+            return False
+        return name in self.allow_hosts and int(port or 80) == self.server_address[1]
+
+    @staticmethod
+    def routes(method: str, parts: List[str]) -> Optional[Tuple[Callable[..., None], List[str]]]:
+        for route_method, pattern, handler in _ROUTES:
+            if route_method != method or len(pattern) != len(parts):
+                continue
+            if all(p == "*" or p == part for p, part in zip(pattern, parts)):
+                return handler, [part for p, part in zip(pattern, parts) if p == "*"]
+        return None
+
+
+# ----------------------------------------------------------------------
+# CLI: tiltedvoice serve
+# ----------------------------------------------------------------------
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--host", default=DEFAULT_HOST, help="Interface to bind (default: loopback only)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--model", choices=[m.value for m in WhisperModel],
+                        help="Model to keep warm (default: the app's selected model)")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="Jobs decoded at the same time")
+    parser.add_argument("--max-queue", type=int, default=DEFAULT_MAX_QUEUE, help="Jobs allowed to wait")
+    parser.add_argument("--token", default=os.environ.get(TOKEN_ENV),
+                        help=f"Require 'Authorization: Bearer <token>' (default: ${TOKEN_ENV})")
+    parser.add_argument("--allow-origin", action="append", default=[], metavar="ORIGIN",
+                        help="Browser origin allowed to call the API, e.g. chrome-extension://<id>")
+    parser.add_argument("--allow-host", action="append", default=[], metavar="NAME",
+                        help="Extra Host name clients may use to reach the server (loopback names always work)")
+    parser.add_argument("--no-preload", action="store_true", help="Load the model on the first request")
+    parser.set_defaults(func=run_cli)
+
+
+def _load_settings() -> AppSettings:
+    try:
+        return AppSettings.from_dict(json.loads(paths.settings_path().read_text(encoding="utf-8")))
+    except Exception:
+        return AppSettings()
+
+
+def run_cli(args: argparse.Namespace) -> int:
+    settings = _load_settings()
+    if args.model:
+        settings.model = WhisperModel(args.model)
+    service = TranscriptionService(settings, max_workers=args.workers, max_pending=args.max_queue)
+    try:
+        server = ServeHTTPServer((args.host, args.port), service, token=args.token,
+                                 allow_origins=args.allow_origin, allow_hosts=args.allow_host)
+    except OSError as exc:
+        print(f"Cannot listen on {args.host}:{args.port}: {exc}")
+        return 2
+    if not args.no_preload:
+        service.preload()
+    host, port = server.server_address[:2]
+    print(f"TiltedVoice serving {settings.model.value} on http://{host}:{port} (Ctrl+C to stop)", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.shutdown()
+        server.server_close()
+    return 0
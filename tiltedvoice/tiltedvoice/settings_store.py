@@ -0,0 +1,156 @@
+"""In-memory settings document persisted by a debounced background writer.
+
+Sliders in the settings page save on every tick, and each save used to
+re-read ``settings.json`` and rewrite it on the UI thread.
+:class:`SettingsStore` loads the document once and keeps it in memory:
+
+* :meth:`SettingsStore.update` merges values and returns immediately;
+* a writer thread waits until updates have been quiet for ``debounce_s`` and
+  then writes the latest document once, so a burst of changes costs one write;
+* writes go to a temp file that is renamed over ``settings.json``, so a crash
+  mid-write never leaves a truncated file behind;
+* a failed write keeps the change pending and is retried every ``RETRY_S``.
+
+:meth:`SettingsStore.flush` and :meth:`SettingsStore.close` write any pending
+change straight away (used on shutdown).
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Mapping, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DEBOUNCE_S = 0.5
+RETRY_S = 2.0
+
+
+class SettingsStore:
+    """A JSON settings file kept in memory and written behind the caller's back."""
+
+    def __init__(self, path: Union[str, os.PathLike], debounce_s: float = DEFAULT_DEBOUNCE_S):
+        self.path = Path(path)
+        self.debounce_s = debounce_s
+        self._cond = threading.Condition()
+        self._data: Dict[str, Any] = self._load()
+        # Generations: bumped per update, and recorded once written to disk
+        self._version = 0
+        self._written = 0
+        self._attempts = 0  # write attempts, so flush() can wait for one of its own
+        self._failed = 0  # generation of the last failed write
+        self._last_change = 0.0
+        self._urgent = False
+        self._stopping = False
+        self.writes = 0
+        self._writer = threading.Thread(target=self._run_writer, name="tv-settings", daemon=True)
+        self._writer.start()
+
+    def _load(self) -> Dict[str, Any]:
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return {}
+        except Exception as exc:
+            logger.warning("Ignoring unreadable settings file %s: %s", self.path, exc)
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def get(self, key: str, default: Any = None) -> Any:
+        with self._cond:
+            return self._data.get(key, default)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """A copy of the whole document."""
+        with self._cond:
+            return dict(self._data)
+
+    # ------------------------------------------------------------------
+    # Writes (any thread, non-blocking)
+    # ------------------------------------------------------------------
+
+    def update(self, values: Mapping[str, Any]) -> None:
+        """Merge *values* into the document; unchanged documents are not rewritten."""
+        with self._cond:
+            merged = {**self._data, **values}
+            if merged == self._data:
+                return
+            self._data = merged
+            self._version += 1
+            self._last_change = time.monotonic()
+            self._cond.notify_all()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Write pending changes now and wait for them; False on timeout or a failed write."""
+        with self._cond:
+            target, attempts = self._version, self._attempts
+            self._urgent = True
+            self._cond.notify_all()
+            self._cond.wait_for(
+                lambda: self._written >= target
+                or (self._attempts > attempts and self._failed >= target)
+                or not self._writer.is_alive(),
+                timeout,
+            )
+            return self._written >= target
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Write pending changes and stop the writer."""
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        self._writer.join(timeout)
+
+    # ------------------------------------------------------------------
+    # Writer
+    # ------------------------------------------------------------------
+
+    def _run_writer(self) -> None:
+        while True:
+            with self._cond:
+                while self._written == self._version and not self._stopping:
+                    self._urgent = False
+                    self._cond.wait()
+                # Let a burst of updates settle before writing
+                while not (self._urgent or self._stopping):
+                    remaining = self._last_change + self.debounce_s - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                version, data = self._version, dict(self._data)
+                stop = self._stopping
+            ok = version == self._written or self._write(data)
+            with self._cond:
+                self._attempts += 1
+                if ok:
+                    self._written = version
+                else:
+                    self._failed = version
+                self._cond.notify_all()
+                if stop and (not ok or self._written == self._version):
+                    return
+                if not ok:
+                    # Still pending; try again later (or sooner on a new update or flush)
+                    self._urgent = False
+                    self._cond.wait(RETRY_S)
+
+    def _write(self, data: Dict[str, Any]) -> bool:
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(data, indent=2), encoding="utf-8")
+            os.replace(tmp, self.path)
+            self.writes += 1
+            return True
+        except OSError as exc:
+            logger.error("Could not save settings to %s: %s", self.path, exc)
+            return False
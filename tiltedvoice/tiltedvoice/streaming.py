@@ -0,0 +1,354 @@
+"""Streaming (incremental) transcription on top of Transcriber.
+
+Audio is fed in 16 kHz float32 chunks while the user is still speaking.  A
+background thread re-decodes the uncommitted tail of the stream every
+``step_s`` seconds of new audio.  Segments that end comfortably before the
+edge of the window are *committed* (final) and their audio is dropped from the
+buffer; the rest are reported as tentative partials and re-decoded next time.
+By the time recording stops only the last window is left to decode.
+
+If that last decode is cut short, :meth:`StreamingTranscriber.finish` keeps
+the tail uncommitted and records the stop reason in ``debug_info["passes"]``,
+so :func:`~tiltedvoice.transcriber.is_complete` is False; callers then run
+:meth:`StreamingTranscriber.decode_tail` to decode it through the full path.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from dataclasses import replace
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from tiltedvoice.models import TranscriptionResult, TranscriptionSegment
+from tiltedvoice.transcriber import (
+    INCOMPLETE_STOP_REASONS,
+    SAMPLE_RATE,
+    TRANSCRIBE_TIMEOUT_S,
+    VAD_PARAMETERS,
+    Transcriber,
+    is_complete,
+)
+
+logger = logging.getLogger(__name__)
+
+# on_update(segments, final): final=True delivers newly committed segments (append);
+# final=False delivers the current tentative tail (replaces the previous partials).
+UpdateCallback = Callable[[List[TranscriptionSegment], bool], None]
+
+
+class StreamingTranscriber:
+    """Incremental transcription session for a single recording.
+
+    Usage::
+
+        stream = StreamingTranscriber(transcriber, on_update=cb).start()
+        stream.feed(chunk)  # repeatedly, from the capture thread
+        result = stream.finish()
+    """
+
+    def __init__(
+        self,
+        transcriber: Transcriber,
+        on_update: Optional[UpdateCallback] = None,
+        language: Optional[str] = None,
+        step_s: float = 1.0,
+        holdback_s: float = 1.0,
+        max_window_s: float = 25.0,
+        on_debug: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ):
+        self._transcriber = transcriber
+        self._on_update = on_update
+        self._on_debug = on_debug
+        self._language = language or transcriber._config.language
+        self._step_samples = max(1, int(step_s * SAMPLE_RATE))
+        self._holdback_s = holdback_s
+        self._max_window_s = max_window_s
+
+        self._cond = threading.Condition()
+        self._chunks: list[np.ndarray] = []
+        self._buffered = 0  # samples in _chunks
+        self._pending = 0  # samples fed since the last window decode
+        self._offset_s = 0.0  # stream time of the first buffered sample
+        self._total_samples = 0
+        self._committed: list[TranscriptionSegment] = []
+        self._windows = 0
+        self._window_error: Optional[str] = None  # why the background decoder stopped early
+        self._closed = False
+        self._cancel_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # ------------------------------------------------------------------
+    # Session control
+    # ------------------------------------------------------------------
+
+    def start(self) -> "StreamingTranscriber":
+        """Start the background window decoder and return self."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="tv-stream", daemon=True)
+            self._thread.start()
+        return self
+
+    def feed(self, chunk: np.ndarray) -> None:
+        """Append a chunk of 16 kHz float32 mono audio to the stream."""
+        data = np.asarray(chunk, dtype=np.float32).reshape(-1)
+        if data.size == 0:
+            return
+        with self._cond:
+            if self._closed:
+                return
+            self._chunks.append(data.copy())
+            self._buffered += data.size
+            self._pending += data.size
+            self._total_samples += data.size
+            if self._pending >= self._step_samples:
+                self._cond.notify()
+
+    def finish(self) -> TranscriptionResult:
+        """Stop accepting audio, decode the remaining tail and return the full result.
+
+        ``processing_time_ms`` is the time spent in this call — i.e. the
+        latency between releasing push-to-talk and having final text.
+        """
+        t0 = time.perf_counter()
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+        stop_reason = "eof"
+        if self._cancel_event.is_set():
+            stop_reason = "cancelled"
+        else:
+            with self._cond:
+                window = self._snapshot()
+                offset_s = self._offset_s
+            if window.size:
+                try:
+                    stop_reason = self._decode_window(window, offset_s, final=True)
+                except Exception as exc:
+                    logger.error("Streaming final decode failed: %s", exc)
+                    stop_reason = "error"
+        if stop_reason in INCOMPLETE_STOP_REASONS:
+            logger.warning("Streaming final window stopped early (%s); the tail is not transcribed", stop_reason)
+
+        processing_ms = (time.perf_counter() - t0) * 1000
+        segments = list(self._committed)
+        duration = self._total_samples / float(SAMPLE_RATE)
+        logger.info(
+            "Streaming transcription finished: %d segments, %d windows, %.0fms after stop (%.1fs audio)",
+            len(segments), self._windows, processing_ms, duration,
+        )
+        return TranscriptionResult(
+            text=" ".join(seg.text for seg in segments),
+            language=self._language,
+            duration=duration,
+            processing_time_ms=processing_ms,
+            segments=segments,
+            model_name=self._transcriber._config.model.value,
+            debug_info={
+                "selected_pass": "streaming",
+                "windows": self._windows,
+                "window_error": self._window_error,
+                "passes": [{"name": "stream_final", "stop_reason": stop_reason}],
+                "processing_time_ms": processing_ms,
+            },
+        )
+
+    def decode_tail(
+        self,
+        result: TranscriptionResult,
+        cancel_event: Optional[threading.Event] = None,
+        on_status: Optional[Callable[[str], None]] = None,
+        on_debug: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ) -> TranscriptionResult:
+        """Finish an incomplete :meth:`finish` result by decoding the uncommitted tail.
+
+        The tail goes through :meth:`Transcriber.transcribe` (timeouts, VAD-off
+        retry) and its segments are appended to the committed ones.  Complete
+        or cancelled results are returned unchanged.
+        """
+        if is_complete(result) or self._cancel_event.is_set():
+            return result
+        with self._cond:
+            tail = self._snapshot()
+            offset_s = self._offset_s
+        if not tail.size:
+            return result
+        t0 = time.perf_counter()
+        decoded = self._transcriber.transcribe(
+            tail, language=self._language, cancel_event=cancel_event, on_status=on_status, on_debug=on_debug
+        )
+        segments = list(result.segments) + [
+            replace(
+                seg,
+                start=seg.start + offset_s,
+                end=seg.end + offset_s,
+                words=[replace(w, start=w.start + offset_s, end=w.end + offset_s) for w in seg.words]
+                if seg.words else None,
+            )
+            for seg in decoded.segments
+        ]
+        processing_ms = result.processing_time_ms + (time.perf_counter() - t0) * 1000
+        logger.info("Streaming tail re-decoded: %.1fs audio from %.1fs", tail.size / float(SAMPLE_RATE), offset_s)
+        return TranscriptionResult(
+            text=" ".join(seg.text for seg in segments),
+            language=result.language,
+            confidence=decoded.confidence,
+            duration=result.duration,
+            processing_time_ms=processing_ms,
+            segments=segments,
+            model_name=decoded.model_name,
+            debug_info={
+                **result.debug_info,
+                "selected_pass": "streaming+tail",
+                "tail_offset_s": offset_s,
+                "passes": decoded.debug_info.get("passes", []),
+                "processing_time_ms": processing_ms,
+            },
+        )
+
+    def cancel(self) -> None:
+        """Abort the session; any in-flight decode stops at the next segment."""
+        self._cancel_event.set()
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+
+    @property
+    def committed_segments(self) -> List[TranscriptionSegment]:
+        return list(self._committed)
+
+    def snapshot(self) -> Tuple[List[TranscriptionSegment], np.ndarray]:
+        """The committed segments and a copy of the uncommitted audio after them."""
+        with self._cond:
+            return list(self._committed), self._snapshot().copy()
+
+    # ------------------------------------------------------------------
+    # Background decoding
+    # ------------------------------------------------------------------
+
+    def _run(self) -> None:
+        try:
+            self._transcriber.load_model()
+        except Exception as exc:
+            logger.error("Streaming model load failed: %s", exc)
+            self._window_error = str(exc)
+            return
+        while True:
+            with self._cond:
+                while not self._closed and self._pending < self._step_samples:
+                    self._cond.wait()
+                if self._closed:
+                    return
+                window = self._snapshot()
+                offset_s = self._offset_s
+                self._pending = 0
+            try:
+                self._decode_window(window, offset_s, final=False)
+            except Exception as exc:
+                # The audio stays buffered, so the final window in finish() still covers it
+                logger.error("Streaming window decode failed: %s", exc)
+                self._window_error = str(exc)
+                self._emit_debug(event="stream_error", offset_s=offset_s, error=str(exc))
+                return
+
+    def _snapshot(self) -> np.ndarray:
+        """Return the buffered audio as one array (caller holds the lock)."""
+        if not self._chunks:
+            return np.zeros(0, dtype=np.float32)
+        if len(self._chunks) > 1:
+            self._chunks = [np.concatenate(self._chunks)]
+        return self._chunks[0]
+
+    def _decode_window(self, window: np.ndarray, offset_s: float, final: bool) -> str:
+        """Decode one window, commit what is settled; returns the decode's stop reason."""
+        self._transcriber.load_model()
+        decode = self._transcriber._call_with_timeout(
+            lambda abort_event: self._transcriber._decode_pass(
+                audio=window,
+                language=self._language,
+                use_vad=True,
+                vad_params=dict(VAD_PARAMETERS),
+                cancel_event=self._cancel_event,
+                timeout_s=TRANSCRIBE_TIMEOUT_S,
+                abort_event=abort_event,
+            ),
+            timeout_s=TRANSCRIBE_TIMEOUT_S,
+        )
+        self._windows += 1
+        stop_reason = "pass_timeout" if decode is None else decode["stop_reason"]
+        if stop_reason in ("cancelled", "aborted", "pass_timeout"):
+            return stop_reason
+        if final and stop_reason in INCOMPLETE_STOP_REASONS:
+            # Keep the whole tail uncommitted so decode_tail() can redo it
+            return stop_reason
+
+        segments = [
+            TranscriptionSegment(
+                text=seg.text,
+                start=seg.start + offset_s,
+                end=seg.end + offset_s,
+                confidence=seg.confidence,
+            )
+            for seg in decode["segments"]
+        ]
+        window_s = len(window) / float(SAMPLE_RATE)
+        window_end_s = offset_s + window_s
+
+        if final:
+            commit, tentative = segments, []
+            cut_s = window_end_s
+        else:
+            horizon_s = window_end_s - self._holdback_s
+            n = 0
+            while n < len(segments) and segments[n].end <= horizon_s:
+                n += 1
+            if n == 0 and window_s >= self._max_window_s:
+                # Whisper cannot see past 30 s — force progress on long windows.
+                n = max(1, len(segments) - 1) if segments else 0
+            commit, tentative = segments[:n], segments[n:]
+            if commit:
+                cut_s = commit[-1].end
+            elif not segments and window_s >= self._max_window_s:
+                cut_s = horizon_s  # nothing but silence/noise so far
+            else:
+                cut_s = offset_s
+
+        self._emit_debug(
+            event="stream_window",
+            offset_s=offset_s,
+            window_s=window_s,
+            committed=len(commit),
+            tentative=len(tentative),
+            final=final,
+            elapsed_ms=decode["elapsed_ms"],
+        )
+
+        with self._cond:
+            self._committed.extend(commit)
+            drop = int(round((cut_s - self._offset_s) * SAMPLE_RATE))
+            if drop > 0:
+                buffered = self._snapshot()
+                drop = min(drop, buffered.size)
+                self._chunks = [buffered[drop:]] if buffered.size > drop else []
+                self._buffered = buffered.size - drop
+                self._offset_s += drop / float(SAMPLE_RATE)
+
+        if self._on_update:
+            try:
+                if commit:
+                    self._on_update(commit, True)
+                if not final:
+                    self._on_update(tentative, False)
+            except Exception:
+                logger.debug("Streaming update callback failed", exc_info=True)
+        return stop_reason
+
+    def _emit_debug(self, **event: Any) -> None:
+        Transcriber._emit_debug(self._on_debug, **event)
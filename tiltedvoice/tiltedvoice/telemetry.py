@@ -0,0 +1,315 @@
+"""Timing spans, counters and histograms for the capture and decode paths.
+
+Everything is recorded in memory on the shared :class:`Telemetry` instance:
+
+- **spans** time a block of work (``with tel.span("model_load"): ...``).  They
+  carry monotonic start times, nest per thread, and can be re-parented onto
+  another thread (the decode worker adopts the caller's span).  Finished
+  spans also feed the ``span_duration_ms`` histogram.
+- **timers** are spans that only update a histogram (for per-chunk hot paths).
+- **counters** and **histograms** aggregate with optional labels.
+
+Span records are only built when an exporter is attached: :class:`JsonlExporter`
+appends one JSON object per span, and :func:`render_openmetrics` renders
+counters and histograms in OpenMetrics text format.  Setting
+``TILTEDVOICE_TELEMETRY=<path.jsonl>`` attaches a JSONL exporter at start-up.
+"""
+
+from __future__ import annotations
+
+import itertools
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+ENV_VAR = "TILTEDVOICE_TELEMETRY"
+
+DEFAULT_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+Exporter = Callable[[Dict[str, Any]], None]
+
+
+def _label_key(labels: Dict[str, Any]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+class Histogram:
+    """Cumulative-bucket histogram (Prometheus style)."""
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS_MS):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * len(self.buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.count += 1
+        self.sum += value
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+
+    def cumulative(self) -> List[Tuple[float, int]]:
+        out, total = [], 0
+        for bound, n in zip(self.buckets, self.counts):
+            total += n
+            out.append((bound, total))
+        return out
+
+
+class Span:
+    """One timed unit of work; use through :meth:`Telemetry.span`."""
+
+    __slots__ = ("name", "id", "parent", "attrs", "start", "end", "thread")
+
+    def __init__(self, name: str, span_id: int, parent: Optional[int], attrs: Dict[str, Any]):
+        self.name = name
+        self.id = span_id
+        self.parent = parent
+        self.attrs = attrs
+        self.start = time.perf_counter()
+        self.end: Optional[float] = None
+        self.thread = threading.current_thread().name
+
+    def set(self, **attrs: Any) -> None:
+        """Attach attributes discovered while the span runs."""
+        self.attrs.update(attrs)
+
+    @property
+    def duration_ms(self) -> float:
+        end = self.end if self.end is not None else time.perf_counter()
+        return (end - self.start) * 1000
+
+
+class Telemetry:
+    """Process-wide registry of spans, counters and histograms."""
+
+    _shared: Optional["Telemetry"] = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._ids = itertools.count(1)
+        self._epoch = time.perf_counter()
+        self._counters: Dict[str, Dict[LabelKey, float]] = {}
+        self._histograms: Dict[str, Dict[LabelKey, Histogram]] = {}
+        self._exporters: List[Exporter] = []
+
+    @classmethod
+    def shared(cls) -> "Telemetry":
+        """Return the process-wide instance (created on first use)."""
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+                path = os.environ.get(ENV_VAR)
+                if path:
+                    cls._shared.add_exporter(JsonlExporter(path))
+            return cls._shared
+
+    # ------------------------------------------------------------------
+    # Spans
+    # ------------------------------------------------------------------
+
+    def _stack(self) -> List[int]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def current_span_id(self) -> Optional[int]:
+        stack = self._stack()
+        return stack[-1] if stack else None
+
+    @contextmanager
+    def span(self, name: str, **attrs: Any) -> Iterator[Span]:
+        stack = self._stack()
+        sp = Span(name, next(self._ids), stack[-1] if stack else None, attrs)
+        stack.append(sp.id)
+        try:
+            yield sp
+        except BaseException as exc:
+            sp.attrs["error"] = type(exc).__name__
+            raise
+        finally:
+            sp.end = time.perf_counter()
+            stack.pop()
+            self.observe("span_duration_ms", sp.duration_ms, span=name)
+            if self._exporters:
+                self._export(self._span_record(sp))
+
+    @contextmanager
+    def adopt(self, parent_id: Optional[int]) -> Iterator[None]:
+        """Make *parent_id* (a span from another thread) the parent of spans opened here."""
+        if parent_id is None:
+            yield
+            return
+        stack = self._stack()
+        stack.append(parent_id)
+        try:
+            yield
+        finally:
+            stack.pop()
+
+    @contextmanager
+    def timer(self, name: str, **labels: Any) -> Iterator[None]:
+        """Time a hot-path block into histogram *name* without emitting a span record."""
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, (time.perf_counter() - t0) * 1000, **labels)
+
+    def _span_record(self, sp: Span) -> Dict[str, Any]:
+        return {
+            "type": "span",
+            "name": sp.name,
+            "id": sp.id,
+            "parent": sp.parent,
+            "thread": sp.thread,
+            "start_s": round(sp.start - self._epoch, 6),
+            "duration_ms": round(sp.duration_ms, 3),
+            "attrs": sp.attrs,
+        }
+
+    # ------------------------------------------------------------------
+    # Counters and histograms
+    # ------------------------------------------------------------------
+
+    def count(self, name: str, value: float = 1, **labels: Any) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def observe(self, name: str, value: float, **labels: Any) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            hist = series.get(key)
+            if hist is None:
+                hist = series[key] = Histogram()
+            hist.observe(value)
+
+    def counter_value(self, name: str, **labels: Any) -> float:
+        with self._lock:
+            return self._counters.get(name, {}).get(_label_key(labels), 0)
+
+    def histogram(self, name: str, **labels: Any) -> Optional[Histogram]:
+        with self._lock:
+            return self._histograms.get(name, {}).get(_label_key(labels))
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Counters and histogram summaries as plain JSON-ready data."""
+        with self._lock:
+            return {
+                "counters": {
+                    name: [{"labels": dict(k), "value": v} for k, v in series.items()]
+                    for name, series in self._counters.items()
+                },
+                "histograms": {
+                    name: [
+                        {"labels": dict(k), "count": h.count, "sum": h.sum, "buckets": h.cumulative()}
+                        for k, h in series.items()
+                    ]
+                    for name, series in self._histograms.items()
+                },
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    # ------------------------------------------------------------------
+    # Export
+    # ------------------------------------------------------------------
+
+    def add_exporter(self, exporter: Exporter) -> None:
+        with self._lock:
+            self._exporters = self._exporters + [exporter]
+
+    def remove_exporter(self, exporter: Exporter) -> None:
+        with self._lock:
+            self._exporters = [e for e in self._exporters if e is not exporter]
+        close = getattr(exporter, "close", None)
+        if close is not None:
+            close()
+
+    def _export(self, record: Dict[str, Any]) -> None:
+        for exporter in self._exporters:
+            try:
+                exporter(record)
+            except Exception as exc:
+                logger.debug("Telemetry exporter failed: %s", exc)
+
+
+class JsonlExporter:
+    """Append span records to a JSON Lines file."""
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._file = open(self.path, "a", encoding="utf-8")
+
+    def __call__(self, record: Dict[str, Any]) -> None:
+        line = json.dumps(record, default=str)
+        with self._lock:
+            if self._file is not None:
+                self._file.write(line + "\n")
+                self._file.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+def _om_labels(labels: Dict[str, str], extra: Optional[Dict[str, str]] = None) -> str:
+    merged = dict(labels, **(extra or {}))
+    if not merged:
+        return ""
+    body = ",".join(f'{k}="{str(v)}"'.replace("\n", " ") for k, v in sorted(merged.items()))
+    return "{" + body + "}"
+
+
+def render_openmetrics(telemetry: Telemetry) -> str:
+    """Render counters and histograms in OpenMetrics text exposition format."""
+    snap = telemetry.snapshot()
+    lines: List[str] = []
+    for name, series in sorted(snap["counters"].items()):
+        metric = f"tiltedvoice_{name}"
+        lines.append(f"# TYPE {metric} counter")
+        for point in series:
+            lines.append(f"{metric}_total{_om_labels(point['labels'])} {point['value']}")
+    for name, series in sorted(snap["histograms"].items()):
+        metric = f"tiltedvoice_{name}"
+        lines.append(f"# TYPE {metric} histogram")
+        for point in series:
+            for bound, cumulative in point["buckets"]:
+                lines.append(f"{metric}_bucket{_om_labels(point['labels'], {'le': f'{bound:g}'})} {cumulative}")
+            lines.append(f"{metric}_bucket{_om_labels(point['labels'], {'le': '+Inf'})} {point['count']}")
+            lines.append(f"{metric}_count{_om_labels(point['labels'])} {point['count']}")
+            lines.append(f"{metric}_sum{_om_labels(point['labels'])} {point['sum']:.3f}")
+    lines.append("# EOF")
+    return "\n".join(lines) + "\n"
+
+
+def write_openmetrics(path: Union[str, Path], telemetry: Optional[Telemetry] = None) -> None:
+    """Write an OpenMetrics snapshot atomically."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_text(render_openmetrics(telemetry or Telemetry.shared()), encoding="utf-8")
+    os.replace(tmp, path)
@@ -3,19 +3,35 @@
 from __future__ import annotations
 
 import logging
+import os
+import queue
 import threading
 import time
-from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeout
-from typing import Any, Callable, Dict, Optional, Tuple, Union
+from dataclasses import replace
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
 
 import numpy as np
 
+from tiltedvoice.alignment import align_words
+from tiltedvoice.audio_file import audio_duration_s
+from tiltedvoice.batching import (
+    BATCH_MAX_CLIP_S,
+    DEFAULT_BATCH_SIZE,
+    bucket_by_duration,
+    decode_batch,
+    load_clip,
+)
+from tiltedvoice.model_pool import ModelPool
 from tiltedvoice.models import (
     TranscriberConfig,
     TranscriptionResult,
     TranscriptionSegment,
+    TranscriptionWord,
     WhisperModel,
 )
+from tiltedvoice.result_cache import ResultCache, audio_fingerprint, cache_key
+from tiltedvoice.scheduler import ModelScheduler
+from tiltedvoice.telemetry import Telemetry
 
 logger = logging.getLogger(__name__)
 
@@ -24,6 +40,98 @@ _CUDA_ERROR_KEYWORDS = ("cublas", "cuda", "cudnn", "cusparse", "nvcuda")
 MAX_SEGMENTS = 50
 TRANSCRIBE_TIMEOUT_S = 180.0
 NO_SPEECH_THRESHOLD = 0.95
+SAMPLE_RATE = 16_000
+FALLBACK_MIN_RMS = 0.003
+SPECULATIVE_MIN_CPUS = 4
+
+VAD_PARAMETERS = dict(
+    threshold=0.35,
+    min_speech_duration_ms=200,
+    min_silence_duration_ms=300,
+    speech_pad_ms=250,
+)
+
+
+# Pass stop reasons that mean the decode did not cover the whole clip.
+INCOMPLETE_STOP_REASONS = frozenset({"cancelled", "aborted", "hard_timeout", "pass_timeout", "error"})
+
+
+def is_complete(result: TranscriptionResult) -> bool:
+    """True unless one of the result's decode passes was cut short."""
+    stops = {p.get("stop_reason") for p in result.debug_info.get("passes", [])}
+    return not (stops & INCOMPLETE_STOP_REASONS)
+
+
+class _DecodeJob:
+    """A unit of work for :class:`_DecodeWorker` with its own abort flag."""
+
+    def __init__(self, fn: Callable[[threading.Event], Any]):
+        self.fn = fn
+        self.abort = threading.Event()
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        # Spans opened by the job nest under the submitter's current span.
+        self.parent_span = Telemetry.shared().current_span_id()
+
+
+class _DecodeWorker:
+    """Long-lived thread that runs decode jobs one at a time from a queue.
+
+    Jobs receive an abort event and are expected to check it between
+    segments, so a timed-out or cancelled decode stops at the next segment
+    boundary instead of running on orphaned next to the following request.
+    """
+
+    def __init__(self, name: str = "tv-decode"):
+        self._name = name
+        self._lock = threading.Lock()
+        self._queue: "queue.Queue[Optional[_DecodeJob]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+
+    def submit(self, fn: Callable[[threading.Event], Any]) -> _DecodeJob:
+        job = _DecodeJob(fn)
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, args=(self._queue,), name=self._name, daemon=True
+                )
+                self._thread.start()
+            self._queue.put(job)
+        return job
+
+    def shutdown(self) -> None:
+        """Stop the thread after its current job; queued jobs are dropped."""
+        with self._lock:
+            if self._thread is None:
+                return
+            old = self._queue
+            self._queue = queue.Queue()
+            self._thread = None
+        while True:
+            try:
+                job = old.get_nowait()
+            except queue.Empty:
+                break
+            if job is not None:
+                job.abort.set()
+                job.done.set()
+        old.put(None)
+
+    @staticmethod
+    def _run(jobs: "queue.Queue[Optional[_DecodeJob]]") -> None:
+        while True:
+            job = jobs.get()
+            if job is None:
+                return
+            try:
+                if not job.abort.is_set():
+                    with Telemetry.shared().adopt(job.parent_span):
+                        job.result = job.fn(job.abort)
+            except BaseException as exc:
+                job.error = exc
+            finally:
+                job.done.set()
 
 
 class Transcriber:
@@ -31,9 +139,23 @@ class Transcriber:
 
     Loads the model lazily on first transcribe() call. Automatically detects
     CUDA availability without torch — falls back to CPU int8 on failure.
+
+    Pass a :class:`ModelPool` (e.g. ``ModelPool.shared()``) to share loaded
+    models with other instances instead of owning a private copy.
+
+    With a :class:`ModelScheduler`, the configured model becomes the largest
+    one allowed: each clip goes to the largest model predicted to meet the
+    latency target on this machine, and every decode updates the estimates.
     """
 
-    def __init__(self, config: Optional[TranscriberConfig] = None, **kwargs):
+    def __init__(
+        self,
+        config: Optional[TranscriberConfig] = None,
+        pool: Optional[ModelPool] = None,
+        cache: Optional[ResultCache] = None,
+        scheduler: Optional[ModelScheduler] = None,
+        **kwargs,
+    ):
         if config is not None:
             self._config = config
         else:
@@ -42,9 +164,17 @@ class Transcriber:
                 model = WhisperModel(model) if "." in model else WhisperModel(model + ".en")
             self._config = TranscriberConfig(model=model, **kwargs)
 
+        self._pool = pool
+        self._cache = cache
+        self._scheduler = scheduler
+        self._siblings: Dict[WhisperModel, "Transcriber"] = {}
         self._model = None
         self._device: Optional[str] = None
         self._compute_type: Optional[str] = None
+        self._expected_device: Optional[Tuple[str, str]] = None  # before load, for the scheduler
+        self._load_lock = threading.Lock()
+        self._worker = _DecodeWorker()
+        self._speculative_worker = _DecodeWorker("tv-decode-vad-off")
 
     # ------------------------------------------------------------------
     # Device resolution (no torch)
@@ -74,39 +204,52 @@ class Transcriber:
 
     def load_model(self) -> None:
         """Download (if needed) and load the Whisper model."""
-        if self._model is not None:
-            return
-
-        device, compute_type = self._resolve_device()
-        model_name = self._config.model.value
-
-        logger.info("Loading model %s on %s (%s)…", model_name, device, compute_type)
-        t0 = time.perf_counter()
-
+        with self._load_lock:
+            if self._model is not None:
+                return
+
+            device, compute_type = self._resolve_device()
+            model_name = self._config.model.value
+
+            logger.info("Loading model %s on %s (%s)…", model_name, device, compute_type)
+            with Telemetry.shared().span("model_load", model=model_name) as span:
+                try:
+                    self._model = self._acquire_model(model_name, device, compute_type)
+                    self._device = device
+                    self._compute_type = compute_type
+                except Exception as exc:
+                    err_lower = str(exc).lower()
+                    if any(kw in err_lower for kw in _CUDA_ERROR_KEYWORDS) and device == "cuda":
+                        logger.warning("CUDA load failed (%s) — falling back to CPU int8", exc)
+                        self._model = self._acquire_model(model_name, "cpu", "int8")
+                        self._device = "cpu"
+                        self._compute_type = "int8"
+                    else:
+                        raise
+                span.set(device=self._device, compute_type=self._compute_type)
+
+            logger.info("Model loaded in %.1fs", span.duration_ms / 1000)
+
+    def preload(self) -> threading.Thread:
+        """Load the model in a background thread (e.g. at app start)."""
+        thread = threading.Thread(target=self._preload, name="tv-preload", daemon=True)
+        thread.start()
+        return thread
+
+    def _preload(self) -> None:
         try:
-            from faster_whisper import WhisperModel
-
-            self._model = WhisperModel(
-                model_name,
-                device=device,
-                compute_type=compute_type,
-            )
-            self._device = device
-            self._compute_type = compute_type
+            self.load_model()
         except Exception as exc:
-            err_lower = str(exc).lower()
-            if any(kw in err_lower for kw in _CUDA_ERROR_KEYWORDS) and device == "cuda":
-                logger.warning("CUDA load failed (%s) — falling back to CPU int8", exc)
-                from faster_whisper import WhisperModel
-
-                self._model = WhisperModel(model_name, device="cpu", compute_type="int8")
-                self._device = "cpu"
-                self._compute_type = "int8"
-            else:
-                raise
+            logger.warning("Model preload failed: %s", exc)
+
+    def _acquire_model(self, model_name: str, device: str, compute_type: str):
+        # Two CTranslate2 workers let the speculative VAD-off pass run truly in parallel.
+        num_workers = max(self._config.num_workers, 2 if self._config.speculative_fallback else 1)
+        if self._pool is not None:
+            return self._pool.acquire(model_name, device, compute_type, num_workers=num_workers)
+        from faster_whisper import WhisperModel
 
-        elapsed = time.perf_counter() - t0
-        logger.info("Model loaded in %.1fs", elapsed)
+        return WhisperModel(model_name, device=device, compute_type=compute_type, num_workers=num_workers)
 
     # ------------------------------------------------------------------
     # Transcription
@@ -127,7 +270,74 @@ class Transcriber:
             language: Override language (default from config).
             cancel_event: Set this event to abort transcription early.
             on_status: Callback ``on_status(msg)`` for progress updates.
+
+        With a :class:`ResultCache`, a repeat of the same audio and settings
+        is answered from disk before the model is even loaded.
         """
+        tel = Telemetry.shared()
+        engine = self._route(audio)
+        with tel.span("transcribe", model=engine._config.model.value) as span:
+            result = engine._transcribe(audio, language, cancel_event, on_status, on_debug)
+            span.set(
+                selected_pass=result.debug_info.get("selected_pass"),
+                audio_s=round(result.duration, 3),
+                segments=len(result.segments),
+            )
+        tel.count("transcriptions", pass_name=result.debug_info.get("selected_pass") or "none")
+        tel.count("audio_seconds", result.duration)
+        if self._scheduler is not None and engine.device and not (cancel_event and cancel_event.is_set()):
+            if result.debug_info.get("selected_pass") not in (None, "cache"):
+                self._scheduler.observe(
+                    engine._config.model, engine._device_key(), result.duration, result.processing_time_ms / 1000
+                )
+        return result
+
+    def _route(self, audio: Union[np.ndarray, str]) -> "Transcriber":
+        """Pick the Transcriber (self or a sibling sharing pool and cache) for this clip."""
+        if self._scheduler is None:
+            return self
+        ceiling = self._config.model
+        model = self._scheduler.choose(ceiling, self._device_key(), self._audio_duration_s(audio))
+        if model == ceiling:
+            return self
+        logger.info("Scheduler picked %s over %s for this clip", model.value, ceiling.value)
+        return self._sibling(model)
+
+    def _sibling(self, model: WhisperModel) -> "Transcriber":
+        """This Transcriber for *model*, or a sibling sharing its pool and cache."""
+        if model == self._config.model:
+            return self
+        sibling = self._siblings.get(model)
+        if sibling is None:
+            sibling = self._siblings[model] = Transcriber(
+                config=replace(self._config, model=model),
+                pool=self._pool,
+                cache=self._cache,
+                scheduler=self._scheduler,
+            )
+        return sibling
+
+    def _device_key(self) -> str:
+        if self._device is not None:
+            return f"{self._device}/{self._compute_type}"
+        if self._expected_device is None:
+            self._expected_device = self._resolve_device()
+        return "/".join(self._expected_device)
+
+    def _transcribe(self, audio, language, cancel_event, on_status, on_debug) -> TranscriptionResult:
+        lang = language or self._config.language
+        t0 = time.perf_counter()
+        key = self._cache_key(audio, lang)
+        if key is not None:
+            cached = self._cache.get(key)
+            Telemetry.shared().count("result_cache", outcome="miss" if cached is None else "hit")
+            if cached is not None:
+                cached.processing_time_ms = (time.perf_counter() - t0) * 1000
+                cached.debug_info["processing_time_ms"] = cached.processing_time_ms
+                self._emit_debug(on_debug, event="cache_hit", elapsed_ms=cached.processing_time_ms)
+                logger.info("Result cache hit (%.1fms)", cached.processing_time_ms)
+                return cached
+
         if on_status:
             on_status("Loading model…")
         self.load_model()
@@ -135,10 +345,8 @@ class Transcriber:
         if cancel_event and cancel_event.is_set():
             return self._empty_result(language)
 
-        lang = language or self._config.language
-
         if isinstance(audio, np.ndarray):
-            audio_dur = len(audio) / 16000.0
+            audio_dur = len(audio) / float(SAMPLE_RATE)
             rms = float(np.sqrt(np.mean(audio ** 2)))
             peak = float(np.max(np.abs(audio)))
             logger.info(
@@ -155,6 +363,10 @@ class Transcriber:
         t0 = time.perf_counter()
         audio_dur_s = self._audio_duration_s(audio)
         total_budget_s = self._total_timeout_for_audio(audio_dur_s)
+        if self._scheduler is not None:
+            total_budget_s = self._scheduler.timeout_budget_s(
+                self._config.model, self._device_key(), audio_dur_s, total_budget_s
+            )
         self._emit_debug(
             on_debug,
             event="timeout_budget",
@@ -162,6 +374,34 @@ class Transcriber:
             total_budget_s=total_budget_s,
         )
 
+        if not self._config.vad_filter:
+            # VAD disabled in config: a single pass over the whole clip.
+            result = self._run_transcribe_pass(
+                audio=audio,
+                language=lang,
+                use_vad=False,
+                cancel_event=cancel_event,
+                on_debug=on_debug,
+                budget_s=total_budget_s,
+                audio_dur_s=audio_dur_s,
+            )
+            return self._store_result(key, self._build_result(result, t0), cancel_event)
+
+        fallback_eligible = (
+            isinstance(audio, np.ndarray)
+            and float(np.sqrt(np.mean(audio ** 2))) >= FALLBACK_MIN_RMS
+        )
+        if fallback_eligible and self._use_speculative():
+            result = self._run_speculative_passes(
+                audio=audio,
+                language=lang,
+                cancel_event=cancel_event,
+                on_debug=on_debug,
+                budget_s=total_budget_s,
+                audio_dur_s=audio_dur_s,
+            )
+            return self._store_result(key, self._build_result(result, t0), cancel_event)
+
         # First pass: VAD enabled (fast and usually correct).
         result = self._run_transcribe_pass(
             audio=audio,
@@ -178,8 +418,7 @@ class Transcriber:
         # retry once without VAD.
         if (
             not result["texts"]
-            and isinstance(audio, np.ndarray)
-            and float(np.sqrt(np.mean(audio ** 2))) >= 0.003
+            and fallback_eligible
             and not (cancel_event and cancel_event.is_set())
         ):
             remaining_s = max(5.0, total_budget_s - (time.perf_counter() - t0))
@@ -197,7 +436,34 @@ class Transcriber:
             if retry["texts"]:
                 result = retry
         result["passes"] = all_passes
+        return self._store_result(key, self._build_result(result, t0), cancel_event)
+
+    def _cache_key(
+        self, audio: Union[np.ndarray, str], language: str, variant: Optional[str] = None
+    ) -> Optional[str]:
+        if self._cache is None:
+            return None
+        try:
+            return cache_key(audio_fingerprint(audio), self._config, language, variant)
+        except Exception as exc:
+            logger.debug("Result cache key failed: %s", exc)
+            return None
 
+    def _store_result(
+        self,
+        key: Optional[str],
+        result: TranscriptionResult,
+        cancel_event: Optional[threading.Event],
+    ) -> TranscriptionResult:
+        """Cache complete, non-empty results (not cancelled or timed out)."""
+        if key is None or not result.text or (cancel_event and cancel_event.is_set()):
+            return result
+        if not is_complete(result):
+            return result
+        self._cache.put(key, result)
+        return result
+
+    def _build_result(self, result: Dict[str, Any], t0: float) -> TranscriptionResult:
         processing_ms = (time.perf_counter() - t0) * 1000
         full_text = " ".join(result["texts"])
         duration = result["duration"]
@@ -225,13 +491,248 @@ class Transcriber:
             },
         )
 
-    def _run_transcribe_pass(self, audio, language, use_vad, cancel_event, on_debug, budget_s, audio_dur_s):
-        vad_params = dict(
-            threshold=0.35,
-            min_speech_duration_ms=200,
-            min_silence_duration_ms=300,
-            speech_pad_ms=250,
+    def align_words(
+        self,
+        audio: Union[np.ndarray, str],
+        result: TranscriptionResult,
+        segment_indices: Optional[Sequence[int]] = None,
+    ) -> TranscriptionResult:
+        """Add word timings to *result*'s segments without decoding again.
+
+        Only the segments in *segment_indices* (default: all) are aligned,
+        by forcing their text through Whisper's cross-attention alignment
+        (one encoder pass per 30 s window).  Dictation can therefore leave
+        ``word_timestamps`` off and history, export or editing ask for word
+        timings when they need them.  With a :class:`ResultCache` the aligned
+        result replaces the cached one, so asking again is free.
+
+        Alignment uses the model named in ``result.model_name`` (a scheduler
+        or draft pick may differ from this Transcriber's model).
+        """
+        try:
+            engine = self._sibling(WhisperModel(result.model_name))
+        except ValueError:
+            engine = self
+        if engine is not self:
+            return engine.align_words(audio, result, segment_indices)
+        self.load_model()
+        clip = load_clip(audio, SAMPLE_RATE)
+        with Telemetry.shared().span("align_words", segments=len(result.segments)):
+            segments = align_words(self._model, clip, result.segments, result.language, segment_indices)
+        aligned = TranscriptionResult(
+            text=result.text,
+            language=result.language,
+            confidence=result.confidence,
+            duration=result.duration,
+            processing_time_ms=result.processing_time_ms,
+            segments=segments,
+            model_name=result.model_name,
+            debug_info=result.debug_info,
+        )
+        return self._store_result(self._cache_key(audio, result.language), aligned, None)
+
+    def transcribe_batch(
+        self,
+        clips: Sequence[Union[np.ndarray, str]],
+        language: Optional[str] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        cancel_event: Optional[threading.Event] = None,
+        on_debug: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ) -> List[TranscriptionResult]:
+        """Transcribe several clips, batching short ones into shared generate calls.
+
+        Clips up to 30 s are bucketed by duration and decoded ``batch_size`` at
+        a time; longer clips go through :meth:`transcribe`.  Results come back
+        in input order.  ``processing_time_ms`` is the clip's share of its
+        batch; ``debug_info`` carries the whole batch timing.  Cached clips are
+        not decoded, and a clip the batch finds no speech in despite clear
+        audio energy goes through :meth:`transcribe` for its VAD-off retry.
+
+        Batch results (one whole-clip segment, no VAD) are cached under their
+        own key, so :meth:`transcribe` never gets one back; a batch does reuse
+        what :meth:`transcribe` cached.  The model is only loaded if some clip
+        actually needs decoding.
+        """
+        lang = language or self._config.language
+        arrays = [load_clip(clip, SAMPLE_RATE) for clip in clips]
+        durations = [len(a) / float(SAMPLE_RATE) for a in arrays]
+        results: List[Optional[TranscriptionResult]] = [None] * len(arrays)
+        keys = [self._cache_key(audio, lang, "batch") if audio.size else None for audio in arrays]
+
+        short: List[int] = []
+        for i, audio in enumerate(arrays):
+            cached = None
+            if keys[i] is not None:
+                cached = self._cache.get(self._cache_key(audio, lang)) or self._cache.get(keys[i])
+                Telemetry.shared().count("result_cache", outcome="miss" if cached is None else "hit")
+            if audio.size == 0:
+                results[i] = self._empty_result(lang)
+            elif cached is not None:
+                cached.processing_time_ms = 0.0
+                results[i] = cached
+            elif durations[i] <= BATCH_MAX_CLIP_S:
+                short.append(i)
+            else:
+                results[i] = self.transcribe(audio, language=lang, cancel_event=cancel_event, on_debug=on_debug)
+
+        if short:
+            self.load_model()
+        buckets = bucket_by_duration([durations[i] for i in short], batch_size)
+        for batch_index, bucket in enumerate(buckets):
+            idxs = [short[j] for j in bucket]
+            if cancel_event and cancel_event.is_set():
+                for i in idxs:
+                    results[i] = self._empty_result(lang)
+                continue
+
+            batch_audio = [arrays[i] for i in idxs]
+            budget_s = self._total_timeout_for_audio(sum(durations[i] for i in idxs))
+            t0 = time.perf_counter()
+            with Telemetry.shared().span("decode_batch", batch_index=batch_index, size=len(idxs)):
+                outputs = self._call_with_timeout(
+                    lambda abort_event, batch_audio=batch_audio: decode_batch(
+                        self._model,
+                        batch_audio,
+                        language=lang,
+                        beam_size=self._config.beam_size,
+                        no_speech_threshold=NO_SPEECH_THRESHOLD,
+                        abort_event=abort_event,
+                    ),
+                    timeout_s=budget_s,
+                )
+            elapsed_ms = (time.perf_counter() - t0) * 1000
+            self._emit_debug(
+                on_debug,
+                event="batch",
+                batch_index=batch_index,
+                size=len(idxs),
+                max_duration_s=max(durations[i] for i in idxs),
+                elapsed_ms=elapsed_ms,
+                stop_reason="eof" if outputs is not None else "pass_timeout",
+            )
+            logger.info("Batch %d: %d clips decoded in %.0fms", batch_index, len(idxs), elapsed_ms)
+
+            for k, i in enumerate(idxs):
+                out = outputs[k] if outputs is not None else None
+                text = out.text if out else ""
+                if out is not None and not text and self._retry_eligible(arrays[i], cancel_event):
+                    # The full path retries without VAD (and caches what it finds)
+                    results[i] = self.transcribe(arrays[i], language=lang, cancel_event=cancel_event, on_debug=on_debug)
+                    continue
+                segments = []
+                if text:
+                    segments.append(
+                        TranscriptionSegment(text=text, start=0.0, end=durations[i], confidence=out.avg_logprob)
+                    )
+                result = TranscriptionResult(
+                    text=text,
+                    language=lang,
+                    # Language probability, as transcribe() reports it; the batch forces the language
+                    confidence=1.0 if out is not None else 0.0,
+                    duration=durations[i],
+                    processing_time_ms=elapsed_ms / len(idxs),
+                    segments=segments,
+                    model_name=self._config.model.value,
+                    debug_info={
+                        "selected_pass": "batch",
+                        "batch_index": batch_index,
+                        "batch_size": len(idxs),
+                        "batch_elapsed_ms": elapsed_ms,
+                        "processing_time_ms": elapsed_ms / len(idxs),
+                        "passes": [{"name": "batch", "stop_reason": "eof" if out is not None else "pass_timeout"}],
+                    },
+                )
+                results[i] = self._store_result(keys[i], result, cancel_event)
+        return [r if r is not None else self._empty_result(lang) for r in results]
+
+    @staticmethod
+    def _retry_eligible(audio: np.ndarray, cancel_event: Optional[threading.Event]) -> bool:
+        """Whether an empty decode of *audio* is worth a VAD-off retry."""
+        if cancel_event and cancel_event.is_set():
+            return False
+        return float(np.sqrt(np.mean(audio ** 2))) >= FALLBACK_MIN_RMS
+
+    def _use_speculative(self) -> bool:
+        return bool(self._config.speculative_fallback) and (os.cpu_count() or 1) >= SPECULATIVE_MIN_CPUS
+
+    def _run_speculative_passes(self, audio, language, cancel_event, on_debug, budget_s, audio_dur_s):
+        """Run the VAD-on and VAD-off passes at once; the VAD-on pass wins as soon as it has text.
+
+        Selection matches the sequential path: VAD-on text, else VAD-off text,
+        else the (empty) VAD-on result.  The VAD-off pass runs on its own
+        worker and is cancelled the moment the VAD-on pass produces text.
+        """
+        loser_cancel = threading.Event()
+        fallback: Dict[str, Any] = {}
+
+        def _fallback():
+            fallback["result"] = self._run_transcribe_pass(
+                audio=audio,
+                language=language,
+                use_vad=False,
+                cancel_event=loser_cancel,
+                on_debug=on_debug,
+                budget_s=budget_s,
+                audio_dur_s=audio_dur_s,
+                worker=self._speculative_worker,
+            )
+
+        thread = threading.Thread(target=_fallback, name="tv-speculative", daemon=True)
+        thread.start()
+        result = self._run_transcribe_pass(
+            audio=audio,
+            language=language,
+            use_vad=True,
+            cancel_event=cancel_event,
+            on_debug=on_debug,
+            budget_s=budget_s,
+            audio_dur_s=audio_dur_s,
+            on_text=loser_cancel.set,
         )
+        passes = list(result["passes"])
+
+        if result["texts"] or (cancel_event and cancel_event.is_set()):
+            loser_cancel.set()
+            passes.append({
+                "name": "vad_off",
+                "use_vad": False,
+                "stop_reason": "speculative_cancelled",
+                "segment_count": 0,
+                "elapsed_ms": 0.0,
+            })
+            result["passes"] = passes
+            return result
+
+        logger.warning("No text with VAD enabled; waiting for speculative VAD-off pass")
+        while thread.is_alive():
+            thread.join(timeout=0.1)
+            if cancel_event and cancel_event.is_set():
+                loser_cancel.set()
+        retry = fallback.get("result")
+        if retry is not None:
+            passes.extend(retry["passes"])
+            if retry["texts"]:
+                result = retry
+        result["passes"] = passes
+        return result
+
+    def _run_transcribe_pass(
+        self, audio, language, use_vad, cancel_event, on_debug, budget_s, audio_dur_s, worker=None, on_text=None
+    ):
+        tel = Telemetry.shared()
+        with tel.span("pass", pass_name="vad_on" if use_vad else "vad_off") as span:
+            result = self._transcribe_pass(
+                audio, language, use_vad, cancel_event, on_debug, budget_s, audio_dur_s, worker, on_text
+            )
+            pass_debug = result["passes"][0]
+            span.set(stop_reason=pass_debug["stop_reason"], segments=pass_debug["segment_count"])
+        tel.count("passes", pass_name=pass_debug["name"], stop_reason=pass_debug["stop_reason"])
+        return result
+
+    def _transcribe_pass(
+        self, audio, language, use_vad, cancel_event, on_debug, budget_s, audio_dur_s, worker, on_text
+    ):
+        vad_params = dict(VAD_PARAMETERS)
         pass_name = "vad_on" if use_vad else "vad_off"
         pass_debug = {
             "name": pass_name,
@@ -239,20 +740,24 @@ class Transcriber:
             "stop_reason": "eof",
             "segment_count": 0,
             "elapsed_ms": 0.0,
+            "first_segment_ms": None,
         }
         self._emit_debug(on_debug, event="pass_start", pass_name=pass_name, use_vad=bool(use_vad))
         pass_timeout_s = min(TRANSCRIBE_TIMEOUT_S, budget_s)
         self._emit_debug(on_debug, event="engine_call_start", pass_name=pass_name, timeout_s=pass_timeout_s)
         decode = self._call_with_timeout(
-            lambda: self._decode_pass(
+            lambda abort_event: self._decode_pass(
                 audio=audio,
                 language=language,
                 use_vad=use_vad,
                 vad_params=vad_params,
                 cancel_event=cancel_event,
                 timeout_s=pass_timeout_s,
+                abort_event=abort_event,
+                on_text=on_text,
             ),
             timeout_s=pass_timeout_s,
+            worker=worker,
         )
         if decode is None:
             pass_debug["stop_reason"] = "pass_timeout"
@@ -274,11 +779,12 @@ class Transcriber:
         pass_debug["segment_count"] = len(segments)
         pass_debug["stop_reason"] = decode["stop_reason"]
         pass_debug["elapsed_ms"] = decode["elapsed_ms"]
+        pass_debug["first_segment_ms"] = decode.get("first_segment_ms")
         self._emit_debug(on_debug, event="pass_end", **pass_debug)
         audio_debug = {}
         if isinstance(audio, np.ndarray):
             audio_debug = {
-                "duration_s": len(audio) / 16000.0,
+                "duration_s": len(audio) / float(SAMPLE_RATE),
                 "rms": float(np.sqrt(np.mean(audio ** 2))),
                 "peak": float(np.max(np.abs(audio))),
                 "samples": int(len(audio)),
@@ -295,29 +801,48 @@ class Transcriber:
             "audio": audio_debug,
         }
 
-    def _decode_pass(self, audio, language, use_vad, vad_params, cancel_event, timeout_s):
+    def _decode_pass(
+        self, audio, language, use_vad, vad_params, cancel_event, timeout_s, abort_event=None, on_text=None
+    ):
+        tel = Telemetry.shared()
         t0 = time.perf_counter()
-        segments_gen, info = self._model.transcribe(
-            audio,
-            language=language,
-            beam_size=self._config.beam_size,
-            vad_filter=bool(use_vad),
-            vad_parameters=vad_params if use_vad else None,
-            condition_on_previous_text=False,
-            temperature=0,
-            no_speech_threshold=NO_SPEECH_THRESHOLD,
-            compression_ratio_threshold=2.4,
-            log_prob_threshold=-1.0,
-            word_timestamps=self._config.word_timestamps,
-        )
+        # faster-whisper runs VAD, feature extraction and language detection
+        # up front; encoding and decoding happen lazily per segment.
+        with tel.span("prepare", use_vad=bool(use_vad)):
+            segments_gen, info = self._model.transcribe(
+                audio,
+                language=language,
+                beam_size=self._config.beam_size,
+                vad_filter=bool(use_vad),
+                vad_parameters=vad_params if use_vad else None,
+                condition_on_previous_text=False,
+                temperature=0,
+                no_speech_threshold=NO_SPEECH_THRESHOLD,
+                compression_ratio_threshold=2.4,
+                log_prob_threshold=-1.0,
+                word_timestamps=self._config.word_timestamps,
+            )
 
         segments: list[TranscriptionSegment] = []
         texts: list[str] = []
+        first_segment_ms: Optional[float] = None
         stop_reason = "eof"
-        for seg in segments_gen:
+        seg_iter = iter(segments_gen)
+        seg_index = 0
+        while True:
+            with tel.span("decode_segment", index=seg_index) as span:
+                seg = next(seg_iter, None)
+                if seg is None:
+                    span.set(eof=True)
+            if seg is None:
+                break
+            seg_index += 1
             if cancel_event and cancel_event.is_set():
                 stop_reason = "cancelled"
                 break
+            if abort_event is not None and abort_event.is_set():
+                stop_reason = "aborted"
+                break
             if len(segments) >= MAX_SEGMENTS:
                 stop_reason = "segment_cap"
                 break
@@ -326,6 +851,10 @@ class Transcriber:
                 break
             text = seg.text.strip()
             if text:
+                if not texts:
+                    first_segment_ms = (time.perf_counter() - t0) * 1000
+                    if on_text is not None:
+                        on_text()
                 texts.append(text)
                 segments.append(
                     TranscriptionSegment(
@@ -333,6 +862,7 @@ class Transcriber:
                         start=seg.start,
                         end=seg.end,
                         confidence=getattr(seg, "avg_logprob", 0.0),
+                        words=self._segment_words(seg),
                     )
                 )
         elapsed_ms = (time.perf_counter() - t0) * 1000
@@ -344,31 +874,50 @@ class Transcriber:
             "duration": (getattr(info, "duration", 0.0) or 0.0),
             "stop_reason": stop_reason,
             "elapsed_ms": elapsed_ms,
+            "first_segment_ms": first_segment_ms,
         }
 
+    @staticmethod
+    def _segment_words(seg: Any) -> Optional[List[TranscriptionWord]]:
+        words = getattr(seg, "words", None)
+        if not words:
+            return None
+        return [
+            TranscriptionWord(word=w.word, start=w.start, end=w.end, probability=w.probability)
+            for w in words
+        ]
+
     @staticmethod
     def _audio_duration_s(audio: Union[np.ndarray, str]) -> float:
         if isinstance(audio, np.ndarray):
-            return max(0.0, float(len(audio) / 16000.0))
-        return 15.0
+            return max(0.0, float(len(audio) / float(SAMPLE_RATE)))
+        duration = audio_duration_s(audio)
+        return 15.0 if duration is None else duration
 
     @staticmethod
     def _total_timeout_for_audio(audio_dur_s: float) -> float:
         # Slow CPUs can take >2x real-time for first-segment decode.
         return min(240.0, max(60.0, (audio_dur_s * 8.0) + 25.0))
 
-    @staticmethod
-    def _call_with_timeout(fn: Callable[[], Any], timeout_s: float) -> Optional[Any]:
-        pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="tv-call")
-        future = pool.submit(fn)
-        try:
-            return future.result(timeout=timeout_s)
-        except FuturesTimeout:
-            logger.warning("Engine call timed out after %.1fs", timeout_s)
-            future.cancel()
+    def _call_with_timeout(
+        self,
+        fn: Callable[[threading.Event], Any],
+        timeout_s: float,
+        worker: Optional[_DecodeWorker] = None,
+    ) -> Optional[Any]:
+        """Run *fn(abort_event)* on the decode worker; None on timeout.
+
+        On timeout the job's abort event is set so the decode stops at the
+        next segment boundary and frees the worker for the next pass.
+        """
+        job = (worker or self._worker).submit(fn)
+        if not job.done.wait(timeout_s):
+            logger.warning("Engine call timed out after %.1fs — aborting decode", timeout_s)
+            job.abort.set()
             return None
-        finally:
-            pool.shutdown(wait=False, cancel_futures=True)
+        if job.error is not None:
+            raise job.error
+        return job.result
 
     @staticmethod
     def _emit_debug(on_debug: Optional[Callable[[Dict[str, Any]], None]], **event: Any) -> None:
@@ -404,8 +953,16 @@ class Transcriber:
         return self._compute_type
 
     def unload(self) -> None:
-        """Release the model from memory."""
-        self._model = None
-        self._device = None
-        self._compute_type = None
+        """Release the model from memory (or back to the pool, where it stays warm)."""
+        with self._load_lock:
+            if self._model is not None and self._pool is not None:
+                self._pool.release(self._config.model.value, self._device, self._compute_type)
+            self._model = None
+            self._device = None
+            self._compute_type = None
+        for sibling in self._siblings.values():
+            sibling.unload()
+        self._siblings.clear()
+        self._worker.shutdown()
+        self._speculative_worker.shutdown()
         logger.info("Model unloaded")